@@ -0,0 +1,232 @@
+"""
+analyze_contracts.py – Headless bulk analysis of contract files.
+
+Usage:
+    python analyze_contracts.py analyze <dir|glob> [--out results] [--format jsonl|parquet]
+                                [--mode keyword] [--workers N] [--max-in-flight N]
+                                [--with-text] [--no-resume]
+                                [--profile [--profile-threshold S] [--profile-top N]]
+
+Every .pdf/.txt file is run through extract → segment → score in a process
+pool. Per-clause results and one record per document are written to the
+output directory (see utils/result_export.py). Documents whose SHA-256 is
+already recorded there are skipped, so an interrupted run can simply be
+restarted. At most --max-in-flight documents are read or analysed at any
+time, which bounds memory regardless of corpus size.
+
+With --profile every document (or, with --profile-threshold, every
+document taking at least that many seconds) is analysed under cProfile.
+The dumps go to <out>/profiles (see utils/profiling.py), each document
+record names its profile, and at the end the hottest functions across
+all profiled documents are printed and written to <out>/profile_top.json.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+from app_config import DEFAULT_PREDICTOR_MODE, PROFILE_TOP_FUNCTIONS
+from utils.result_export import EXPORT_FORMATS, open_sink, processed_hashes
+from utils.risk_predictor import available_modes, risk_vocabulary
+from utils.worker_pool import init_document_worker
+
+_EXTENSIONS = (".pdf", ".txt")
+_HASH_BLOCK = 1 << 20
+
+
+def collect_files(target: str) -> List[str]:
+    """PDF/TXT files in a directory (recursively) or matching a glob."""
+    if os.path.isdir(target):
+        paths = glob.glob(os.path.join(target, "**", "*"), recursive=True)
+    else:
+        paths = glob.glob(target, recursive=True)
+    return sorted(
+        p for p in paths
+        if os.path.isfile(p) and os.path.splitext(p)[1].lower() in _EXTENSIONS
+    )
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _analyze_file(path: str, sha: str, mode: str, with_text: bool) -> Tuple[Dict, Optional[Dict]]:
+    """Worker task: analyse one file, return (document record, clause columns)."""
+    from utils.analysis_pipeline import EmptyDocumentError, NoClausesError, run_analysis
+    from utils.result_export import clause_columns
+
+    start = time.perf_counter()
+    record = {"doc_sha256": sha, "file": path, "mode": mode}
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        record["bytes"] = len(raw)
+        result = run_analysis(raw, os.path.basename(path), mode=mode, use_cache=False)
+    except (EmptyDocumentError, NoClausesError) as e:
+        record.update(status="empty", error=str(e), seconds=time.perf_counter() - start)
+        return record, None
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}", seconds=time.perf_counter() - start)
+        return record, None
+
+    record.update(
+        status="ok",
+        clauses=result["stats"]["total"],
+        risky=result["stats"]["risky_count"],
+        risk_percentage=result["stats"]["risk_percentage"],
+        timings=result["timings"],
+        seconds=time.perf_counter() - start,
+    )
+    if result["profile"]:
+        record["profile"] = result["profile"]
+    return record, clause_columns(result["analyzed"], sha, path, with_text)
+
+
+def _report(done: int, total: int, nbytes: int, started: float, final: bool = False) -> None:
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    line = (
+        f"{done}/{total} docs  |  {done / elapsed:.2f} docs/s  |  "
+        f"{nbytes / elapsed / 1e6:.2f} MB/s  |  {elapsed:.1f}s"
+    )
+    if final:
+        print("\r" + line)
+    else:
+        print("\r" + line, end="", file=sys.stdout, flush=True)
+
+
+def report_profiles(records: List[Dict], out_dir: str, top: int) -> None:
+    """Prints and saves the hottest functions across the profiled documents."""
+    from utils.profiling import aggregate, top_functions
+
+    profiled = [r for r in records if r.get("profile")]
+    stats = aggregate(r["profile"] for r in profiled)
+    if stats is None:
+        print("No document reached the profiling threshold.")
+        return
+
+    hot = top_functions(stats, top, sort="tottime")
+    slowest = sorted(profiled, key=lambda r: r["seconds"], reverse=True)[:top]
+    print(f"\nHottest functions across {len(profiled)} profiled documents (own time):")
+    print(f"{'own s':>10}{'cum s':>10}{'calls':>12}  function")
+    for row in hot:
+        print(f"{row['tottime']:>10.3f}{row['cumtime']:>10.3f}{row['calls']:>12}  {row['function']}")
+
+    path = os.path.join(out_dir, "profile_top.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "documents_profiled": len(profiled),
+            "top_functions": hot,
+            "slowest_documents": [
+                {k: r.get(k) for k in ("file", "doc_sha256", "seconds", "timings", "profile")}
+                for r in slowest
+            ],
+        }, f, indent=2)
+    print(f"Profile summary written to {path}")
+
+
+def run_analyze(args: argparse.Namespace) -> int:
+    paths = collect_files(args.target)
+    if not paths:
+        print(f"No .pdf/.txt files found for '{args.target}'.", file=sys.stderr)
+        return 1
+
+    try:
+        done_hashes = processed_hashes(args.out, args.mode)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    if not args.resume:
+        done_hashes = set()
+    jobs = []
+    for path in paths:
+        sha = file_sha256(path)
+        if sha not in done_hashes:
+            done_hashes.add(sha)  # also skips duplicate files within this run
+            jobs.append((path, sha))
+    skipped = len(paths) - len(jobs)
+    print(f"{len(paths)} files found, {skipped} already processed or duplicate, {len(jobs)} to analyse.")
+    if not jobs:
+        return 0
+
+    workers = args.workers or os.cpu_count() or 1
+    max_in_flight = args.max_in_flight or workers * 2
+    counts = {"ok": 0, "empty": 0, "error": 0}
+    nbytes = 0
+    started = time.perf_counter()
+
+    profile_threshold = None
+    profile_dir = os.path.abspath(os.path.join(args.out, "profiles"))
+    if args.profile:
+        profile_threshold = args.profile_threshold or 0.0
+    profiled_records = []
+
+    with open_sink(args.out, args.format, vocabulary=risk_vocabulary()) as sink, ProcessPoolExecutor(
+        max_workers=workers, initializer=init_document_worker, initargs=(profile_threshold, profile_dir)
+    ) as pool:
+        pending = set()
+        next_job = 0
+        finished = 0
+        while next_job < len(jobs) or pending:
+            while next_job < len(jobs) and len(pending) < max_in_flight:
+                path, sha = jobs[next_job]
+                pending.add(pool.submit(_analyze_file, path, sha, args.mode, args.with_text))
+                next_job += 1
+            completed, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in completed:
+                record, columns = future.result()
+                sink.write(record, columns)
+                counts[record["status"]] += 1
+                nbytes += record.get("bytes", 0)
+                if record.get("profile"):
+                    profiled_records.append(record)
+                finished += 1
+                if record["status"] == "error":
+                    print(f"\n{record['file']}: {record['error']}", file=sys.stderr)
+            _report(finished, len(jobs), nbytes, started)
+
+    _report(finished, len(jobs), nbytes, started, final=True)
+    print(f"ok: {counts['ok']}  |  no text/clauses: {counts['empty']}  |  errors: {counts['error']}")
+    print(f"Results written to {os.path.abspath(args.out)}")
+    if args.profile:
+        report_profiles(profiled_records, args.out, args.profile_top)
+    return 1 if counts["error"] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk contract risk analysis")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    analyze = sub.add_parser("analyze", help="Analyse a directory or glob of PDF/TXT contracts")
+    analyze.add_argument("target", help="Directory (searched recursively) or glob pattern")
+    analyze.add_argument("--out", default="results", help="Output directory (default: results)")
+    analyze.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl", help="Clause row format")
+    analyze.add_argument("--mode", choices=available_modes(), default=DEFAULT_PREDICTOR_MODE, help="Prediction mode")
+    analyze.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    analyze.add_argument("--max-in-flight", type=int, help="Documents queued or in progress (default: 2 x workers)")
+    analyze.add_argument("--with-text", action="store_true", help="Include clause text in the output")
+    analyze.add_argument("--no-resume", dest="resume", action="store_false",
+                         help="Re-analyse documents already recorded in the output directory")
+    analyze.add_argument("--profile", action="store_true",
+                         help="Profile documents and report the hottest functions across the corpus")
+    analyze.add_argument("--profile-threshold", type=float, metavar="SECONDS",
+                         help="With --profile, only keep profiles of documents at least this slow")
+    analyze.add_argument("--profile-top", type=int, default=PROFILE_TOP_FUNCTIONS,
+                         help=f"Hot functions to report (default: {PROFILE_TOP_FUNCTIONS})")
+
+    args = parser.parse_args()
+    if args.command == "analyze":
+        sys.exit(run_analyze(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+"""
+api_server.py – Headless HTTP/JSON service for contract risk analysis.
+
+Usage:
+    python api_server.py [--host 127.0.0.1] [--port 8080] [--workers N]
+                         [--max-queued 64]
+
+Endpoints:
+    GET  /health          Liveness plus pool status.
+    GET  /metrics         Prometheus text format metrics (utils/metrics.py).
+    POST /analyze         One document. Either the raw file bytes
+                          (?filename=contract.pdf selects the reader; PDFs
+                          are also recognised by their header), or JSON
+                          {"text": ...} / {"content_base64": ..., "filename": ...}.
+    POST /analyze/batch   JSON {"documents": [<JSON document>, ...]}.
+
+Common query parameters: mode=keyword|ml|hybrid, text=0 to leave clause
+text out of the response, clauses=0 to return only the summary.
+
+Each document runs through utils.analysis_pipeline.run_analysis (extract →
+segment → score → summary) in a process pool. Request bodies above
+API_MAX_REQUEST_BYTES are rejected with 413, and once more than
+API_MAX_QUEUED documents wait for a worker new requests get 503, so
+overload degrades into fast rejections instead of unbounded queues.
+Workers return their metrics with each result and the server merges them
+into its own registry, so /metrics covers the whole pool.
+"""
+import argparse
+import base64
+import binascii
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from app_config import (
+    APP_VERSION,
+    API_HOST,
+    API_PORT,
+    API_MAX_REQUEST_BYTES,
+    API_MAX_BATCH_DOCUMENTS,
+    API_MAX_QUEUED,
+    DEFAULT_PREDICTOR_MODE,
+)
+from utils import metrics
+from utils.risk_predictor import available_modes
+from utils.worker_pool import init_document_worker
+
+logger = logging.getLogger("api_server")
+
+_DEFAULT_TXT_NAME = "document.txt"
+_DEFAULT_PDF_NAME = "document.pdf"
+
+_ENDPOINTS = ("/health", "/metrics", "/analyze", "/analyze/batch")
+_PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class ApiError(Exception):
+    """Request error reported to the client as {"error": message}."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+def analyze_document(raw_bytes: bytes, filename: str, mode: str, with_clauses: bool, with_text: bool) -> Dict:
+    """
+    Worker task: analyses one document and returns its JSON response body.
+    Failures are returned as {"error": ..., "status": ...} so that nothing
+    but plain data crosses the process boundary. The metrics recorded since
+    the worker's last task are attached under "_metrics".
+    """
+    body = _document_body(raw_bytes, filename, mode, with_clauses, with_text)
+    if metrics.enabled():
+        body["_metrics"] = metrics.get_metrics().drain()
+    return body
+
+
+def _document_body(raw_bytes: bytes, filename: str, mode: str, with_clauses: bool, with_text: bool) -> Dict:
+    from utils.analysis_pipeline import EmptyDocumentError, NoClausesError, run_analysis
+
+    try:
+        result = run_analysis(raw_bytes, filename, mode=mode)
+    except (EmptyDocumentError, NoClausesError) as e:
+        return {"filename": filename, "error": str(e), "status": 422}
+    except ValueError as e:
+        return {"filename": filename, "error": str(e), "status": 400}
+    except Exception as e:
+        logger.exception("Analysis of %s failed", filename)
+        return {"filename": filename, "error": f"{type(e).__name__}: {e}", "status": 500}
+
+    body = {
+        "filename": filename,
+        "mode": mode,
+        "stats": result["stats"],
+        "timings": result["timings"],
+        "cache_hit": result["cache_hit"],
+    }
+    if with_clauses:
+        body["clauses"] = [
+            {key: value for key, value in clause.items() if with_text or key != "text"}
+            for clause in result["analyzed"]
+        ]
+    return body
+
+
+# ---------------------------------------------------------------------------
+# Service
+# ---------------------------------------------------------------------------
+class AnalysisService:
+    """Process pool plus admission control shared by all request threads."""
+
+    def __init__(self, workers: Optional[int] = None, max_queued: int = API_MAX_QUEUED):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queued = max_queued
+        self._pool = self._new_pool()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.stats = {"requests": 0, "documents": 0, "rejected": 0, "errors": 0, "pool_restarts": 0}
+        self.started_at = time.time()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=init_document_worker)
+
+    def _replace_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Starts a fresh pool, unless another request already replaced `broken`."""
+        with self._lock:
+            if self._pool is not broken:
+                return
+            self._pool = self._new_pool()
+            self.stats["pool_restarts"] += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _admit(self, n: int) -> None:
+        with self._lock:
+            if self._in_flight + n > self.workers + self.max_queued:
+                self.stats["rejected"] += 1
+                raise ApiError(503, "Server busy, retry later.")
+            self._in_flight += n
+
+    def _release(self, n: int) -> None:
+        with self._lock:
+            self._in_flight -= n
+
+    def analyze(self, documents: List[Tuple[bytes, str]], mode: str, with_clauses: bool, with_text: bool) -> List[Dict]:
+        """
+        Analyses documents in parallel; results are in input order.
+
+        Raises:
+            ApiError: 503 when the server is busy or a worker process died
+                (the pool is restarted), 500 when a task fails outside the
+                pipeline's own error handling.
+        """
+        self._admit(len(documents))
+        pool = self._pool
+        try:
+            futures = [
+                pool.submit(analyze_document, raw, name, mode, with_clauses, with_text)
+                for raw, name in documents
+            ]
+            results = [f.result() for f in futures]
+        except BrokenProcessPool as e:
+            logger.error("Worker process died, restarting the pool: %s", e)
+            self._replace_pool(pool)
+            self._count_failure()
+            raise ApiError(503, "A worker process died; retry the request.")
+        except Exception as e:
+            logger.exception("Analysis task failed")
+            self._count_failure()
+            raise ApiError(500, f"Analysis failed: {type(e).__name__}")
+        finally:
+            self._release(len(documents))
+        registry = metrics.get_metrics()
+        for result in results:
+            worker_metrics = result.pop("_metrics", None)
+            if worker_metrics is not None:
+                registry.merge(worker_metrics)
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["documents"] += len(documents)
+            self.stats["errors"] += sum(1 for r in results if "error" in r)
+        return results
+
+    def _count_failure(self) -> None:
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["errors"] += 1
+
+    def info(self) -> Dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "in_flight": self._in_flight,
+                "max_queued": self.max_queued,
+                "uptime_seconds": round(time.time() - self.started_at, 1),
+                **self.stats,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ---------------------------------------------------------------------------
+# Request parsing
+# ---------------------------------------------------------------------------
+def _flag(query: Dict[str, List[str]], name: str, default: bool) -> bool:
+    values = query.get(name)
+    if not values:
+        return default
+    return values[-1].lower() not in ("0", "false", "no")
+
+
+def _mode(query: Dict[str, List[str]], body: Optional[Dict] = None) -> str:
+    mode = (query.get("mode") or [None])[-1] or (body or {}).get("mode") or DEFAULT_PREDICTOR_MODE
+    if mode not in available_modes():
+        raise ApiError(400, f"Unknown mode '{mode}'. Available: {', '.join(available_modes())}.")
+    return mode
+
+
+def _json_document(doc) -> Tuple[bytes, str]:
+    """(bytes, filename) of a {"text": ...} or {"content_base64": ...} object."""
+    if not isinstance(doc, dict):
+        raise ApiError(400, "Each document must be a JSON object.")
+    if isinstance(doc.get("text"), str):
+        return doc["text"].encode("utf-8"), doc.get("filename") or _DEFAULT_TXT_NAME
+    if isinstance(doc.get("content_base64"), str):
+        try:
+            raw = base64.b64decode(doc["content_base64"], validate=True)
+        except (binascii.Error, ValueError):
+            raise ApiError(400, "content_base64 is not valid base64.")
+        return raw, doc.get("filename") or (_DEFAULT_PDF_NAME if raw.startswith(b"%PDF") else _DEFAULT_TXT_NAME)
+    raise ApiError(400, 'A document needs a "text" or "content_base64" field.')
+
+
+def _parse_json(body: bytes):
+    try:
+        return json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ApiError(400, f"Invalid JSON body: {e}")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = f"ContractRiskAPI/{APP_VERSION}"
+    protocol_version = "HTTP/1.1"  # keep-alive for API clients and load tests
+    # Headers and body go out in separate writes; with Nagle's algorithm
+    # the body then waits for the client's delayed ACK (~40ms per response)
+    disable_nagle_algorithm = True
+
+    service: AnalysisService  # set by make_server
+    max_request_bytes: int = API_MAX_REQUEST_BYTES
+    max_batch_documents: int = API_MAX_BATCH_DOCUMENTS
+
+    def log_message(self, fmt: str, *args) -> None:
+        logger.debug("%s - %s", self.address_string(), fmt % args)
+
+    def _send(self, status: int, data: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if status == 503:
+            self.send_header("Retry-After", "1")
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status: int, payload) -> None:
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def _record(self, path: str, status: int, start: float) -> None:
+        endpoint = path if path in _ENDPOINTS else "other"
+        metrics.inc("http_requests_total", endpoint=endpoint, status=status)
+        metrics.observe("http_request_seconds", time.perf_counter() - start, endpoint=endpoint)
+
+    def _read_body(self) -> bytes:
+        length = self.headers.get("Content-Length")
+        if length is None:
+            raise ApiError(411, "Content-Length is required.")
+        try:
+            length = int(length)
+        except ValueError:
+            raise ApiError(400, "Invalid Content-Length.")
+        if length < 0:
+            raise ApiError(400, "Invalid Content-Length.")
+        if length > self.max_request_bytes:
+            raise ApiError(413, f"Request body exceeds {self.max_request_bytes} bytes.")
+        body = self.rfile.read(length)
+        self._body_read = True
+        return body
+
+    def do_GET(self) -> None:
+        start = time.perf_counter()
+        path = urlsplit(self.path).path.rstrip("/")
+        if path == "/health":
+            status = 200
+            self._send_json(status, {"status": "ok", "version": APP_VERSION,
+                                     "modes": available_modes(), **self.service.info()})
+        elif path == "/metrics":
+            status = 200
+            metrics.set_gauge("api_in_flight_documents", self.service.info()["in_flight"])
+            self._send(status, metrics.prometheus_text().encode("utf-8"), _PROMETHEUS_CONTENT_TYPE)
+        else:
+            status = 404
+            self._send_json(status, {"error": f"No such endpoint: {path or '/'}"})
+        self._record(path, status, start)
+
+    def do_POST(self) -> None:
+        start = time.perf_counter()
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip("/")
+        query = parse_qs(parts.query)
+        self._body_read = False
+        try:
+            if path == "/analyze":
+                status, payload = self._analyze(query)
+            elif path == "/analyze/batch":
+                status, payload = self._analyze_batch(query)
+            else:
+                raise ApiError(404, f"No such endpoint: {path or '/'}")
+        except ApiError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception:
+            logger.exception("Unhandled error in POST %s", path)
+            status, payload = 500, {"error": "Internal server error."}
+        if not self._body_read:
+            # A request rejected before its body was read cannot be followed
+            # on this connection: the body would be parsed as the next request
+            self.close_connection = True
+        self._send_json(status, payload)
+        self._record(path, status, start)
+
+    def _analyze(self, query) -> Tuple[int, Dict]:
+        body = self._read_body()
+        json_body = None
+        if self.headers.get_content_type() == "application/json":
+            json_body = _parse_json(body)
+            raw, filename = _json_document(json_body)
+        else:
+            raw = body
+            filename = (query.get("filename") or [None])[-1] or (
+                _DEFAULT_PDF_NAME if raw.startswith(b"%PDF") else _DEFAULT_TXT_NAME
+            )
+        mode = _mode(query, json_body if isinstance(json_body, dict) else None)
+        [result] = self.service.analyze(
+            [(raw, filename)], mode, _flag(query, "clauses", True), _flag(query, "text", True)
+        )
+        return result.pop("status", 200), result
+
+    def _analyze_batch(self, query) -> Tuple[int, Dict]:
+        body = _parse_json(self._read_body())
+        documents = body.get("documents") if isinstance(body, dict) else None
+        if not isinstance(documents, list) or not documents:
+            raise ApiError(400, 'Expected {"documents": [...]} with at least one document.')
+        if len(documents) > self.max_batch_documents:
+            raise ApiError(413, f"At most {self.max_batch_documents} documents per batch.")
+        parsed = [_json_document(doc) for doc in documents]
+        mode = _mode(query, body)
+        results = self.service.analyze(
+            parsed, mode, _flag(query, "clauses", True), _flag(query, "text", True)
+        )
+        return 200, {"mode": mode, "results": results}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default listen backlog of 5 drops connection bursts (clients then
+    # wait ~1s for a SYN retry)
+    request_queue_size = 128
+
+
+def make_server(
+    host: str = API_HOST,
+    port: int = API_PORT,
+    service: Optional[AnalysisService] = None,
+) -> ThreadingHTTPServer:
+    """Creates (but does not start) the HTTP server around an AnalysisService."""
+    handler = type("Handler", (_Handler,), {"service": service or AnalysisService()})
+    return _Server((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Contract risk analysis HTTP service")
+    parser.add_argument("--host", default=API_HOST, help=f"Bind address (default: {API_HOST})")
+    parser.add_argument("--port", type=int, default=API_PORT, help=f"Port (default: {API_PORT})")
+    parser.add_argument("--workers", type=int, help="Analysis processes (default: CPU count)")
+    parser.add_argument("--max-queued", type=int, default=API_MAX_QUEUED,
+                        help="Documents waiting for a worker before requests get 503")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format="%(asctime)s %(levelname)s %(message)s")
+    service = AnalysisService(args.workers, args.max_queued)
+    server = make_server(args.host, args.port, service)
+    logger.info("Serving on http://%s:%d with %d workers", args.host, server.server_port, service.workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
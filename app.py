@@ -20,15 +20,26 @@ from app_config import (
     COLOUR,
     SIDEBAR_HOW_TO,
     SIDEBAR_DISCLAIMER,
+    PREDICTOR_MODES,
+    DEFAULT_PREDICTOR_MODE,
+    CLAUSE_PAGE_SIZES,
+    DEFAULT_CLAUSE_PAGE_SIZE,
+    ANALYSIS_POLL_SECONDS,
 )
-from utils.file_handler import extract_text_from_upload, get_file_metadata
-from utils.clause_segmenter import segment_document
-from utils.risk_predictor import analyze_clauses, compute_summary_stats
+from utils import metrics
+from utils.file_handler import get_file_metadata
+from utils.analysis_pipeline import EmptyDocumentError, NoClausesError
+from utils.analysis_jobs import get_job_manager, job_key
+from utils.ml_backend import ml_artifacts_available
+from utils.model_registry import get_registry
+from utils.result_cache import get_result_cache
 from components.result_display import (
     inject_card_styles,
     render_summary_metrics,
     render_clause_list,
+    render_clause_cards,
 )
+from components.clause_html import clause_cards
 
 # ---------------------------------------------------------------------------
 # Page config — must be first Streamlit call
@@ -169,11 +180,32 @@ def _inject_global_styles() -> None:
     )
 
 
+# ---------------------------------------------------------------------------
+# Model warm-up (once per server process, shared by all sessions)
+# ---------------------------------------------------------------------------
+@st.cache_resource(show_spinner=False)
+def _warm_model_registry():
+    # Loading the artifacts imports joblib/scikit-learn, so this only runs
+    # once an ML-backed mode is selected.
+    registry = get_registry()
+    if ml_artifacts_available():
+        try:
+            registry.warm_up()
+        except Exception:
+            # Surfaced later through registry.info()["last_error"] / the
+            # pipeline error path; the keyword backend still works.
+            pass
+    return registry
+
+
 # ---------------------------------------------------------------------------
 # Sidebar
 # ---------------------------------------------------------------------------
-def _render_sidebar() -> bool:
-    """Renders the sidebar and returns the show_safe_clauses toggle value."""
+def _render_sidebar():
+    """
+    Renders the sidebar and returns
+    (show_safe_clauses, predictor_mode, show_diagnostics).
+    """
     with st.sidebar:
         st.markdown(
             f"""
@@ -196,6 +228,20 @@ def _render_sidebar() -> bool:
 
         st.markdown("### ⚙️ Display Options")
         show_safe = st.checkbox("Show safe clauses", value=True)
+        show_diagnostics = st.checkbox("Show diagnostics", value=False)
+
+        st.markdown("---")
+
+        st.markdown("### 🧠 Prediction Backend")
+        modes = list(PREDICTOR_MODES)
+        mode = st.selectbox(
+            "Predictor",
+            modes,
+            index=modes.index(DEFAULT_PREDICTOR_MODE),
+            format_func=PREDICTOR_MODES.get,
+        )
+        if mode != "keyword" and not ml_artifacts_available():
+            st.caption("No trained model found — run `python train_classifier.py` first.")
 
         st.markdown("---")
 
@@ -219,7 +265,7 @@ def _render_sidebar() -> bool:
         st.markdown("---")
         st.markdown(SIDEBAR_DISCLAIMER)
 
-    return show_safe
+    return show_safe, mode, show_diagnostics
 
 
 # ---------------------------------------------------------------------------
@@ -254,10 +300,22 @@ def _render_upload_section():
 # ---------------------------------------------------------------------------
 # Analysis pipeline
 # ---------------------------------------------------------------------------
-def _run_pipeline(uploaded_file):
+# Session-state slot holding the AnalysisJob of the current upload
+_JOB_STATE_KEY = "analysis_job"
+
+
+def _run_pipeline(uploaded_file, mode: str):
     """
-    Runs the full analysis pipeline with a progress bar.
-    Returns (analyzed_clauses, stats, metadata) or (None, None, None) on error.
+    Runs the analysis as a job on the shared background worker pool (see
+    utils/analysis_jobs.py) and reports on it without blocking the script.
+    The job handle is kept in st.session_state, so reruns (polling, widget
+    interactions while the job runs) reattach to it instead of restarting
+    the analysis. While the job runs, its progress and the first risky
+    clauses are shown and the script reruns every ANALYSIS_POLL_SECONDS.
+    Results are cached by document content + predictor config, so reruns
+    after completion and re-uploads of the same file skip the pipeline.
+    Returns (result, metadata) once the job has finished, or (None, None) on
+    error, where result is the dict from utils.analysis_pipeline.run_analysis().
     """
     meta = get_file_metadata(uploaded_file)
 
@@ -273,55 +331,61 @@ def _run_pipeline(uploaded_file):
         unsafe_allow_html=True,
     )
 
-    progress_bar = st.progress(0, text="Starting analysis…")
-
-    try:
-        # Step 1: Extract text
-        progress_bar.progress(20, text="📖 Extracting text from document…")
-        time.sleep(0.3)
-        text = extract_text_from_upload(uploaded_file)
-
-        if not text or not text.strip():
-            st.error("⚠️ Could not extract any text from the document. Please try a different file.")
-            progress_bar.empty()
-            return None, None, None
-
-        # Step 2: Segment clauses
-        progress_bar.progress(50, text="✂️ Segmenting document into clauses…")
-        time.sleep(0.3)
-        clauses = segment_document(text)
-
-        if not clauses:
-            st.warning("No clauses could be extracted from this document. Try a more structured contract.")
-            progress_bar.empty()
-            return None, None, None
-
-        # Step 3: Predict risk
-        progress_bar.progress(80, text="🔍 Running risk analysis on each clause…")
-        time.sleep(0.3)
-        analyzed = analyze_clauses(clauses)
-        stats = compute_summary_stats(analyzed)
-
-        progress_bar.progress(100, text="✅ Analysis complete!")
-        time.sleep(0.4)
-        progress_bar.empty()
-
-        return analyzed, stats, meta
+    raw_bytes = uploaded_file.getvalue()
+    job = st.session_state.get(_JOB_STATE_KEY)
+    if job is None or job.key != job_key(raw_bytes, uploaded_file.name, mode):
+        job = get_job_manager().submit(raw_bytes, uploaded_file.name, mode)
+        st.session_state[_JOB_STATE_KEY] = job
+
+    if not job.done():
+        _render_job_progress(job)
+        # Returns as soon as the job finishes, so short jobs show up at once
+        job.wait(ANALYSIS_POLL_SECONDS)
+        st.rerun()
+
+    error = job.error
+    if error is None:
+        return job.result, meta
+
+    if isinstance(error, EmptyDocumentError):
+        st.error("⚠️ Could not extract any text from the document. Please try a different file.")
+    elif isinstance(error, NoClausesError):
+        st.warning("No clauses could be extracted from this document. Try a more structured contract.")
+    elif isinstance(error, ValueError):
+        st.error(f"❌ File Error: {error}")
+    else:
+        st.error(f"❌ Unexpected error during analysis: {error}")
+    return None, None
+
+
+def _render_job_progress(job) -> None:
+    """Progress bar, partial counts and the first risky clauses of a running job."""
+    snap = job.snapshot()
+    if snap["state"] == "queued":
+        manager = get_job_manager()
+        st.progress(
+            0,
+            text=f"⏳ Waiting for a worker — {manager.queue_depth()} document(s) queued "
+                 f"for {manager.max_workers} worker(s)",
+        )
+        return
 
-    except ValueError as e:
-        st.error(f"❌ File Error: {e}")
-        progress_bar.empty()
-        return None, None, None
-    except Exception as e:
-        st.error(f"❌ Unexpected error during analysis: {e}")
-        progress_bar.empty()
-        return None, None, None
+    st.progress(min(100, int(snap["fraction"] * 100)), text=snap["message"])
+    st.caption(
+        f"{snap['clauses_scored']} clauses scored so far, {snap['risky_scored']} risky "
+        f"· {snap['elapsed']:.1f}s elapsed"
+    )
+    # The first risky clauses are shown while the rest of the document is
+    # still being extracted and scored.
+    if snap["preview"]:
+        st.markdown('<div class="section-title">⚡ First risky clauses</div>', unsafe_allow_html=True)
+        render_clause_list(snap["preview"], show_safe=False)
 
 
 # ---------------------------------------------------------------------------
 # Results section
 # ---------------------------------------------------------------------------
-def _render_results(analyzed_clauses, stats, show_safe: bool) -> None:
+def _render_results(cards, stats, show_safe: bool) -> None:
     st.markdown("---")
 
     # KPI summary tiles
@@ -356,34 +420,88 @@ def _render_results(analyzed_clauses, stats, show_safe: bool) -> None:
         unsafe_allow_html=True,
     )
 
-    # Clause list with filter tabs
+    # Clause list: only the selected page of the selected view is sent,
+    # joined from card fragments cached with the result
     st.markdown('<div class="section-title">📋 Clause Analysis</div>', unsafe_allow_html=True)
 
-    risky_count = stats["risky_count"]
-    safe_count  = stats["safe_count"]
+    views = {
+        "all":   f"All ({stats['total']})",
+        "risky": f"⚠️ Risky ({stats['risky_count']})",
+        "safe":  f"✅ Safe ({stats['safe_count']})",
+    }
+    col_view, col_size = st.columns([3, 1])
+    with col_view:
+        view = st.radio(
+            "Clauses",
+            list(views),
+            format_func=views.get,
+            horizontal=True,
+            label_visibility="collapsed",
+            key="clause_view",
+        )
+    with col_size:
+        page_size = st.selectbox(
+            "Clauses per page",
+            CLAUSE_PAGE_SIZES,
+            index=CLAUSE_PAGE_SIZES.index(DEFAULT_CLAUSE_PAGE_SIZE),
+            key="clause_page_size",
+        )
+
+    ids = cards.ids(view, show_safe)
+    if ids:
+        render_clause_cards(cards, ids, page_size, key=f"clauses_{view}")
+    elif view == "risky":
+        st.success("🎉 No risky clauses were found in this document!")
+    elif view == "safe":
+        st.warning("All clauses were flagged as risky.")
 
-    tab_all, tab_risky, tab_safe = st.tabs([
-        f"All ({stats['total']})",
-        f"⚠️ Risky ({risky_count})",
-        f"✅ Safe ({safe_count})",
-    ])
 
-    with tab_all:
-        render_clause_list(analyzed_clauses, show_safe=show_safe)
+# ---------------------------------------------------------------------------
+# Diagnostics
+# ---------------------------------------------------------------------------
+_STAGE_LABELS = {
+    "cache_lookup": "Result cache lookup",
+    "extract":      "Text extraction",
+    "segment":      "Clause segmentation",
+    "predict":      "Risk prediction",
+    "summary":      "Summary statistics",
+}
 
-    with tab_risky:
-        risky_clauses = [c for c in analyzed_clauses if c["label"] == "Risky"]
-        if risky_clauses:
-            render_clause_list(risky_clauses, show_safe=False)
-        else:
-            st.success("🎉 No risky clauses were found in this document!")
 
-    with tab_safe:
-        safe_clauses = [c for c in analyzed_clauses if c["label"] == "Safe"]
-        if safe_clauses:
-            render_clause_list(safe_clauses, show_safe=True)
-        else:
-            st.warning("All clauses were flagged as risky.")
+def _render_diagnostics(result: dict, render_seconds: float) -> None:
+    """
+    Per-stage timings of the last analysis, cache/model status and the
+    process-wide metrics (all sessions since startup, see utils/metrics.py).
+    """
+    with st.expander("🩺 Diagnostics", expanded=False):
+        timings = dict(result["timings"])
+        rows = [
+            {"Stage": _STAGE_LABELS.get(stage, stage), "Time (ms)": round(secs * 1000, 2)}
+            for stage, secs in timings.items()
+        ]
+        rows.append({"Stage": "Rendering", "Time (ms)": round(render_seconds * 1000, 2)})
+        st.table(rows)
+
+        total_ms = (sum(timings.values()) + render_seconds) * 1000
+        source = "result cache" if result["cache_hit"] else "full pipeline run"
+        st.caption(f"Total {total_ms:.1f} ms · served from {source}")
+        st.json({
+            "result_cache": get_result_cache().info(),
+            "model": get_registry().info(),
+            "analysis_jobs": get_job_manager().info(),
+        })
+
+        st.markdown("**Process metrics**")
+        if not metrics.enabled():
+            st.caption("Metrics recording is off (METRICS_ENABLED=0).")
+            return
+        st.json(metrics.get_metrics().summary(), expanded=False)
+        st.download_button(
+            "Download Prometheus metrics",
+            metrics.prometheus_text(),
+            file_name="metrics.prom",
+            mime="text/plain",
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -414,15 +532,22 @@ def main() -> None:
     _inject_global_styles()
     inject_card_styles()
 
-    show_safe = _render_sidebar()
+    show_safe, mode, show_diagnostics = _render_sidebar()
+    if mode != "keyword":
+        _warm_model_registry()
     _render_hero()
 
     uploaded_file = _render_upload_section()
 
     if uploaded_file is not None:
-        analyzed_clauses, stats, meta = _run_pipeline(uploaded_file)
-        if analyzed_clauses is not None:
-            _render_results(analyzed_clauses, stats, show_safe)
+        result, meta = _run_pipeline(uploaded_file, mode)
+        if result is not None:
+            start = time.perf_counter()
+            _render_results(clause_cards(result), result["stats"], show_safe)
+            render_seconds = time.perf_counter() - start
+            metrics.observe("stage_seconds", render_seconds, stage="render")
+            if show_diagnostics:
+                _render_diagnostics(result, render_seconds)
     else:
         _render_empty_state()
 
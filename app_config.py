@@ -5,6 +5,8 @@ Central configuration for the Legal Contract Risk Analyzer Streamlit app.
 Contains UI constants, risk keyword lists, and colour palette definitions.
 """
 
+import os
+
 # ---------------------------------------------------------------------------
 # App metadata
 # ---------------------------------------------------------------------------
@@ -43,10 +45,67 @@ RISK_KEYWORDS = [
 # A clause is marked Risky if it contains >= this many keywords
 RISK_KEYWORD_THRESHOLD = 1
 
-# Confidence score modelling (used in dummy predictor)
+# Confidence score modelling (used by the keyword backend)
 BASE_RISKY_CONFIDENCE = 0.85     # base score when keywords found
 SAFE_CONFIDENCE = 0.92           # score for safe clauses
 
+# ---------------------------------------------------------------------------
+# Prediction backends
+# ---------------------------------------------------------------------------
+# "keyword" — keyword matching only
+# "ml"      — trained TF-IDF + classifier from models/ (train_classifier.py)
+# "hybrid"  — Risky if either keywords or the classifier flag the clause
+PREDICTOR_MODES = {
+    "keyword": "Keyword rules",
+    "ml":      "ML classifier",
+    "hybrid":  "Hybrid (keywords + ML)",
+}
+DEFAULT_PREDICTOR_MODE = "keyword"
+
+# Classifier probability at or above which a clause is labelled Risky
+ML_RISK_THRESHOLD = 0.5
+
+# ---------------------------------------------------------------------------
+# Clause list display
+# ---------------------------------------------------------------------------
+CLAUSE_PAGE_SIZES = (25, 50, 100, 200)   # choices of the page size control
+DEFAULT_CLAUSE_PAGE_SIZE = 50
+
+# ---------------------------------------------------------------------------
+# Analysis result cache (keyed by document SHA-256 + predictor config)
+# ---------------------------------------------------------------------------
+RESULT_CACHE_MAX_ENTRIES = 32                        # in-memory LRU tier
+RESULT_CACHE_DIR = os.environ.get("RESULT_CACHE_DIR") or None   # disk tier (off if unset)
+RESULT_CACHE_MAX_BYTES = 256 * 1024 * 1024           # disk tier size budget
+CARD_CACHE_MAX_ENTRIES = 8                           # rendered clause cards (memory only)
+
+# ---------------------------------------------------------------------------
+# Background analysis jobs (one worker pool shared by all app sessions)
+# ---------------------------------------------------------------------------
+ANALYSIS_WORKERS = int(os.environ.get("ANALYSIS_WORKERS") or 2)   # concurrent analyses
+ANALYSIS_POLL_SECONDS = 0.5              # UI refresh interval while a job runs
+ANALYSIS_PREVIEW_CLAUSES = 5             # risky clauses previewed while a job runs
+
+# ---------------------------------------------------------------------------
+# HTTP analysis service (api_server.py)
+# ---------------------------------------------------------------------------
+API_HOST = os.environ.get("API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("API_PORT") or 8080)
+API_MAX_REQUEST_BYTES = 25 * 1024 * 1024  # request bodies above this get 413
+API_MAX_BATCH_DOCUMENTS = 32              # documents per /analyze/batch request
+API_MAX_QUEUED = 64                       # documents waiting for a worker before 503
+
+# ---------------------------------------------------------------------------
+# Instrumentation (utils/metrics.py); METRICS_ENABLED=0 turns recording off
+# ---------------------------------------------------------------------------
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") != "0"
+
+# Slow-document profiling (utils/profiling.py): analyses taking at least
+# PROFILE_THRESHOLD_SECONDS are saved as cProfile dumps (off if unset)
+PROFILE_THRESHOLD_SECONDS = float(os.environ["PROFILE_THRESHOLD_SECONDS"]) if os.environ.get("PROFILE_THRESHOLD_SECONDS") else None
+PROFILE_DIR = os.environ.get("PROFILE_DIR") or "profiles"
+PROFILE_TOP_FUNCTIONS = 25               # hot functions listed next to each profile
+
 # ---------------------------------------------------------------------------
 # UI colour palette (hex strings injected via st.markdown CSS)
 # ---------------------------------------------------------------------------
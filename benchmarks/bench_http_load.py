@@ -0,0 +1,231 @@
+"""
+benchmarks/bench_http_load.py
+-----------------------------
+Load generator for the HTTP analysis service (api_server.py).
+
+For each concurrency level, that many client threads send POST /analyze
+requests over keep-alive connections until the level's request count is
+reached, and the latency percentiles (p50/p95/p99), throughput and error
+count are reported. Each request body gets a unique trailing line by
+default, so every request runs the full pipeline rather than hitting the
+service's result cache.
+
+With --spawn a local server is started on a free port for the run, so the
+benchmark needs nothing else running.
+
+Usage:
+    python -m benchmarks.bench_http_load [--url http://127.0.0.1:8080 | --spawn]
+        [--concurrency 1,2,4,8,16] [--requests 200] [--file data/sample_contract.txt]
+        [--mode keyword] [--batch 1] [--allow-cache] [--out load.json]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SAMPLE_PATH = os.path.join(REPO_ROOT, "data", "sample_contract.txt")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class _Client:
+    """One keep-alive connection; reconnects after errors."""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.host, self.port, self.timeout = host, port, timeout
+        self.conn: Optional[http.client.HTTPConnection] = None
+
+    def post(self, path: str, body: bytes, content_type: str) -> int:
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            self.conn.request("POST", path, body=body, headers={"Content-Type": content_type})
+            response = self.conn.getresponse()
+            response.read()
+            if response.will_close:
+                self.close()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+def _request_body(text: str, n: int, unique: bool, batch: int) -> bytes:
+    docs = [
+        {"text": f"{text}\n\nref {n}-{i}" if unique else text, "filename": f"load-{n}-{i}.txt"}
+        for i in range(batch)
+    ]
+    if batch == 1:
+        return json.dumps(docs[0]).encode("utf-8")
+    return json.dumps({"documents": docs}).encode("utf-8")
+
+
+def run_level(
+    host: str,
+    port: int,
+    text: str,
+    concurrency: int,
+    n_requests: int,
+    mode: str,
+    batch: int,
+    unique: bool,
+    timeout: float,
+) -> Dict:
+    """Sends `n_requests` requests from `concurrency` threads; returns the summary."""
+    path = ("/analyze/batch" if batch > 1 else "/analyze") + f"?mode={mode}"
+    counter = iter(range(n_requests))
+    counter_lock = threading.Lock()
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    results_lock = threading.Lock()
+
+    def _worker() -> None:
+        client = _Client(host, port, timeout)
+        while True:
+            with counter_lock:
+                n = next(counter, None)
+            if n is None:
+                break
+            body = _request_body(text, n, unique, batch)
+            start = time.perf_counter()
+            try:
+                status = str(client.post(path, body, "application/json"))
+            except (OSError, http.client.HTTPException) as e:
+                status = type(e).__name__
+            elapsed = time.perf_counter() - start
+            with results_lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == "200":
+                    latencies.append(elapsed)
+        client.close()
+
+    threads = [threading.Thread(target=_worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    ok = len(latencies)
+    return {
+        "concurrency": concurrency,
+        "requests": n_requests,
+        "ok": ok,
+        "errors": n_requests - ok,
+        "statuses": statuses,
+        "seconds": round(wall, 3),
+        "throughput_rps": round(ok / wall, 2) if wall else 0.0,
+        "docs_per_second": round(ok * batch / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(workers: Optional[int], timeout: float = 30.0):
+    """Starts api_server.py on a free local port and waits for /health."""
+    port = _free_port()
+    cmd = [sys.executable, "api_server.py", "--host", "127.0.0.1", "--port", str(port)]
+    if workers:
+        cmd += ["--workers", str(workers)]
+    proc = subprocess.Popen(cmd, cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"api_server.py exited early:\n{proc.stderr.read().decode(errors='replace')}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                conn.close()
+                return proc, port
+        except OSError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise SystemExit("api_server.py did not become healthy in time")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP analysis service load test")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default="http://127.0.0.1:8080", help="Running service to test")
+    target.add_argument("--spawn", action="store_true", help="Start a local api_server.py for the run")
+    parser.add_argument("--workers", type=int, help="Workers of the spawned server")
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="Comma-separated client counts")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per concurrency level")
+    parser.add_argument("--file", default=SAMPLE_PATH, help="Text document sent in each request")
+    parser.add_argument("--mode", default="keyword", help="Prediction mode")
+    parser.add_argument("--batch", type=int, default=1, help="Documents per request (>1 uses /analyze/batch)")
+    parser.add_argument("--allow-cache", dest="unique", action="store_false",
+                        help="Send identical documents (measures the result cache path)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--out", help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    with open(args.file, encoding="utf-8") as f:
+        text = f.read()
+
+    proc = None
+    if args.spawn:
+        proc, port = spawn_server(args.workers)
+        host = "127.0.0.1"
+    else:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname or "127.0.0.1", parts.port or 80
+
+    levels = []
+    try:
+        print(f"{'conc':>5}{'ok':>7}{'err':>6}{'req/s':>9}{'docs/s':>9}"
+              f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+        for concurrency in (int(c) for c in args.concurrency.split(",")):
+            r = run_level(host, port, text, concurrency, args.requests, args.mode,
+                          args.batch, args.unique, args.timeout)
+            levels.append(r)
+            print(f"{r['concurrency']:>5}{r['ok']:>7}{r['errors']:>6}{r['throughput_rps']:>9.1f}"
+                  f"{r['docs_per_second']:>9.1f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}"
+                  f"{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}")
+            if r["errors"]:
+                print(f"      statuses: {r['statuses']}")
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"target": f"{host}:{port}", "mode": args.mode, "batch": args.batch,
+                       "unique_documents": args.unique, "levels": levels}, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+benchmarks/bench_import_time.py
+-------------------------------
+Startup cost of the app and CLI entry points.
+
+Each entry point is imported in a fresh interpreter under
+`python -X importtime`; the per-module timings it prints are summed into a
+total, a module count and the slowest modules by cumulative time. The
+report is printed and written as JSON so it can be kept alongside earlier
+runs and compared over time.
+
+Importing `app` executes the Streamlit script in "bare" mode, which is
+enough to measure its imports; Streamlit only warns about the missing
+script context.
+
+With --check, entry points listed in IMPORT_BUDGETS are also held to their
+import-time and module-count limits and must not import the listed heavy
+packages; any violation is reported and the exit status is 1, so the check
+can run in CI.
+
+Usage:
+    python -m benchmarks.bench_import_time [module ...] [--repeat 3] [--top 10]
+                                           [--out import_times.json] [--check]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.report import REPO_ROOT, run_info
+
+ENTRY_POINTS = (
+    "app",
+    "analyze_contracts",
+    "train_classifier",
+    "demo_data_prep",
+    "utils.risk_predictor",
+)
+
+# Packages that are only needed on specific code paths (PDF upload, ML
+# backend, training) and must not be loaded just by starting up
+HEAVY_PACKAGES = ("sklearn", "scipy", "joblib", "pandas", "PyPDF2", "pdfplumber", "nltk", "spacy")
+
+# Startup limits for --check. NumPy (optional, ~100 modules) is allowed;
+# the app budget covers Streamlit itself, which also pulls in pandas.
+IMPORT_BUDGETS = {
+    "utils.risk_predictor": {"max_ms": 400, "max_modules": 300, "forbidden": HEAVY_PACKAGES},
+    "app": {
+        "max_ms": 4000,
+        "max_modules": 2500,
+        "forbidden": tuple(p for p in HEAVY_PACKAGES if p != "pandas"),
+    },
+}
+
+_PREFIX = "import time:"
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    Parses `-X importtime` output into one dict per imported module with
+    "module", "depth", "self_us" and "cumulative_us".
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith(_PREFIX):
+            continue
+        fields = line[len(_PREFIX):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the column header
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        rows.append({
+            "module": stripped,
+            "depth": (len(name) - len(stripped) - 1) // 2,
+            "self_us": int(fields[0]),
+            "cumulative_us": int(fields[1]),
+        })
+    return rows
+
+
+def measure(module: str, top: int = 10) -> Dict:
+    """Imports `module` once in a fresh interpreter and summarises the cost."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+
+    rows = parse_importtime(proc.stderr)
+    result = {
+        "ok": proc.returncode == 0,
+        "wall_ms": round(wall * 1000, 1),
+        "import_ms": round(sum(r["self_us"] for r in rows) / 1000, 1),
+        "modules": len(rows),
+        "packages": sorted({r["module"].split(".")[0] for r in rows}),
+        "slowest": [
+            {"module": r["module"], "cumulative_ms": round(r["cumulative_us"] / 1000, 1)}
+            for r in sorted(rows, key=lambda r: r["cumulative_us"], reverse=True)[:top]
+        ],
+    }
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith(_PREFIX)]
+        result["error"] = errors[-1] if errors else f"exit status {proc.returncode}"
+    return result
+
+
+def check_budget(module: str, result: Dict, budget: Dict) -> List[str]:
+    """Budget violations of one measured entry point (empty when within budget)."""
+    if not result["ok"]:
+        return [f"{module}: import failed ({result.get('error')})"]
+    problems = []
+    if result["import_ms"] > budget["max_ms"]:
+        problems.append(f"{module}: {result['import_ms']:.0f} ms > {budget['max_ms']} ms")
+    if result["modules"] > budget["max_modules"]:
+        problems.append(f"{module}: {result['modules']} modules > {budget['max_modules']}")
+    loaded = sorted(set(budget.get("forbidden", ())) & set(result["packages"]))
+    if loaded:
+        problems.append(f"{module}: imports {', '.join(loaded)} at startup")
+    return problems
+
+
+def run(modules, repeat: int = 3, top: int = 10) -> Dict:
+    """Best-of-`repeat` import measurements for each module."""
+    report = {**run_info(), "entry_points": {}}
+    for module in modules:
+        runs = [measure(module, top) for _ in range(max(repeat, 1))]
+        report["entry_points"][module] = min(runs, key=lambda r: r["import_ms"])
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entry point import-time report")
+    parser.add_argument("modules", nargs="*", default=list(ENTRY_POINTS), help="Modules to import")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh imports per module (best-of)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list")
+    parser.add_argument("--out", default="import_times.json", help="JSON report path")
+    parser.add_argument("--check", action="store_true",
+                        help="Fail when an entry point exceeds its IMPORT_BUDGETS entry")
+    args = parser.parse_args()
+
+    report = run(args.modules, args.repeat, args.top)
+
+    for module, r in report["entry_points"].items():
+        status = "" if r["ok"] else f"  FAILED: {r['error']}"
+        print(f"{module:<24} {r['import_ms']:8.1f} ms  {r['modules']:5d} modules  "
+              f"(wall {r['wall_ms']:.0f} ms){status}")
+        for s in r["slowest"]:
+            print(f"    {s['cumulative_ms']:8.1f} ms  {s['module']}")
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.out}")
+
+    if args.check:
+        problems = [
+            problem
+            for module, result in report["entry_points"].items()
+            if module in IMPORT_BUDGETS
+            for problem in check_budget(module, result, IMPORT_BUDGETS[module])
+        ]
+        for problem in problems:
+            print(f"BUDGET EXCEEDED  {problem}", file=sys.stderr)
+        if problems:
+            raise SystemExit(1)
+        print("All import budgets met.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+benchmarks/bench_pdf_engines.py
+-------------------------------
+Compares the registered PDF extraction engines on a local corpus.
+
+For every PDF in the corpus and every installed engine (plus "auto") it
+measures serial extraction throughput and text fidelity. Fidelity is the
+token-level F1 score against a ground-truth `<name>.txt` next to the PDF
+when one exists, otherwise against the other engines' output.
+
+Usage:
+    python -m benchmarks.bench_pdf_engines --corpus path/to/pdfs [--repeat 3] [--json out.json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import time
+from collections import Counter
+from typing import Dict, List
+
+from src.data_preprocessing.pdf_extractor import available_engines, extract_pdf_pages
+
+_TOKEN = re.compile(r"\w+")
+
+
+def token_f1(candidate: str, reference: str) -> float:
+    """Bag-of-words F1 between two texts (1.0 = same tokens)."""
+    cand = Counter(_TOKEN.findall(candidate.lower()))
+    ref = Counter(_TOKEN.findall(reference.lower()))
+    if not cand and not ref:
+        return 1.0
+    overlap = sum((cand & ref).values())
+    if overlap == 0:
+        return 0.0
+    precision = overlap / sum(cand.values())
+    recall = overlap / sum(ref.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def bench_file(path: str, engines: List[str], repeat: int) -> Dict:
+    with open(path, "rb") as f:
+        data = f.read()
+
+    texts, rows = {}, {}
+    for engine in engines:
+        best = float("inf")
+        pages: List[str] = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            pages = extract_pdf_pages(data, workers=1, engine=engine, use_cache=False)
+            best = min(best, time.perf_counter() - start)
+        texts[engine] = "\n".join(pages)
+        rows[engine] = {
+            "seconds": best,
+            "pages": len(pages),
+            "empty_pages": sum(1 for p in pages if not p.strip()),
+            "chars": len(texts[engine]),
+        }
+
+    truth_path = os.path.splitext(path)[0] + ".txt"
+    truth = None
+    if os.path.isfile(truth_path):
+        with open(truth_path, encoding="utf-8", errors="ignore") as f:
+            truth = f.read()
+
+    for engine in engines:
+        if truth is not None:
+            rows[engine]["fidelity"] = token_f1(texts[engine], truth)
+        else:
+            others = [texts[e] for e in engines if e != engine and e != "auto"]
+            scores = [token_f1(texts[engine], other) for other in others]
+            rows[engine]["fidelity"] = sum(scores) / len(scores) if scores else None
+
+    return {"file": path, "bytes": len(data), "ground_truth": truth is not None, "engines": rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF extraction engine benchmark")
+    parser.add_argument("--corpus", default="data", help="Directory containing .pdf files")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best-of)")
+    parser.add_argument("--json", help="Write the full report to this JSON file")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.corpus, "**", "*.pdf"), recursive=True))
+    if not paths:
+        raise SystemExit(f"No PDF files found under '{args.corpus}'.")
+
+    engines = available_engines()
+    if len(engines) > 1:
+        engines.append("auto")
+    print(f"Engines: {', '.join(engines)}  |  Files: {len(paths)}\n")
+
+    results = [bench_file(p, engines, args.repeat) for p in paths]
+
+    totals = {e: {"seconds": 0.0, "pages": 0, "empty_pages": 0, "bytes": 0, "fidelity": []} for e in engines}
+    for res in results:
+        for engine, row in res["engines"].items():
+            t = totals[engine]
+            t["seconds"] += row["seconds"]
+            t["pages"] += row["pages"]
+            t["empty_pages"] += row["empty_pages"]
+            t["bytes"] += res["bytes"]
+            if row["fidelity"] is not None:
+                t["fidelity"].append(row["fidelity"])
+
+    print(f"{'Engine':<12}{'pages/s':>10}{'MB/s':>8}{'empty':>8}{'fidelity':>10}")
+    summary = {}
+    for engine, t in totals.items():
+        secs = t["seconds"] or 1e-9
+        fid = sum(t["fidelity"]) / len(t["fidelity"]) if t["fidelity"] else None
+        summary[engine] = {
+            "pages_per_sec": t["pages"] / secs,
+            "mb_per_sec": t["bytes"] / secs / 1e6,
+            "empty_pages": t["empty_pages"],
+            "fidelity": fid,
+        }
+        fid_str = f"{fid:.3f}" if fid is not None else "—"
+        print(
+            f"{engine:<12}{summary[engine]['pages_per_sec']:>10.1f}"
+            f"{summary[engine]['mb_per_sec']:>8.2f}{t['empty_pages']:>8}{fid_str:>10}"
+        )
+
+    ranking = sorted(
+        (e for e in summary if e != "auto"),
+        key=lambda e: summary[e]["pages_per_sec"],
+        reverse=True,
+    )
+    print(f"\nSuggested AUTO_ENGINE_ORDER = {tuple(ranking)}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "ranking": ranking, "files": results}, f, indent=2)
+        print(f"Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+benchmarks/bench_pdf_parallel.py
+--------------------------------
+Finds the page count from which parallel PDF extraction beats serial.
+
+For each page count, a synthetic PDF (see generators.synthetic_pdf) is
+extracted once serially and once through the process pool, with the text
+cache off. The parallel time includes starting the workers with
+PDF_POOL_START_METHOD, which is the cost PDF_PARALLEL_PAGE_THRESHOLD is
+meant to amortise. The break-even point is the smallest measured page
+count from which the pool is faster at every larger size.
+
+Only meaningful with several cores: on a single CPU the pool can never
+win, and the report says so.
+
+Usage:
+    python -m benchmarks.bench_pdf_parallel [--pages 10,25,50,100,200] [--workers 4]
+                                            [--repeat 3] [--json pdf_parallel.json] [--check]
+
+--check exits with status 1 when the pool is not faster at the configured
+PDF_PARALLEL_PAGE_THRESHOLD and above.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.generators import fingerprint, synthetic_pdf
+from benchmarks.report import run_info
+from src.data_preprocessing.config import (
+    PDF_ENGINE,
+    PDF_PARALLEL_PAGE_THRESHOLD,
+    PDF_POOL_START_METHOD,
+)
+from src.data_preprocessing.pdf_extractor import extract_pdf_pages
+
+
+def _best_of(data: bytes, workers: int, engine: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract_pdf_pages(data, workers=workers, parallel_threshold=0, engine=engine, use_cache=False)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def break_even(rows: List[Dict]) -> Optional[int]:
+    """Smallest page count from which parallel is faster at every larger size."""
+    pages = None
+    for row in reversed(rows):
+        if row["speedup"] <= 1.0:
+            break
+        pages = row["pages"]
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs parallel PDF extraction break-even")
+    parser.add_argument("--pages", default="10,25,50,100,200", help="Comma-separated page counts")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Pool size (default: CPU count)")
+    parser.add_argument("--engine", default=PDF_ENGINE, help="PDF engine (default: PDF_ENGINE)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best-of)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic PDFs")
+    parser.add_argument("--json", default="pdf_parallel.json", help="Report path")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit 1 if the pool does not pay off from PDF_PARALLEL_PAGE_THRESHOLD up")
+    args = parser.parse_args()
+
+    page_counts = sorted(int(p) for p in args.pages.split(","))
+    if args.workers < 2:
+        print(f"Only {args.workers} worker(s): the pool cannot beat serial extraction here; "
+              "run this on a multi-core machine.\n")
+
+    print(f"Engine: {args.engine}  |  workers: {args.workers}  |  start method: {PDF_POOL_START_METHOD}\n")
+    print(f"{'pages':>6}{'serial s':>11}{'parallel s':>12}{'speedup':>9}")
+    rows = []
+    for n_pages in page_counts:
+        data = synthetic_pdf(n_pages, args.seed)
+        serial = _best_of(data, 1, args.engine, args.repeat)
+        parallel = _best_of(data, args.workers, args.engine, args.repeat)
+        rows.append({
+            "pages": n_pages,
+            "fingerprint": fingerprint(data),
+            "serial_seconds": serial,
+            "parallel_seconds": parallel,
+            "speedup": serial / parallel,
+        })
+        print(f"{n_pages:>6}{serial:>11.3f}{parallel:>12.3f}{serial / parallel:>8.2f}x")
+
+    pages = break_even(rows)
+    print(f"\nBreak-even: {f'{pages} pages' if pages is not None else 'not reached'}"
+          f"  |  PDF_PARALLEL_PAGE_THRESHOLD = {PDF_PARALLEL_PAGE_THRESHOLD}")
+
+    report = {
+        **run_info(),
+        "cpu_count": os.cpu_count(),
+        "workers": args.workers,
+        "engine": args.engine,
+        "start_method": PDF_POOL_START_METHOD,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "threshold": PDF_PARALLEL_PAGE_THRESHOLD,
+        "break_even_pages": pages,
+        "results": rows,
+    }
+    with open(args.json, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.json}")
+
+    if args.check and (pages is None or pages > PDF_PARALLEL_PAGE_THRESHOLD):
+        print(f"Parallel extraction does not pay off at {PDF_PARALLEL_PAGE_THRESHOLD} pages.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
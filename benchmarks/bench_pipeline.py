@@ -0,0 +1,304 @@
+"""
+benchmarks/bench_pipeline.py
+----------------------------
+Times every stage of the analysis pipeline on synthetic contracts of
+increasing size and writes a JSON report that later runs can be compared
+against.
+
+Stages (each timed on its own, on inputs prepared beforehand):
+    extract_txt          file_handler.extract_text_from_bytes on a .txt
+    extract_pdf          pdf_extractor.extract_pdf_pages on a synthetic PDF
+                         (serial, text cache off; what file_handler uses)
+    segment_spans        src segmenter (segment_into_clauses)
+    segment_document     utils.clause_segmenter.segment_document (ClauseTable)
+    predict_clause_risk  the per-clause keyword predictor, clause by clause
+    analyze_clauses      batch prediction of the whole document
+    summary_stats        compute_summary_stats of the analyzed document
+    clean_text           text_cleaner.clean_text on every clause
+    render_cards         card HTML of every clause (ClauseCards) plus page 1
+    pipeline             run_analysis end to end, result cache off
+
+Text stages run once per --sizes entry, extract_pdf once per --pdf-pages
+entry. Inputs come from benchmarks/generators.py and are deterministic for
+a given --seed; their content hashes are stored in the report. Stages whose
+optional dependencies are missing (no PDF engine installed) are reported as
+skipped.
+
+With --compare BASELINE.json, every stage/size measured in both runs is
+compared on its best time: a slowdown above --tolerance (relative) and
+--min-ms (absolute, to ignore timer noise on tiny inputs) is a regression.
+Regressions and failed stages are listed on stderr and the exit status is
+1, so the comparison can gate CI.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--sizes 1KB,100KB,1MB,10MB] [--pdf-pages 10,100]
+        [--stages segment_spans,pipeline] [--repeat 3] [--seed 0]
+        [--out pipeline_bench.json] [--compare baseline.json] [--tolerance 0.25] [--min-ms 1]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.generators import fingerprint, format_size, parse_size, synthetic_contract, synthetic_pdf
+from benchmarks.report import run_info
+
+TEXT_STAGES = (
+    "extract_txt",
+    "segment_spans",
+    "segment_document",
+    "predict_clause_risk",
+    "analyze_clauses",
+    "summary_stats",
+    "clean_text",
+    "render_cards",
+    "pipeline",
+)
+PDF_STAGES = ("extract_pdf",)
+STAGES = TEXT_STAGES[:1] + PDF_STAGES + TEXT_STAGES[1:]
+
+DEFAULT_SIZES = "1KB,100KB,1MB,10MB"
+DEFAULT_PDF_PAGES = "10,100"
+
+# A stage: (function to time, items it processes, unit of the items)
+Stage = Tuple[Callable[[], object], int, str]
+
+
+def text_stages(text: str, names) -> Dict[str, Stage]:
+    """The selected text stages, with their inputs prepared from `text`."""
+    from components.clause_html import ClauseCards
+    from src.data_preprocessing.segmenter import segment_into_clauses
+    from src.data_preprocessing.text_cleaner import clean_text
+    from utils.analysis_pipeline import run_analysis
+    from utils.clause_segmenter import segment_document
+    from utils.file_handler import extract_text_from_bytes
+    from utils.risk_predictor import analyze_clauses, compute_summary_stats, predict_clause_risk
+
+    raw = text.encode("utf-8")
+    table = segment_document(text)
+    n = len(table)
+    clause_dicts = [{"id": c["id"], "text": c["text"], "word_count": c["word_count"]} for c in table]
+    texts = table.texts()
+    analyzed = analyze_clauses(segment_document(text))
+
+    def _render():
+        cards = ClauseCards(analyzed)
+        return cards.page_html(cards.ids("all"), 1, 50)
+
+    stages = {
+        "extract_txt": (lambda: extract_text_from_bytes(raw, "bench.txt"), len(raw), "bytes"),
+        "segment_spans": (lambda: segment_into_clauses(text), n, "clauses"),
+        "segment_document": (lambda: segment_document(text), n, "clauses"),
+        "predict_clause_risk": (lambda: [predict_clause_risk(c) for c in clause_dicts], n, "clauses"),
+        "analyze_clauses": (lambda: analyze_clauses(segment_document(text)), n, "clauses"),
+        "summary_stats": (lambda: compute_summary_stats(analyzed), n, "clauses"),
+        "clean_text": (lambda: [clean_text(t) for t in texts], n, "clauses"),
+        "render_cards": (_render, n, "clauses"),
+        "pipeline": (lambda: run_analysis(raw, "bench.txt", use_cache=False), n, "clauses"),
+    }
+    return {name: stages[name] for name in names}
+
+
+def pdf_stages(data: bytes, n_pages: int, names) -> Dict[str, Stage]:
+    """The selected PDF stages for one synthetic PDF."""
+    from src.data_preprocessing.pdf_extractor import extract_pdf_pages
+
+    stages = {
+        "extract_pdf": (lambda: extract_pdf_pages(data, workers=1, use_cache=False), n_pages, "pages"),
+    }
+    return {name: stages[name] for name in names}
+
+
+def pdf_unavailable() -> Optional[str]:
+    """Why the PDF stages cannot run here, or None if they can."""
+    from src.data_preprocessing.pdf_extractor import available_engines
+
+    if not available_engines():
+        return "no PDF engine installed (PyPDF2 or pdfplumber)"
+    return None
+
+
+def time_stage(fn: Callable[[], object], repeat: int) -> Dict:
+    """Best and median wall time of `repeat` calls."""
+    runs = []
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return {"seconds": min(runs), "median_seconds": statistics.median(runs)}
+
+
+def _measure(stages: Dict[str, Stage], n_bytes: int, input_hash: str, repeat: int, results: Dict, label: str):
+    for name, (fn, items, unit) in stages.items():
+        try:
+            row = time_stage(fn, repeat)
+        except Exception as e:
+            row = {"error": f"{type(e).__name__}: {e}"}
+        else:
+            secs = row["seconds"] or 1e-9
+            row.update({
+                "bytes": n_bytes,
+                "items": items,
+                "unit": unit,
+                "mb_per_s": round(n_bytes / secs / 1e6, 3),
+                "items_per_s": round(items / secs, 1),
+            })
+        row["input"] = input_hash
+        results.setdefault(name, {})[label] = row
+        _print_row(name, label, row)
+
+
+def _print_row(stage: str, label: str, row: Dict) -> None:
+    if "error" in row:
+        print(f"{stage:<20}{label:>8}  FAILED: {row['error']}")
+        return
+    print(
+        f"{stage:<20}{label:>8}{row['seconds'] * 1000:>11.2f}{row['median_seconds'] * 1000:>11.2f}"
+        f"{row['mb_per_s']:>9.2f}{row['items_per_s']:>12.0f} {row['unit']}/s"
+    )
+
+
+def run(sizes: List[int], pdf_pages: List[int], stages, repeat: int = 3, seed: int = 0) -> Dict:
+    """Runs the selected stages on every input; returns the report."""
+    report = {**run_info(), "repeat": repeat, "seed": seed, "results": {}, "skipped": {}}
+    results = report["results"]
+
+    print(f"{'stage':<20}{'input':>8}{'best ms':>11}{'median ms':>11}{'MB/s':>9}{'throughput':>12}")
+    text_names = [s for s in stages if s in TEXT_STAGES]
+    if text_names:
+        for size in sizes:
+            text = synthetic_contract(size, seed)
+            n_bytes = len(text.encode("utf-8"))
+            _measure(text_stages(text, text_names), n_bytes, fingerprint(text), repeat, results, format_size(size))
+
+    pdf_names = [s for s in stages if s in PDF_STAGES]
+    if pdf_names:
+        reason = pdf_unavailable()
+        if reason:
+            for name in pdf_names:
+                report["skipped"][name] = reason
+                print(f"{name:<20}{'':>8}  skipped: {reason}")
+        else:
+            for n_pages in pdf_pages:
+                data = synthetic_pdf(n_pages, seed)
+                _measure(pdf_stages(data, n_pages, pdf_names), len(data), fingerprint(data),
+                         repeat, results, f"{n_pages}p")
+    return report
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float, min_ms: float) -> Tuple[List[str], List[str]]:
+    """
+    Compares a report against a baseline report.
+
+    Returns:
+        (regressions, notes): regressions fail the run (slowdowns beyond
+        the tolerance, stages that failed); notes are informational
+        (changed inputs, stages not measured in both runs).
+    """
+    regressions, notes = [], []
+    if (report.get("python"), report.get("platform")) != (baseline.get("python"), baseline.get("platform")):
+        notes.append(
+            f"baseline was recorded on Python {baseline.get('python')} / {baseline.get('platform')}"
+        )
+
+    print(f"\nCompared with baseline {baseline.get('commit') or '?'} ({baseline.get('timestamp', '?')})")
+    print(f"{'stage':<20}{'input':>8}{'base ms':>11}{'now ms':>11}{'change':>9}")
+    for stage, rows in report["results"].items():
+        for label, row in rows.items():
+            base = baseline.get("results", {}).get(stage, {}).get(label)
+            if "error" in row:
+                regressions.append(f"{stage} {label}: failed ({row['error']})")
+                continue
+            if base is None or "error" in base:
+                notes.append(f"{stage} {label}: not in baseline")
+                continue
+            if base.get("input") != row.get("input"):
+                notes.append(f"{stage} {label}: input differs from baseline, not compared")
+                continue
+            change = row["seconds"] / base["seconds"] - 1 if base["seconds"] else 0.0
+            slower_ms = (row["seconds"] - base["seconds"]) * 1000
+            flag = ""
+            if change > tolerance and slower_ms > min_ms:
+                flag = "  REGRESSION"
+                regressions.append(
+                    f"{stage} {label}: {base['seconds'] * 1000:.2f} ms -> {row['seconds'] * 1000:.2f} ms "
+                    f"({change:+.0%}, tolerance {tolerance:.0%})"
+                )
+            print(f"{stage:<20}{label:>8}{base['seconds'] * 1000:>11.2f}{row['seconds'] * 1000:>11.2f}"
+                  f"{change:>+9.0%}{flag}")
+
+    for stage, rows in baseline.get("results", {}).items():
+        if stage in report["results"]:
+            for label in rows:
+                if label not in report["results"][stage]:
+                    notes.append(f"{stage} {label}: in baseline but not measured")
+        elif stage in report["skipped"]:
+            notes.append(f"{stage}: in baseline but skipped ({report['skipped'][stage]})")
+    return regressions, notes
+
+
+def _csv(value: str) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage pipeline benchmark")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help="Comma-separated text sizes, e.g. 1KB,1MB,50MB (default: %(default)s)")
+    parser.add_argument("--pdf-pages", default=DEFAULT_PDF_PAGES,
+                        help="Comma-separated page counts of the synthetic PDFs (default: %(default)s)")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions per stage (best-of)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic inputs")
+    parser.add_argument("--out", default="pipeline_bench.json", help="JSON report path")
+    parser.add_argument("--compare", metavar="BASELINE", help="Fail on regressions against this report")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative slowdown before a stage counts as regressed")
+    parser.add_argument("--min-ms", type=float, default=1.0,
+                        help="Slowdowns smaller than this many ms are never regressions")
+    args = parser.parse_args()
+
+    stages = _csv(args.stages)
+    unknown = sorted(set(stages) - set(STAGES))
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)} (available: {', '.join(STAGES)})")
+    try:
+        sizes = [parse_size(s) for s in _csv(args.sizes)]
+    except ValueError as e:
+        parser.error(str(e))
+    pdf_pages = [int(p) for p in _csv(args.pdf_pages)]
+
+    baseline = None
+    if args.compare:
+        # Read first so a missing baseline fails before the long run
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    report = run(sizes, pdf_pages, stages, args.repeat, args.seed)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.out}")
+
+    failed = [
+        f"{stage} {label}: failed ({row['error']})"
+        for stage, rows in report["results"].items()
+        for label, row in rows.items()
+        if "error" in row
+    ]
+    if baseline is not None:
+        failed, notes = compare(report, baseline, args.tolerance, args.min_ms)
+        for note in notes:
+            print(f"note: {note}")
+    for problem in failed:
+        print(f"FAIL  {problem}", file=sys.stderr)
+    if failed:
+        raise SystemExit(1)
+    if baseline is not None:
+        print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+benchmarks/bench_render.py
+--------------------------
+Cost of rendering the clause list for one rerun of the results section.
+
+"Before" is the original layout: three st.tabs (All / Risky / Safe) that
+each render their full list with one st.markdown element per clause.
+"After" is the paginated layout: only the selected view is built, and one
+page of cards is sent as a single HTML payload, either built on every rerun
+or joined from the ClauseCards fragments cached with the result.
+
+Streamlit is not needed: the benchmark times building the HTML and counts
+the markdown elements and bytes a rerun would send to the browser. Render
+time inside the app is shown per run in the Diagnostics panel.
+
+Usage:
+    python -m benchmarks.bench_render [--paragraphs 3000] [--page-size 50] [--repeat 5]
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List, Tuple
+
+from app_config import COLOUR
+from benchmarks.generators import sample_paragraphs
+from components.clause_html import ClauseCards, clause_page_html, filter_clauses
+from utils.analysis_pipeline import run_analysis
+
+
+def legacy_card(clause: Dict) -> str:
+    """The per-clause markup of the original render_risky/safe_clause."""
+    conf_pct = int(clause["confidence"] * 100)
+    if clause["label"] == "Risky":
+        keywords_html = "".join(f'<span class="keyword-tag">🔑 {kw}</span>' for kw in clause["matched_keywords"])
+        categories_html = "".join(f'<span class="cat-chip">{cat}</span>' for cat in clause["categories"])
+        extra = f"""
+            <div style="margin-top:12px;">
+                {keywords_html}
+            </div>
+            <div style="margin-top:6px;">
+                {categories_html}
+            </div>"""
+        card, badge, colour = "risky-card", '<span class="badge-risky">⚠ RISKY</span>', COLOUR["border_risky"]
+    else:
+        extra = ""
+        card, badge, colour = "safe-card", '<span class="badge-safe">✔ SAFE</span>', COLOUR["border_safe"]
+    return f"""
+        <div class="{card}">
+            <div class="clause-header">
+                <span style="color:{COLOUR['text_secondary']};font-size:12px;font-weight:600;">
+                    CLAUSE #{clause['id']}
+                </span>
+                {badge}
+                <span style="font-size:12px;color:{COLOUR['text_secondary']};margin-left:auto;">
+                    {conf_pct}% confidence
+                </span>
+            </div>
+            <p class="clause-text">{clause['text']}</p>{extra}
+            <div class="conf-bar-wrap">
+                <div class="conf-bar-fill" style="width:{conf_pct}%; background:{colour};"></div>
+            </div>
+        </div>
+        """
+
+
+def legacy_rerun(clauses) -> Tuple[int, int]:
+    """All three tabs, one element per clause: (elements, bytes)."""
+    elements = nbytes = 0
+    tabs = (
+        list(clauses),
+        [c for c in clauses if c["label"] == "Risky"],
+        [c for c in clauses if c["label"] == "Safe"],
+    )
+    for tab in tabs:
+        for clause in tab:
+            nbytes += len(legacy_card(clause).encode("utf-8"))
+            elements += 1
+    return elements, nbytes
+
+
+def paged_rerun(clauses, page_size: int) -> Tuple[int, int]:
+    """The "All" view, first page, one payload: (elements, bytes)."""
+    shown = filter_clauses(clauses, show_safe=True)
+    html = clause_page_html(shown, 1, page_size)
+    return 1, len(html.encode("utf-8"))
+
+
+def cached_rerun(cards: ClauseCards, page_size: int) -> Tuple[int, int]:
+    """As paged_rerun, from pre-rendered fragments: (elements, bytes)."""
+    html = cards.page_html(cards.ids("all"), 1, page_size)
+    return 1, len(html.encode("utf-8"))
+
+
+def _best_of(fn, repeat: int) -> Tuple[float, Tuple[int, int]]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def _build_document(n_paragraphs: int) -> List:
+    paragraphs = sample_paragraphs()
+    rng = random.Random(0)
+    text = "\n\n".join(rng.choice(paragraphs) for _ in range(n_paragraphs))
+    result = run_analysis(text.encode("utf-8"), "bench.txt", use_cache=False)
+    return result["analyzed"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clause list rendering benchmark")
+    parser.add_argument("--paragraphs", type=int, default=3000, help="Paragraphs in the synthetic document")
+    parser.add_argument("--page-size", type=int, default=50, help="Cards per page")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best-of)")
+    args = parser.parse_args()
+
+    clauses = _build_document(args.paragraphs)
+
+    legacy_s, (legacy_elems, legacy_bytes) = _best_of(lambda: legacy_rerun(clauses), args.repeat)
+    paged_s, (paged_elems, paged_bytes) = _best_of(lambda: paged_rerun(clauses, args.page_size), args.repeat)
+    start = time.perf_counter()
+    cards = ClauseCards(clauses)
+    cards_s = time.perf_counter() - start
+    cached_s, (cached_elems, cached_bytes) = _best_of(lambda: cached_rerun(cards, args.page_size), args.repeat)
+
+    print(f"Clauses in document : {len(clauses)}")
+    print(f"{'':22}{'build ms':>10}{'elements':>10}{'KB sent':>10}")
+    print(f"{'Tabs, per clause':22}{legacy_s * 1000:10.1f}{legacy_elems:10d}{legacy_bytes / 1024:10.0f}")
+    print(f"{'Paged, one payload':22}{paged_s * 1000:10.1f}{paged_elems:10d}{paged_bytes / 1024:10.0f}")
+    print(f"{'Paged, cached cards':22}{cached_s * 1000:10.2f}{cached_elems:10d}{cached_bytes / 1024:10.0f}")
+    print(f"Building the card cache once: {cards_s * 1000:.1f} ms")
+    print(f"Speedup (build)     : {legacy_s / paged_s:.1f}x paged, {legacy_s / cached_s:.1f}x from cached cards")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+benchmarks/bench_segmenter.py
+-----------------------------
+Compares the single-pass span segmenter against the original
+split/rematch/concatenate implementation on synthetic contracts of
+increasing size, and reports throughput and peak allocation per size so
+that linear scaling (constant MB/s) is easy to check.
+
+Usage:
+    python -m benchmarks.bench_segmenter [--sizes 1,2,5,10] [--repeat 3]
+"""
+
+import argparse
+import re
+import time
+import tracemalloc
+from typing import List
+
+from benchmarks.generators import synthetic_contract
+from src.data_preprocessing.segmenter import segment_into_clauses, segment_spans
+
+
+def legacy_segment(text: str) -> List[str]:
+    """The pre-span implementation of segment_into_clauses."""
+    if not text:
+        return []
+    paragraphs = re.split(r"\n\s*\n", text)
+    clauses = []
+    for para in paragraphs:
+        para = para.strip()
+        if not para:
+            continue
+        delimiters = r"(?m)(^\s*\d+\.\d*\s*|^\s*[a-z]\)\s*|^\s*[ivx]+\.\s*)"
+        parts = re.split(delimiters, para)
+        current_clause = ""
+        for part in parts:
+            if re.match(delimiters, part):
+                if current_clause:
+                    clauses.append(current_clause.strip())
+                current_clause = part
+            else:
+                current_clause += part
+        if current_clause:
+            clauses.append(current_clause.strip())
+    return [c for c in clauses if len(c.split()) > 3]
+
+
+def _best_of(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_mb(fn, text: str) -> float:
+    tracemalloc.start()
+    try:
+        fn(text)
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clause segmenter benchmark")
+    parser.add_argument("--sizes", default="1,2,5,10", help="Comma-separated document sizes in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best-of)")
+    args = parser.parse_args()
+
+    print(
+        f"{'Size':>8}{'clauses':>10}{'legacy s':>10}{'MB/s':>8}{'peak MB':>9}"
+        f"{'spans s':>10}{'MB/s':>8}{'peak MB':>9}{'speedup':>9}"
+    )
+    for mb in (float(s) for s in args.sizes.split(",")):
+        text = synthetic_contract(int(mb * 1_000_000))
+        expected = legacy_segment(text)
+        if segment_into_clauses(text) != expected:
+            raise SystemExit(f"Span segmenter output differs from legacy on the {mb:g} MB document")
+
+        size_mb = len(text.encode("utf-8")) / 1e6
+        legacy = _best_of(legacy_segment, text, args.repeat)
+        spans = _best_of(segment_spans, text, args.repeat)
+        print(
+            f"{mb:>6g}MB{len(expected):>10}{legacy:>10.3f}{size_mb / legacy:>8.1f}"
+            f"{_peak_mb(legacy_segment, text):>9.1f}{spans:>10.3f}{size_mb / spans:>8.1f}"
+            f"{_peak_mb(segment_spans, text):>9.1f}{legacy / spans:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
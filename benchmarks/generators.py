@@ -0,0 +1,155 @@
+"""
+benchmarks/generators.py
+------------------------
+Deterministic synthetic inputs for the benchmarks.
+
+Contracts are built from the paragraphs of data/sample_contract.txt: they
+are shuffled with a fixed seed and mixed with numbered, lettered and roman
+sub-clauses, so every clause style the segmenter handles occurs at any
+size. The same (size, seed) always gives the same text, so timings from
+different runs and commits measure the same work.
+
+PDFs are written directly (uncompressed Helvetica text streams, one per
+page), so no PDF library is needed to produce them, only to read them.
+"""
+
+import hashlib
+import os
+import random
+import re
+import textwrap
+from functools import lru_cache
+from typing import List
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "sample_contract.txt")
+
+_SIZE_UNITS = {"": 1, "B": 1, "KB": 1_000, "MB": 1_000_000, "GB": 1_000_000_000}
+_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*$", re.IGNORECASE)
+
+# Page layout of synthetic_pdf (US Letter, 10pt Helvetica)
+_PDF_LINE_CHARS = 95
+_PDF_LINES_PER_PAGE = 60
+_PDF_LEADING = 12
+
+
+def parse_size(value: str) -> int:
+    """Bytes of a size like "512", "100KB" or "1.5MB" (decimal units)."""
+    match = _SIZE.match(value)
+    if not match:
+        raise ValueError(f"Invalid size '{value}' (expected e.g. 100KB or 10MB)")
+    number, unit = match.groups()
+    unit = unit.upper()
+    if unit and not unit.endswith("B"):
+        unit += "B"
+    return int(float(number) * _SIZE_UNITS[unit])
+
+
+def format_size(n_bytes: int) -> str:
+    """Short label of a byte count: 1KB, 2.5MB, ..."""
+    for unit in ("GB", "MB", "KB"):
+        if n_bytes >= _SIZE_UNITS[unit]:
+            return f"{n_bytes / _SIZE_UNITS[unit]:g}{unit}"
+    return f"{n_bytes}B"
+
+
+def fingerprint(data) -> str:
+    """Short content hash, recorded in reports so runs can check their inputs match."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha1(data).hexdigest()[:12]
+
+
+@lru_cache(maxsize=1)
+def sample_paragraphs() -> List[str]:
+    """Non-empty paragraphs of the sample contract."""
+    with open(SAMPLE_PATH, encoding="utf-8") as f:
+        return [p for p in re.split(r"\n\s*\n", f.read()) if p.strip()]
+
+
+def synthetic_contract(size_bytes: int, seed: int = 0) -> str:
+    """
+    Builds a contract of roughly `size_bytes` by shuffling paragraphs of the
+    sample contract and mixing in numbered and lettered sub-clauses (every
+    third paragraph) and roman-numbered ones (every fifth).
+    """
+    paragraphs = sample_paragraphs()
+    rng = random.Random(seed)
+    out, size, n = [], 0, 0
+    while size < size_bytes:
+        n += 1
+        para = rng.choice(paragraphs)
+        if n % 3 == 0:
+            para = f"{n}. {para}\na) the first party shall comply.\nb) the second party shall comply."
+        elif n % 5 == 0:
+            para = f"{para}\ni. notices shall be given in writing.\nii. either party may terminate on notice."
+        out.append(para)
+        size += len(para) + 2
+    return "\n\n".join(out)
+
+
+def _pdf_escape(line: str) -> str:
+    line = line.encode("latin-1", errors="replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _page_lines(n_pages: int, seed: int) -> List[List[str]]:
+    """The text of `n_pages` full pages, wrapped into lines."""
+    needed = n_pages * _PDF_LINES_PER_PAGE
+    lines: List[str] = []
+    # Wrapped prose fills about 3/4 of each line, plus the paragraph gaps
+    text = synthetic_contract(needed * _PDF_LINE_CHARS, seed)
+    for para in text.split("\n\n"):
+        for raw_line in para.split("\n"):
+            lines.extend(textwrap.wrap(raw_line, _PDF_LINE_CHARS) or [""])
+        lines.append("")
+        if len(lines) >= needed:
+            break
+    lines = lines[:needed]
+    return [lines[i:i + _PDF_LINES_PER_PAGE] for i in range(0, needed, _PDF_LINES_PER_PAGE)]
+
+
+def synthetic_pdf(n_pages: int, seed: int = 0) -> bytes:
+    """
+    A text PDF of `n_pages` pages of synthetic contract text (see
+    `synthetic_contract`), 60 lines per page.
+    """
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # filled in once the page tree exists
+    pages = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    kids = []
+    for page_lines in _page_lines(n_pages, seed):
+        ops = [f"BT /F{font} 10 Tf {_PDF_LEADING} TL 50 760 Td"]
+        ops.extend(f"({_pdf_escape(line)}) Tj T*" for line in page_lines)
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F%d %d 0 R >> >> /Contents %d 0 R >>"
+            % (pages, font, font, content)
+        ))
+
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages
+    objects[pages - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog, xref
+    )
+    return bytes(out)
@@ -0,0 +1,35 @@
+"""
+benchmarks/report.py
+--------------------
+Run metadata shared by the benchmarks that write JSON reports, so reports
+from different machines and commits can be told apart when compared.
+"""
+
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def git_commit() -> Optional[str]:
+    """Short hash of the checked-out commit, or None outside a git checkout."""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True
+        )
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def run_info() -> Dict:
+    """Timestamp, commit, Python version and platform of this run."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
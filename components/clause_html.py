@@ -0,0 +1,173 @@
+"""
+components/clause_html.py
+-------------------------
+HTML markup for clause cards, independent of Streamlit.
+
+Cards are built as compact single-line fragments so that a whole page of
+them can be sent to the browser in one `st.markdown` call (blank or
+indented lines would end the raw HTML block and be rendered as Markdown).
+Clause text, keywords and categories are HTML-escaped. The styles the cards
+refer to are injected by result_display.inject_card_styles.
+
+ClauseCards holds the cards of one analyzed result, built once and stored
+in the result cache next to the result itself (see `clause_cards`), so
+reruns, filter toggles and page changes only join precomputed fragments.
+"""
+
+from html import escape
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app_config import CARD_CACHE_MAX_ENTRIES, COLOUR
+from utils import metrics
+from utils.result_cache import ResultCache
+
+# Bump when the card markup changes so cached fragments are rebuilt
+_CARD_FORMAT = 1
+
+# Cards have their own small LRU rather than sharing the result cache's
+# slots; they are cheap to rebuild, so they are never written to disk.
+_CARD_CACHE = ResultCache(max_entries=CARD_CACHE_MAX_ENTRIES, cache_dir=None)
+
+
+def risky_card_html(clause: Dict) -> str:
+    """Markup of one risky clause card (red, with keyword tags and category chips)."""
+    conf_pct = int(clause["confidence"] * 100)
+    keywords_html = "".join(
+        f'<span class="keyword-tag">🔑 {escape(kw)}</span>'
+        for kw in clause["matched_keywords"]
+    )
+    categories_html = "".join(
+        f'<span class="cat-chip">{escape(cat)}</span>'
+        for cat in clause["categories"]
+    )
+    return (
+        '<div class="risky-card">'
+        '<div class="clause-header">'
+        f'<span style="color:{COLOUR["text_secondary"]};font-size:12px;font-weight:600;">'
+        f'CLAUSE #{clause["id"]}</span>'
+        '<span class="badge-risky">⚠ RISKY</span>'
+        f'<span style="font-size:12px;color:{COLOUR["text_secondary"]};margin-left:auto;">'
+        f'{conf_pct}% confidence</span>'
+        '</div>'
+        f'<p class="clause-text">{escape(clause["text"])}</p>'
+        f'<div style="margin-top:12px;">{keywords_html}</div>'
+        f'<div style="margin-top:6px;">{categories_html}</div>'
+        '<div class="conf-bar-wrap">'
+        f'<div class="conf-bar-fill" style="width:{conf_pct}%; background:{COLOUR["border_risky"]};"></div>'
+        '</div>'
+        '</div>'
+    )
+
+
+def safe_card_html(clause: Dict) -> str:
+    """Markup of one safe clause card (green)."""
+    conf_pct = int(clause["confidence"] * 100)
+    return (
+        '<div class="safe-card">'
+        '<div class="clause-header">'
+        f'<span style="color:{COLOUR["text_secondary"]};font-size:12px;font-weight:600;">'
+        f'CLAUSE #{clause["id"]}</span>'
+        '<span class="badge-safe">✔ SAFE</span>'
+        f'<span style="font-size:12px;color:{COLOUR["text_secondary"]};margin-left:auto;">'
+        f'{conf_pct}% confidence</span>'
+        '</div>'
+        f'<p class="clause-text">{escape(clause["text"])}</p>'
+        '<div class="conf-bar-wrap">'
+        f'<div class="conf-bar-fill" style="width:{conf_pct}%; background:{COLOUR["border_safe"]};"></div>'
+        '</div>'
+        '</div>'
+    )
+
+
+def card_html(clause: Dict) -> str:
+    """Markup of the card matching the clause's label."""
+    if clause["label"] == "Risky":
+        return risky_card_html(clause)
+    return safe_card_html(clause)
+
+
+def filter_clauses(clauses: Iterable[Dict], show_safe: bool = True) -> Sequence[Dict]:
+    """The clauses a list shows: all of them, or only the risky ones."""
+    if show_safe:
+        return clauses if isinstance(clauses, Sequence) else list(clauses)
+    return [c for c in clauses if c["label"] == "Risky"]
+
+
+def page_count(total: int, page_size: int) -> int:
+    """Number of pages needed for `total` rows (at least 1)."""
+    return max(1, -(-total // page_size))
+
+
+def page_bounds(total: int, page: int, page_size: int) -> Tuple[int, int]:
+    """
+    [start, end) rows of a 1-based page, with `page` clamped to the
+    available pages.
+    """
+    n_pages = page_count(total, page_size)
+    page = min(max(page, 1), n_pages)
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total)
+
+
+def clause_page_html(clauses: Sequence[Dict], page: int, page_size: int) -> str:
+    """One page of cards as a single HTML payload."""
+    start, end = page_bounds(len(clauses), page, page_size)
+    return "\n".join(card_html(clauses[i]) for i in range(start, end))
+
+
+class ClauseCards:
+    """
+    Card HTML of every clause of one analyzed result, keyed by clause id,
+    plus the ids shown by each clause view.
+    """
+
+    def __init__(self, clauses: Iterable[Dict]):
+        self.fragments: Dict[int, str] = {}
+        self.all_ids: List[int] = []
+        self.risky_ids: List[int] = []
+        self.safe_ids: List[int] = []
+        for clause in clauses:
+            clause_id = clause["id"]
+            self.fragments[clause_id] = card_html(clause)
+            self.all_ids.append(clause_id)
+            if clause["label"] == "Risky":
+                self.risky_ids.append(clause_id)
+            else:
+                self.safe_ids.append(clause_id)
+
+    def ids(self, view: str, show_safe: bool = True) -> List[int]:
+        """Clause ids of a view ("all", "risky" or "safe"), in document order."""
+        if view == "risky" or (view == "all" and not show_safe):
+            return self.risky_ids
+        if view == "safe":
+            return self.safe_ids
+        return self.all_ids
+
+    def page_html(self, ids: Sequence[int], page: int, page_size: int) -> str:
+        """One page of the given clauses as a single HTML payload."""
+        start, end = page_bounds(len(ids), page, page_size)
+        fragments = self.fragments
+        return "\n".join([fragments[ids[i]] for i in range(start, end)])
+
+
+def clause_cards(result: Dict) -> ClauseCards:
+    """
+    The ClauseCards of a run_analysis() result.
+
+    Cards are cached under the result's key, so they are built once per
+    analyzed document and predictor config while that document is among
+    the CARD_CACHE_MAX_ENTRIES most recently rendered. Results analysed
+    without the cache get fresh cards.
+    """
+    key: Optional[str] = result.get("key")
+    if key is None:
+        with metrics.timer("stage_seconds", stage="render_cards"):
+            return ClauseCards(result["analyzed"])
+
+    cards_key = f"{key}-cards{_CARD_FORMAT}"
+    cards = _CARD_CACHE.get(cards_key)
+    if cards is None:
+        with metrics.timer("stage_seconds", stage="render_cards"):
+            cards = ClauseCards(result["analyzed"])
+        _CARD_CACHE.put(cards_key, cards)
+    return cards
@@ -2,12 +2,22 @@
 components/result_display.py
 -----------------------------
 Streamlit rendering functions for displaying clause analysis results.
-Provides styled cards for risky/safe clauses and summary KPI tiles.
+Provides styled cards for risky/safe clauses (markup in
+components/clause_html.py), paginated clause lists and summary KPI tiles.
 """
 
 import streamlit as st
-from typing import Dict, List
+from typing import Dict, Optional, Sequence
 from app_config import COLOUR
+from components.clause_html import (
+    ClauseCards,
+    clause_page_html,
+    filter_clauses,
+    page_bounds,
+    page_count,
+    risky_card_html,
+    safe_card_html,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -180,42 +190,7 @@ def render_risky_clause(clause: Dict) -> None:
     Args:
         clause: An analyzed clause dict from risk_predictor.analyze_clauses()
     """
-    conf_pct = int(clause["confidence"] * 100)
-    keywords_html = "".join(
-        f'<span class="keyword-tag">🔑 {kw}</span>'
-        for kw in clause["matched_keywords"]
-    )
-    categories_html = "".join(
-        f'<span class="cat-chip">{cat}</span>'
-        for cat in clause["categories"]
-    )
-
-    st.markdown(
-        f"""
-        <div class="risky-card">
-            <div class="clause-header">
-                <span style="color:{COLOUR['text_secondary']};font-size:12px;font-weight:600;">
-                    CLAUSE #{clause['id']}
-                </span>
-                <span class="badge-risky">⚠ RISKY</span>
-                <span style="font-size:12px;color:{COLOUR['text_secondary']};margin-left:auto;">
-                    {conf_pct}% confidence
-                </span>
-            </div>
-            <p class="clause-text">{clause['text']}</p>
-            <div style="margin-top:12px;">
-                {keywords_html}
-            </div>
-            <div style="margin-top:6px;">
-                {categories_html}
-            </div>
-            <div class="conf-bar-wrap">
-                <div class="conf-bar-fill" style="width:{conf_pct}%; background:{COLOUR['border_risky']};"></div>
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(risky_card_html(clause), unsafe_allow_html=True)
 
 
 def render_safe_clause(clause: Dict) -> None:
@@ -225,40 +200,69 @@ def render_safe_clause(clause: Dict) -> None:
     Args:
         clause: An analyzed clause dict from risk_predictor.analyze_clauses()
     """
-    conf_pct = int(clause["confidence"] * 100)
-
-    st.markdown(
-        f"""
-        <div class="safe-card">
-            <div class="clause-header">
-                <span style="color:{COLOUR['text_secondary']};font-size:12px;font-weight:600;">
-                    CLAUSE #{clause['id']}
-                </span>
-                <span class="badge-safe">✔ SAFE</span>
-                <span style="font-size:12px;color:{COLOUR['text_secondary']};margin-left:auto;">
-                    {conf_pct}% confidence
-                </span>
-            </div>
-            <p class="clause-text">{clause['text']}</p>
-            <div class="conf-bar-wrap">
-                <div class="conf-bar-fill" style="width:{conf_pct}%; background:{COLOUR['border_safe']};"></div>
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(safe_card_html(clause), unsafe_allow_html=True)
 
 
-def render_clause_list(analyzed_clauses: List[Dict], show_safe: bool = True) -> None:
+def render_clause_list(
+    analyzed_clauses: Sequence[Dict],
+    show_safe: bool = True,
+    page_size: Optional[int] = None,
+    key: str = "clauses",
+) -> None:
     """
-    Renders all clauses in order, using the appropriate card for each.
+    Renders clauses in order, using the appropriate card for each.
+
+    All cards of a page go to the browser as one HTML payload. When there
+    are more clauses than `page_size`, a page selector is shown and only
+    the selected page is built and rendered.
 
     Args:
         analyzed_clauses: Full list from risk_predictor.analyze_clauses()
         show_safe: Whether to render safe clauses (default True)
+        page_size: Cards per page; None renders every clause at once
+        key: Widget key prefix; lists shown side by side need distinct keys
+    """
+    shown = filter_clauses(analyzed_clauses, show_safe)
+    if not shown:
+        return
+    if page_size is None or len(shown) <= page_size:
+        st.markdown(clause_page_html(shown, 1, len(shown)), unsafe_allow_html=True)
+        return
+    page = _render_page_selector(len(shown), page_size, key)
+    st.markdown(clause_page_html(shown, page, page_size), unsafe_allow_html=True)
+
+
+def render_clause_cards(cards: ClauseCards, ids: Sequence[int], page_size: int, key: str = "clauses") -> None:
     """
-    for clause in analyzed_clauses:
-        if clause["label"] == "Risky":
-            render_risky_clause(clause)
-        elif show_safe:
-            render_safe_clause(clause)
+    Renders the pre-built cards of `ids` (see clause_html.clause_cards),
+    one page at a time.
+
+    Args:
+        cards: Cached card fragments of the analyzed result
+        ids: Clause ids to show, e.g. cards.ids("risky")
+        page_size: Cards per page
+        key: Widget key prefix; lists shown side by side need distinct keys
+    """
+    if not ids:
+        return
+    page = 1
+    if len(ids) > page_size:
+        page = _render_page_selector(len(ids), page_size, key)
+    st.markdown(cards.page_html(ids, page, page_size), unsafe_allow_html=True)
+
+
+def _render_page_selector(total: int, page_size: int, key: str) -> int:
+    """Page number input plus a "showing x–y of n" caption; returns the page."""
+    n_pages = page_count(total, page_size)
+    page_key = f"{key}_page"
+    # A smaller document or larger page size may leave the stored page out of range
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+
+    col_info, col_page = st.columns([3, 1])
+    with col_page:
+        page = st.number_input("Page", min_value=1, max_value=n_pages, step=1, key=page_key)
+    start, end = page_bounds(total, page, page_size)
+    with col_info:
+        st.caption(f"Showing clauses {start + 1}–{end} of {total} · page {page} of {n_pages}")
+    return page
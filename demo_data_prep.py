@@ -1,7 +1,7 @@
 import argparse
 import sys
 from src.data_preprocessing.document_loader import load_text_from_file
-from src.data_preprocessing.text_cleaner import clean_text
+from src.data_preprocessing.text_cleaner import clean_texts
 from src.data_preprocessing.segmenter import segment_into_clauses
 
 def main():
@@ -27,8 +27,7 @@ def main():
     print("-" * 50)
     
     print("Preprocessing top 5 clauses:")
-    for i, clause in enumerate(clauses[:5], 1):
-        cleaned = clean_text(clause)
+    for i, (clause, cleaned) in enumerate(zip(clauses[:5], clean_texts(clauses[:5])), 1):
         print(f"\nClause {i} (Raw):")
         print(f"  {clause[:150]}{'...' if len(clause)>150 else ''}")
         print(f"Clause {i} (Cleaned for ML):")
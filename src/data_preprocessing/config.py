@@ -0,0 +1,39 @@
+"""
+Configuration constants for document loading and preprocessing.
+"""
+import os
+import sys
+
+# PDF extraction engine: "pypdf2", "pdfplumber" or "auto" (per page, the
+# first engine in AUTO_ENGINE_ORDER that returns non-empty text)
+PDF_ENGINE = os.environ.get("PDF_ENGINE", "auto")
+
+# Fastest engine first; benchmarks/bench_pdf_engines.py reports the
+# measured ranking for a corpus
+AUTO_ENGINE_ORDER = ("pypdf2", "pdfplumber")
+
+# Parallel PDF text extraction
+# Number of worker processes (None → one per CPU core)
+PDF_EXTRACT_WORKERS = int(os.environ["PDF_EXTRACT_WORKERS"]) if os.environ.get("PDF_EXTRACT_WORKERS") else None
+
+# PDFs with fewer pages than this are extracted serially; below it the cost
+# of starting worker processes outweighs the gain
+# (benchmarks/bench_pdf_parallel.py measures the break-even point)
+PDF_PARALLEL_PAGE_THRESHOLD = 50
+
+# How page-extraction workers are started. Not "fork": the app and the HTTP
+# server are multi-threaded, and a forked child can inherit locks held by
+# other threads. "forkserver" (preloaded with the PDF libraries) starts
+# workers almost as fast; Windows only has "spawn".
+PDF_POOL_START_METHOD = os.environ.get(
+    "PDF_POOL_START_METHOD", "spawn" if sys.platform == "win32" else "forkserver"
+)
+
+# Persistent cache of extracted PDF page text (see text_cache.py), keyed by
+# file hash and extractor version. Set PDF_TEXT_CACHE_DIR="" to disable.
+PDF_TEXT_CACHE_DIR = os.environ.get(
+    "PDF_TEXT_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "risk_contract_analyzer", "pdf_text"),
+)
+# Compressed size limit; least-recently-used documents are evicted beyond it
+PDF_TEXT_CACHE_MAX_BYTES = 512 * 1024 * 1024
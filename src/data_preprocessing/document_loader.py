@@ -1,5 +1,5 @@
 import os
-import PyPDF2
+from src.data_preprocessing.pdf_extractor import extract_pdf_pages
 
 def load_text_from_file(file_path: str) -> str:
     """
@@ -20,17 +20,13 @@ def load_text_from_file(file_path: str) -> str:
             return f.read()
     
     elif file_extension == '.pdf':
-        text = ""
         try:
             with open(file_path, 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    extracted = page.extract_text()
-                    if extracted:
-                        text += extracted + "\n"
+                pages = extract_pdf_pages(f.read())
         except Exception as e:
             print(f"Error reading PDF {file_path}: {e}")
-        return text
+            return ""
+        return "".join(page + "\n" for page in pages if page)
     
     else:
         raise ValueError(f"Unsupported file format: {file_extension}. Only .txt and .pdf are supported.")
@@ -0,0 +1,432 @@
+"""
+Page-level PDF text extraction shared by the Streamlit upload path
+(utils/file_handler.py) and the file-based loader (document_loader.py).
+
+Extraction engines are pluggable: "pypdf2" and "pdfplumber" are
+registered here, and "auto" tries the engines in AUTO_ENGINE_ORDER (fastest
+first) page by page, keeping the first one that returns non-empty text.
+
+Large PDFs are split into contiguous page ranges that are extracted in a
+process pool and delivered in page order, either as a stream
+(`iter_pdf_pages`) or as a list (`extract_pdf_pages`). A page that fails to
+extract yields an empty string instead of aborting the rest of the document.
+"""
+import abc
+import io
+import logging
+import multiprocessing
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterator, List, Optional
+
+from src.data_preprocessing.config import (
+    PDF_ENGINE,
+    AUTO_ENGINE_ORDER,
+    PDF_EXTRACT_WORKERS,
+    PDF_PARALLEL_PAGE_THRESHOLD,
+    PDF_POOL_START_METHOD,
+)
+from src.data_preprocessing.text_cache import extractor_version, file_hash, get_text_cache
+
+logger = logging.getLogger(__name__)
+
+# Page ranges handed out per worker; >1 keeps workers busy when some pages
+# are much slower than others
+_CHUNKS_PER_WORKER = 4
+
+# PDF bytes and engine name of the current job, set once per worker process
+_WORKER_JOB = None
+
+# Page workers used when a call does not pass `workers` (see set_default_workers)
+_DEFAULT_WORKERS: Optional[int] = PDF_EXTRACT_WORKERS
+
+
+# ---------------------------------------------------------------------------
+# Engines
+# ---------------------------------------------------------------------------
+class PdfDocument(abc.ABC):
+    """A PDF opened by one extraction engine."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Number of pages."""
+
+    @abc.abstractmethod
+    def page_text(self, page_num: int) -> str:
+        """Text of page `page_num` (0-based); may raise on broken pages."""
+
+    def close(self) -> None:
+        pass
+
+
+class _PyPDF2Document(PdfDocument):
+    def __init__(self, data: bytes):
+        import PyPDF2
+
+        self._reader = PyPDF2.PdfReader(io.BytesIO(data))
+
+    def __len__(self) -> int:
+        return len(self._reader.pages)
+
+    def page_text(self, page_num: int) -> str:
+        return self._reader.pages[page_num].extract_text() or ""
+
+
+class _PdfplumberDocument(PdfDocument):
+    def __init__(self, data: bytes):
+        import pdfplumber
+
+        self._pdf = pdfplumber.open(io.BytesIO(data))
+
+    def __len__(self) -> int:
+        return len(self._pdf.pages)
+
+    def page_text(self, page_num: int) -> str:
+        page = self._pdf.pages[page_num]
+        try:
+            return page.extract_text() or ""
+        finally:
+            # pdfplumber caches parsed layout objects per page
+            page.flush_cache()
+
+    def close(self) -> None:
+        self._pdf.close()
+
+
+class _AutoDocument(PdfDocument):
+    """
+    Tries engines in order for every page and keeps the first non-empty
+    result. Slower engines are only opened once a page needs them.
+    """
+
+    def __init__(self, data: bytes, order=AUTO_ENGINE_ORDER):
+        self._data = data
+        installed = available_engines()
+        self._names = [name for name in order if name in installed]
+        if not self._names:
+            raise ValueError("No PDF extraction engine is installed.")
+        self._docs: Dict[str, Optional[PdfDocument]] = {
+            self._names[0]: open_document(data, self._names[0])
+        }
+
+    def _doc(self, name: str) -> Optional[PdfDocument]:
+        if name not in self._docs:
+            try:
+                self._docs[name] = open_document(self._data, name)
+            except Exception as e:
+                logger.warning("PDF engine %s cannot open this document: %s", name, e)
+                self._docs[name] = None
+        return self._docs[name]
+
+    def __len__(self) -> int:
+        return len(self._docs[self._names[0]])
+
+    def page_text(self, page_num: int) -> str:
+        error = None
+        for name in self._names:
+            doc = self._doc(name)
+            if doc is None:
+                continue
+            try:
+                text = doc.page_text(page_num)
+            except Exception as e:
+                error = e
+                continue
+            if text.strip():
+                return text
+        if error is not None:
+            raise error
+        return ""
+
+    def close(self) -> None:
+        for doc in self._docs.values():
+            if doc is not None:
+                doc.close()
+
+
+_ENGINES: Dict[str, Callable[[bytes], PdfDocument]] = {
+    "pypdf2": _PyPDF2Document,
+    "pdfplumber": _PdfplumberDocument,
+}
+
+# Module each engine needs, checked by available_engines()
+_ENGINE_MODULES: Dict[str, str] = {
+    "pypdf2": "PyPDF2",
+    "pdfplumber": "pdfplumber",
+}
+
+
+def register_engine(name: str, opener: Callable[[bytes], PdfDocument], module: str = "") -> None:
+    """
+    Registers an extraction engine.
+
+    Args:
+        name: Engine name used by PDF_ENGINE / the `engine` arguments.
+        opener: Callable taking PDF bytes and returning a PdfDocument.
+        module: Importable module the engine depends on (optional).
+    """
+    _ENGINES[name] = opener
+    if module:
+        _ENGINE_MODULES[name] = module
+
+
+def available_engines() -> List[str]:
+    """Registered engines whose libraries are importable."""
+    import importlib.util
+
+    return [
+        name for name in _ENGINES
+        if not _ENGINE_MODULES.get(name)
+        or importlib.util.find_spec(_ENGINE_MODULES[name]) is not None
+    ]
+
+
+def open_document(data: bytes, engine: str = PDF_ENGINE) -> PdfDocument:
+    """
+    Opens PDF bytes with `engine` ("auto" or a registered engine name).
+
+    Raises:
+        ValueError: If the engine is unknown.
+    """
+    if engine == "auto":
+        return _AutoDocument(data)
+    opener = _ENGINES.get(engine)
+    if opener is None:
+        raise ValueError(
+            f"Unknown PDF engine '{engine}'. Choose 'auto' or one of: {', '.join(_ENGINES)}."
+        )
+    return opener(data)
+
+
+# ---------------------------------------------------------------------------
+# Page iteration
+# ---------------------------------------------------------------------------
+def set_default_workers(workers: Optional[int]) -> None:
+    """
+    Sets the page workers used by calls that do not pass `workers` in this
+    process (None → PDF_EXTRACT_WORKERS, else one per CPU core). Processes
+    that already run one document per CPU set 1, so no nested page pool is
+    started.
+    """
+    global _DEFAULT_WORKERS
+    _DEFAULT_WORKERS = PDF_EXTRACT_WORKERS if workers is None else workers
+
+
+def _extract_page(doc: PdfDocument, page_num: int) -> str:
+    try:
+        return doc.page_text(page_num)
+    except Exception as e:
+        logger.warning("Skipping PDF page %d: %s", page_num + 1, e)
+        return ""
+
+
+def _init_worker(data: bytes, engine: str) -> None:
+    global _WORKER_JOB
+    _WORKER_JOB = (data, engine)
+
+
+def _pool_context():
+    ctx = multiprocessing.get_context(PDF_POOL_START_METHOD)
+    if PDF_POOL_START_METHOD == "forkserver":
+        # Workers are forked from a server that has already imported the
+        # extractor and the PDF libraries, so they start almost as fast
+        # as with plain fork.
+        ctx.set_forkserver_preload([__name__, *_ENGINE_MODULES.values()])
+    return ctx
+
+
+def _extract_range(start: int, stop: int) -> List[str]:
+    """Worker task: extract pages [start, stop) of the worker's PDF."""
+    doc = open_document(*_WORKER_JOB)
+    try:
+        return [_extract_page(doc, i) for i in range(start, stop)]
+    finally:
+        doc.close()
+
+
+def _iter_serial(doc: PdfDocument, start: int, total: int, progress) -> Iterator[str]:
+    for i in range(start, total):
+        text = _extract_page(doc, i)
+        if progress is not None:
+            progress(i + 1, total)
+        yield text
+
+
+def _iter_parallel(
+    data: bytes, engine: str, total: int, workers: int, progress
+) -> Iterator[str]:
+    """
+    Yields pages in order while later page ranges are extracted in the
+    pool. At most `workers * 2` ranges are in flight, so memory stays
+    bounded even when the consumer is slower than extraction.
+    """
+    n_chunks = min(total, workers * _CHUNKS_PER_WORKER)
+    bounds = [(total * i // n_chunks, total * (i + 1) // n_chunks) for i in range(n_chunks)]
+    max_in_flight = workers * 2
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=_pool_context(),
+        initializer=_init_worker,
+        initargs=(data, engine),
+    )
+    try:
+        pending = {}
+        next_submit = 0
+        for i, (lo, hi) in enumerate(bounds):
+            while next_submit < n_chunks and len(pending) < max_in_flight:
+                pending[next_submit] = pool.submit(_extract_range, *bounds[next_submit])
+                next_submit += 1
+            try:
+                chunk = pending.pop(i).result()
+            except BrokenProcessPool:
+                raise
+            except Exception as e:
+                logger.warning("Skipping PDF pages %d-%d: %s", lo + 1, hi, e)
+                chunk = [""] * (hi - lo)
+            if progress is not None:
+                progress(hi, total)
+            yield from chunk
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _iter_uncached(
+    data: bytes, workers: Optional[int], parallel_threshold: int, progress, engine: str
+) -> Iterator[str]:
+    try:
+        doc = open_document(data, engine)
+        total = len(doc)
+    except Exception as e:
+        raise ValueError(f"Could not parse PDF: {e}") from e
+
+    try:
+        workers = workers or _DEFAULT_WORKERS or os.cpu_count() or 1
+        if workers < 2 or total < max(parallel_threshold, 2):
+            yield from _iter_serial(doc, 0, total, progress)
+            return
+
+        done = 0
+        try:
+            for text in _iter_parallel(data, engine, total, workers, progress):
+                done += 1
+                yield text
+        except (OSError, RuntimeError) as e:
+            # No process pool available (sandboxed host, broken worker, ...):
+            # carry on serially from the first page not yet delivered.
+            logger.warning("Parallel PDF extraction unavailable (%s); reading serially", e)
+            yield from _iter_serial(doc, done, total, progress)
+    finally:
+        doc.close()
+
+
+def _iter_cached(cache, fhash: str, version: str, total: int, progress) -> Iterator[str]:
+    for i, text in enumerate(cache.iter_pages(fhash, version)):
+        if progress is not None:
+            progress(i + 1, total)
+        yield text
+
+
+def iter_pdf_pages(
+    data: bytes,
+    workers: Optional[int] = None,
+    parallel_threshold: int = PDF_PARALLEL_PAGE_THRESHOLD,
+    progress: Optional[Callable[[int, int], None]] = None,
+    engine: str = PDF_ENGINE,
+    use_cache: bool = True,
+) -> Iterator[str]:
+    """
+    Yields the text of every page of a PDF, in page order, as soon as it
+    is available.
+
+    Documents seen before are served from the persistent text cache
+    (text_cache.py) without opening the PDF at all; new documents are
+    written to it page by page as they are extracted.
+
+    Args:
+        data: Raw PDF bytes.
+        workers: Worker processes for parallel extraction (None → the
+            process default, see set_default_workers()).
+        parallel_threshold: Documents with fewer pages are read serially.
+        progress: Optional callback, called as progress(pages_done, total_pages).
+        engine: "auto" or a registered engine name (see available_engines()).
+        use_cache: Read from / write to the persistent text cache.
+
+    Yields:
+        Page texts ("" for empty or unreadable pages).
+
+    Raises:
+        ValueError: If the document cannot be opened as a PDF at all.
+    """
+    cache = None
+    if use_cache:
+        try:
+            cache = get_text_cache()
+        except (OSError, sqlite3.Error) as e:
+            # Unwritable or missing cache directory, broken database file, ...
+            logger.warning("PDF text cache unavailable: %s", e)
+    if cache is None:
+        yield from _iter_uncached(data, workers, parallel_threshold, progress, engine)
+        return
+
+    fhash, version = file_hash(data), extractor_version(engine)
+    try:
+        total = cache.page_count(fhash, version)
+    except sqlite3.Error as e:
+        logger.warning("PDF text cache unavailable: %s", e)
+        yield from _iter_uncached(data, workers, parallel_threshold, progress, engine)
+        return
+    if total is not None:
+        yield from _iter_cached(cache, fhash, version, total, progress)
+        return
+
+    writer = None
+    try:
+        writer = cache.writer(fhash, version)
+    except sqlite3.Error as e:
+        logger.warning("PDF text cache not writable: %s", e)
+
+    completed = False
+    try:
+        for text in _iter_uncached(data, workers, parallel_threshold, progress, engine):
+            if writer is not None:
+                try:
+                    writer.add(text)
+                except sqlite3.Error as e:
+                    logger.warning("PDF text cache write failed: %s", e)
+                    writer.abort()
+                    writer = None
+            yield text
+        completed = True
+    finally:
+        # A consumer that stops early leaves an incomplete entry; drop it
+        if writer is not None:
+            try:
+                if completed:
+                    writer.commit()
+                else:
+                    writer.abort()
+            except sqlite3.Error as e:
+                logger.warning("PDF text cache write failed: %s", e)
+
+
+def extract_pdf_pages(
+    data: bytes,
+    workers: Optional[int] = None,
+    parallel_threshold: int = PDF_PARALLEL_PAGE_THRESHOLD,
+    progress: Optional[Callable[[int, int], None]] = None,
+    engine: str = PDF_ENGINE,
+    use_cache: bool = True,
+) -> List[str]:
+    """
+    Extracts the text of every page of a PDF (see `iter_pdf_pages`).
+
+    Returns:
+        List of page texts in page order ("" for empty or unreadable pages).
+
+    Raises:
+        ValueError: If the document cannot be opened as a PDF at all.
+    """
+    return list(iter_pdf_pages(data, workers, parallel_threshold, progress, engine, use_cache))
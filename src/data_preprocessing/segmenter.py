@@ -1,5 +1,132 @@
 import re
-from typing import List
+from typing import List, Sequence, Tuple
+
+# (start, end, word_count) of one clause within the document text
+ClauseSpan = Tuple[int, int, int]
+
+# Distinct clauses are usually separated by empty lines
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+# Clause starters inside a paragraph: numbering ("1.", "1.1"), lettered
+# items ("a)") and roman numerals ("iv."), each at the start of a line
+CLAUSE_DELIMITERS = (r"\s*\d+\.\d*\s*", r"\s*[a-z]\)\s*", r"\s*[ivx]+\.\s*")
+
+# Clauses with this many words or fewer are likely not real clauses
+MIN_CLAUSE_WORDS = 3
+
+
+class ClauseSegmenter:
+    """
+    Single-pass clause segmenter working on character offsets.
+
+    The document is scanned once for paragraph breaks, and each paragraph
+    once for clause delimiters, with precompiled patterns. Clauses are
+    reported as (start, end, word_count) spans into the original text, so
+    no paragraph or fragment strings are built; the only temporary string
+    is each clause's slice for counting its words (str.split() on a slice
+    is several times faster than counting regex matches in place).
+    """
+
+    def __init__(self, delimiters: Sequence[str] = CLAUSE_DELIMITERS, min_words: int = MIN_CLAUSE_WORDS):
+        """
+        Args:
+            delimiters: Regex alternatives for clause starters. Each is
+                        matched at the start of a line.
+            min_words:  Clauses with this many words or fewer are dropped.
+        """
+        self.min_words = min_words
+        # Within a paragraph, delimiters must start a line ...
+        self._delimiter = re.compile("|".join("^" + d for d in delimiters), re.MULTILINE)
+        # ... and at the start of the paragraph (or of a fragment following
+        # a delimiter) they match without regard to the preceding character.
+        self._delimiter_at = re.compile("|".join(delimiters))
+
+    def spans(self, text: str) -> List[ClauseSpan]:
+        """
+        Segments `text` into clause spans.
+
+        Args:
+            text (str): The full raw text of the contract.
+
+        Returns:
+            List[ClauseSpan]: (start, end, word_count) per clause, in order.
+                `text[start:end]` is the stripped clause text.
+        """
+        out: List[ClauseSpan] = []
+        if not text:
+            return out
+        append = out.append
+        min_words = self.min_words
+        match_at = self._delimiter_at.match
+        find_delimiters = self._delimiter.finditer
+
+        bounds = [0]
+        for m in _PARAGRAPH_BREAK.finditer(text):
+            bounds.append(m.start())
+            bounds.append(m.end())
+        bounds.append(len(text))
+
+        starts: List[int] = []
+        for i in range(0, len(bounds), 2):
+            para_start, para_end = bounds[i], bounds[i + 1]
+            while para_start < para_end and text[para_start].isspace():
+                para_start += 1
+            while para_end > para_start and text[para_end - 1].isspace():
+                para_end -= 1
+            if para_start == para_end:
+                continue
+
+            # A clause begins at every delimiter, and at every text fragment
+            # that itself begins like a delimiter even where it is not at a
+            # line start ("1. a) ..."), as the original split/rematch did.
+            starts.clear()
+            starts.append(para_start)
+            pos = para_start
+            first = match_at(text, para_start, para_end)
+            if first is not None:
+                pos = first.end()
+            for m in find_delimiters(text, pos, para_end):
+                m_start = m.start()
+                if m_start > pos != para_start and match_at(text, pos, m_start):
+                    starts.append(pos)
+                starts.append(m_start)
+                pos = m.end()
+            if para_end > pos != para_start and match_at(text, pos, para_end):
+                starts.append(pos)
+            starts.append(para_end)
+
+            for j in range(len(starts) - 1):
+                c_start, c_end = starts[j], starts[j + 1]
+                while c_start < c_end and text[c_start].isspace():
+                    c_start += 1
+                while c_end > c_start and text[c_end - 1].isspace():
+                    c_end -= 1
+                if c_start < c_end:
+                    words = len(text[c_start:c_end].split())
+                    if words > min_words:
+                        append((c_start, c_end, words))
+        return out
+
+    def segment(self, text: str) -> List[str]:
+        """Segments `text` into clause strings."""
+        return [text[start:end] for start, end, _ in self.spans(text)]
+
+
+_DEFAULT_SEGMENTER = ClauseSegmenter()
+
+
+def segment_spans(text: str) -> List[ClauseSpan]:
+    """
+    Segments a full contract text into clause spans.
+
+    Args:
+        text (str): The full raw text of the contract.
+
+    Returns:
+        List[ClauseSpan]: (start, end, word_count) per clause.
+    """
+    return _DEFAULT_SEGMENTER.spans(text)
+
 
 def segment_into_clauses(text: str) -> List[str]:
     """
@@ -13,46 +140,4 @@ def segment_into_clauses(text: str) -> List[str]:
     Returns:
         List[str]: A list of segmented clauses.
     """
-    if not text:
-        return []
-
-    # Strategy 1: Split by double newlines (paragraphs)
-    # Often, distinct clauses are separated by empty lines.
-    paragraphs = re.split(r'\n\s*\n', text)
-    
-    clauses = []
-    
-    for para in paragraphs:
-        para = para.strip()
-        if not para:
-            continue
-            
-        # Strategy 2: Further split by numbering (e.g., "1.", "1.1", "a)") if they appear inside a paragraph
-        # This regex looks for a newline/start followed by numbers/letters and a dot or parenthesis
-        # Example: "\n 1. " or "^a) "
-        # We replace these delimiters with a special marker to split easily
-        
-        # This is a simple regex for demonstration. Complex legal documents might need more robust parsing.
-        delimiters = r'(?m)(^\s*\d+\.\d*\s*|^\s*[a-z]\)\s*|^\s*[ivx]+\.\s*)'
-        
-        # Split the paragraph by these delimiters
-        parts = re.split(delimiters, para)
-        
-        # Reconstruct the clauses
-        current_clause = ""
-        for i, part in enumerate(parts):
-            if re.match(delimiters, part):
-                # If we have an existing clause, save it before starting a new one
-                if current_clause:
-                    clauses.append(current_clause.strip())
-                current_clause = part # Start new clause with its delimiter
-            else:
-                current_clause += part
-                
-        if current_clause:
-            clauses.append(current_clause.strip())
-
-    # Filter out very short strings that are likely not real clauses
-    final_clauses = [c for c in clauses if len(c.split()) > 3]
-    
-    return final_clauses
+    return _DEFAULT_SEGMENTER.segment(text)
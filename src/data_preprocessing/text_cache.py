@@ -0,0 +1,392 @@
+"""
+Persistent, content-addressed cache of extracted PDF page text.
+
+Pages are stored zlib-compressed in a SQLite database under
+PDF_TEXT_CACHE_DIR, keyed by the SHA-256 of the PDF bytes and the
+extractor version (engine + library versions), so re-analysing a contract
+skips PDF parsing entirely. The cache is trimmed to PDF_TEXT_CACHE_MAX_BYTES
+(compressed) by evicting least-recently-used documents.
+
+Usage (inspect / purge from the command line):
+    python -m src.data_preprocessing.text_cache stats
+    python -m src.data_preprocessing.text_cache list [--limit 20]
+    python -m src.data_preprocessing.text_cache purge [--older-than DAYS]
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
+
+from src.data_preprocessing.config import (
+    AUTO_ENGINE_ORDER,
+    PDF_TEXT_CACHE_DIR,
+    PDF_TEXT_CACHE_MAX_BYTES,
+)
+
+# Bump when the stored format or page post-processing changes
+_SCHEMA_VERSION = 1
+_DB_FILENAME = "pdf_text.sqlite"
+_INSERT_BATCH = 32
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_key     TEXT PRIMARY KEY,
+    file_hash   TEXT NOT NULL,
+    extractor   TEXT NOT NULL,
+    page_count  INTEGER NOT NULL DEFAULT 0,
+    bytes       INTEGER NOT NULL DEFAULT 0,
+    complete    INTEGER NOT NULL DEFAULT 0,
+    created     REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    doc_key  TEXT NOT NULL,
+    page_num INTEGER NOT NULL,
+    text     BLOB NOT NULL,
+    PRIMARY KEY (doc_key, page_num)
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def file_hash(data: bytes) -> str:
+    """SHA-256 hex digest of the PDF bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def extractor_version(engine: str) -> str:
+    """
+    Identifies the extraction setup: engine name(s) plus installed library
+    versions. Upgrading PyPDF2/pdfplumber or switching engines changes it,
+    so cached text is never served for a different extractor.
+    """
+    from importlib import metadata
+
+    names = AUTO_ENGINE_ORDER if engine == "auto" else (engine,)
+    parts = []
+    for name in names:
+        dist = {"pypdf2": "PyPDF2", "pdfplumber": "pdfplumber"}.get(name, name)
+        try:
+            parts.append(f"{name}={metadata.version(dist)}")
+        except metadata.PackageNotFoundError:
+            parts.append(f"{name}=?")
+    return f"v{_SCHEMA_VERSION}:{engine}:{','.join(parts)}"
+
+
+class TextCache:
+    """SQLite-backed page-text store with LRU size eviction."""
+
+    def __init__(self, cache_dir: str = PDF_TEXT_CACHE_DIR, max_bytes: int = PDF_TEXT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.path = os.path.join(cache_dir, _DB_FILENAME)
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per operation keeps this safe to use
+        # from threads and from the batch CLI's worker processes.
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _key(fhash: str, version: str) -> str:
+        return hashlib.sha256(f"{fhash}|{version}".encode("utf-8")).hexdigest()
+
+    def _bump(self, conn, name: str) -> None:
+        conn.execute(
+            "INSERT INTO counters(name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    # ------------------------------------------------------------------
+    # Read path
+    # ------------------------------------------------------------------
+    def page_count(self, fhash: str, version: str) -> Optional[int]:
+        """
+        Number of cached pages for a complete entry, or None on a miss.
+        Counts the lookup as a hit or miss.
+        """
+        key = self._key(fhash, version)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT page_count FROM documents WHERE doc_key = ? AND complete = 1", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                self._bump(conn, "misses")
+                return None
+            self.hits += 1
+            self._bump(conn, "hits")
+            conn.execute("UPDATE documents SET last_access = ? WHERE doc_key = ?", (time.time(), key))
+            return row[0]
+
+    def iter_pages(self, fhash: str, version: str) -> Iterator[str]:
+        """Streams the cached pages of a complete entry in page order."""
+        key = self._key(fhash, version)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            for (blob,) in conn.execute(
+                "SELECT text FROM pages WHERE doc_key = ? ORDER BY page_num", (key,)
+            ):
+                yield zlib.decompress(blob).decode("utf-8")
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+    def writer(self, fhash: str, version: str) -> "_EntryWriter":
+        """Returns a writer that stores pages incrementally for one PDF."""
+        return _EntryWriter(self, fhash, version)
+
+    def evict(self) -> int:
+        """
+        Deletes least-recently-used entries (and abandoned partial writes
+        older than an hour) until the cache fits in max_bytes.
+
+        Returns:
+            Number of documents removed.
+        """
+        removed = 0
+        with self._connect() as conn:
+            stale = time.time() - 3600
+            for (key,) in conn.execute(
+                "SELECT doc_key FROM documents WHERE complete = 0 AND created < ?", (stale,)
+            ).fetchall():
+                self._delete(conn, key)
+                removed += 1
+            self._delete_orphans(conn)
+
+            total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM documents").fetchone()[0]
+            if total <= self.max_bytes:
+                return removed
+            for key, size in conn.execute(
+                "SELECT doc_key, bytes FROM documents WHERE complete = 1 ORDER BY last_access"
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._delete(conn, key)
+                total -= size
+                removed += 1
+                self._bump(conn, "evictions")
+        return removed
+
+    @staticmethod
+    def _delete(conn, key: str) -> None:
+        conn.execute("DELETE FROM pages WHERE doc_key = ?", (key,))
+        conn.execute("DELETE FROM documents WHERE doc_key = ?", (key,))
+
+    @staticmethod
+    def _delete_orphans(conn) -> None:
+        # Pages whose writer lost its documents row (evicted as stale, purged)
+        conn.execute("DELETE FROM pages WHERE doc_key NOT IN (SELECT doc_key FROM documents)")
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def purge(self, older_than_days: Optional[float] = None) -> int:
+        """Deletes all entries (or those not used for `older_than_days`)."""
+        with self._connect() as conn:
+            if older_than_days is None:
+                keys = conn.execute("SELECT doc_key FROM documents").fetchall()
+            else:
+                cutoff = time.time() - older_than_days * 86400
+                keys = conn.execute(
+                    "SELECT doc_key FROM documents WHERE last_access < ?", (cutoff,)
+                ).fetchall()
+            for (key,) in keys:
+                self._delete(conn, key)
+            self._delete_orphans(conn)
+        if older_than_days is None:
+            with self._connect() as conn:
+                conn.execute("VACUUM")
+        return len(keys)
+
+    def stats(self) -> Dict:
+        """Entry count, stored size and hit/miss counters (process + lifetime)."""
+        with self._connect() as conn:
+            docs, pages, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(page_count), 0), COALESCE(SUM(bytes), 0) "
+                "FROM documents WHERE complete = 1"
+            ).fetchone()
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        return {
+            "path": self.path,
+            "documents": docs,
+            "pages": pages,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "lifetime_hits": counters.get("hits", 0),
+            "lifetime_misses": counters.get("misses", 0),
+            "lifetime_evictions": counters.get("evictions", 0),
+        }
+
+    def entries(self, limit: int = 20) -> List[Dict]:
+        """Most recently used complete entries."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT file_hash, extractor, page_count, bytes, last_access FROM documents "
+                "WHERE complete = 1 ORDER BY last_access DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [
+            {"file_hash": h, "extractor": e, "pages": p, "bytes": b, "last_access": t}
+            for h, e, p, b, t in rows
+        ]
+
+
+class _EntryWriter:
+    """
+    Buffers pages of one PDF and commits them in small batches.
+
+    Pages are written under a key of this writer's own, so concurrent
+    writers of the same PDF (two sessions, two batch workers) never touch
+    each other's rows; commit() swaps the finished entry in under the real
+    key in one transaction.
+    """
+
+    def __init__(self, cache: TextCache, fhash: str, version: str):
+        self._cache = cache
+        self._key = cache._key(fhash, version)
+        self._tmp_key = f"{self._key}.{uuid.uuid4().hex}"
+        self._buffer = []
+        self._pages = 0
+        self._bytes = 0
+        now = time.time()
+        with cache._connect() as conn:
+            conn.execute(
+                "INSERT INTO documents(doc_key, file_hash, extractor, created, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self._tmp_key, fhash, version, now, now),
+            )
+
+    def add(self, text: str) -> None:
+        blob = zlib.compress(text.encode("utf-8"))
+        self._buffer.append((self._tmp_key, self._pages, blob))
+        self._pages += 1
+        self._bytes += len(blob)
+        if len(self._buffer) >= _INSERT_BATCH:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        with self._cache._connect() as conn:
+            conn.executemany("INSERT INTO pages(doc_key, page_num, text) VALUES (?, ?, ?)", self._buffer)
+        self._buffer = []
+
+    def commit(self) -> None:
+        """Marks the entry complete and trims the cache to its size budget."""
+        self._flush()
+        with self._cache._connect() as conn:
+            # Take the write lock before checking, so the check and the swap
+            # see the same state
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute(
+                "SELECT 1 FROM documents WHERE doc_key = ?", (self._tmp_key,)
+            ).fetchone() is None:
+                # Evicted as an abandoned write, or purged, while extracting
+                self._cache._delete(conn, self._tmp_key)
+                return
+            # A concurrent writer of the same PDF may have committed first;
+            # its pages are identical, so the last commit simply wins.
+            self._cache._delete(conn, self._key)
+            conn.execute("UPDATE pages SET doc_key = ? WHERE doc_key = ?", (self._key, self._tmp_key))
+            conn.execute(
+                "UPDATE documents SET doc_key = ?, page_count = ?, bytes = ?, complete = 1 "
+                "WHERE doc_key = ?",
+                (self._key, self._pages, self._bytes, self._tmp_key),
+            )
+        self._cache.evict()
+
+    def abort(self) -> None:
+        """Discards a partially written entry."""
+        with self._cache._connect() as conn:
+            self._cache._delete(conn, self._tmp_key)
+
+
+_CACHE: Optional[TextCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_text_cache() -> Optional[TextCache]:
+    """
+    Returns the process-wide text cache, or None if it is disabled.
+
+    Raises:
+        OSError, sqlite3.Error: If the cache directory or database cannot be
+            created; the next call tries again.
+    """
+    global _CACHE
+    if not PDF_TEXT_CACHE_DIR:
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = TextCache()
+    return _CACHE
+
+
+def _format_bytes(n: int) -> str:
+    return f"{n / 1e6:.1f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or purge the extracted PDF text cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Show size and hit/miss counters")
+    list_p = sub.add_parser("list", help="List most recently used entries")
+    list_p.add_argument("--limit", type=int, default=20)
+    purge_p = sub.add_parser("purge", help="Delete cached entries")
+    purge_p.add_argument("--older-than", type=float, metavar="DAYS",
+                         help="Only delete entries unused for this many days")
+    args = parser.parse_args()
+
+    if not PDF_TEXT_CACHE_DIR:
+        raise SystemExit("The PDF text cache is disabled (PDF_TEXT_CACHE_DIR is empty).")
+    cache = TextCache()
+
+    if args.command == "stats":
+        s = cache.stats()
+        print(f"Cache file : {s['path']}")
+        print(f"Documents  : {s['documents']}  ({s['pages']} pages)")
+        print(f"Size       : {_format_bytes(s['bytes'])} / {_format_bytes(s['max_bytes'])}")
+        print(f"Hits       : {s['lifetime_hits']}")
+        print(f"Misses     : {s['lifetime_misses']}")
+        print(f"Evictions  : {s['lifetime_evictions']}")
+    elif args.command == "list":
+        for e in cache.entries(args.limit):
+            used = time.strftime("%Y-%m-%d %H:%M", time.localtime(e["last_access"]))
+            print(f"{e['file_hash'][:16]}  {e['pages']:>5} pages  {_format_bytes(e['bytes']):>9}  "
+                  f"{used}  {e['extractor']}")
+    elif args.command == "purge":
+        removed = cache.purge(args.older_than)
+        print(f"Removed {removed} cached document(s).")
+
+
+if __name__ == "__main__":
+    main()
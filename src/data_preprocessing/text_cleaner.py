@@ -1,23 +1,60 @@
+import logging
+import os
 import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-
-# Setup NLTK resources
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-    
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-# Ensure punkt_tab is downloaded if needed by newer nltk versions
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    nltk.download('punkt_tab')
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from src.data_preprocessing.english_stopwords import ENGLISH_STOPWORDS
+
+logger = logging.getLogger(__name__)
+
+# Anything but ASCII letters, digits and whitespace is dropped
+_NON_ALPHANUMERIC = re.compile(r'[^a-zA-Z0-9\s]')
+
+# Once punctuation is stripped, NLTK's word_tokenize only differs from a
+# whitespace split on these contractions, which it splits in two.
+_CONTRACTIONS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na'),
+}
+
+# Texts handed to each worker at a time by clean_texts
+CLEAN_CHUNKSIZE = 512
+
+
+@lru_cache(maxsize=1)
+def get_stop_words() -> FrozenSet[str]:
+    """
+    English stopwords, loaded on first use.
+
+    The installed NLTK stopwords corpus is preferred; if NLTK or the corpus
+    is missing, the bundled copy of the same list is used instead. Nothing
+    is downloaded, so this works offline.
+    """
+    try:
+        from nltk.corpus import stopwords
+
+        return frozenset(stopwords.words('english'))
+    except (ImportError, LookupError, OSError) as e:
+        logger.info("NLTK stopwords unavailable (%s); using the bundled list", type(e).__name__)
+        return frozenset(ENGLISH_STOPWORDS)
+
+
+@lru_cache(maxsize=1)
+def _cleaning_tables():
+    stop_words = get_stop_words()
+    # Contraction parts that are stopwords are left out up front
+    contraction_parts: Dict[str, List[str]] = {
+        word: [part for part in parts if part not in stop_words]
+        for word, parts in _CONTRACTIONS.items()
+    }
+    return stop_words, contraction_parts
+
 
 def clean_text(text: str) -> str:
     """
@@ -34,24 +71,45 @@ def clean_text(text: str) -> str:
     """
     if not text:
         return ""
-    
-    # Lowercase the text
-    text = text.lower()
-    
-    # Remove special characters and punctuation (keep alphanumeric and spaces)
-    text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
-    
-    # Tokenize the text
-    tokens = word_tokenize(text)
-    
-    # Remove stopwords
-    stop_words = set(stopwords.words('english'))
-    cleaned_tokens = [word for word in tokens if word not in stop_words]
-    
-    # Join tokens back into a single string
-    cleaned_text = ' '.join(cleaned_tokens)
-    
-    # Remove extra spaces that might be left
-    cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
-    
-    return cleaned_text
+    stop_words, contraction_parts = _cleaning_tables()
+
+    # Lowercase, strip punctuation and split on whitespace
+    tokens = _NON_ALPHANUMERIC.sub('', text.lower()).split()
+
+    if contraction_parts.keys().isdisjoint(tokens):
+        return ' '.join([word for word in tokens if word not in stop_words])
+
+    cleaned_tokens = []
+    for word in tokens:
+        parts = contraction_parts.get(word)
+        if parts is not None:
+            cleaned_tokens.extend(parts)
+        elif word not in stop_words:
+            cleaned_tokens.append(word)
+    return ' '.join(cleaned_tokens)
+
+
+def clean_texts(
+    texts: Iterable[str],
+    workers: Optional[int] = None,
+    chunksize: int = CLEAN_CHUNKSIZE,
+) -> List[str]:
+    """
+    Cleans many texts, in the order given.
+
+    Args:
+        texts (Iterable[str]): The raw texts to clean.
+        workers (int): Processes to spread the work over. None or 1 cleans
+                       in this process; 0 uses one process per CPU.
+        chunksize (int): Texts sent to a worker per task.
+
+    Returns:
+        List[str]: The cleaned texts.
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if not workers or workers < 2:
+        return [clean_text(text) for text in texts]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(clean_text, texts, chunksize=chunksize))
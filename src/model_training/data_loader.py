@@ -1,12 +1,10 @@
 """
 Data loading and train/test splitting for the ML classifier pipeline.
 """
-import pandas as pd
-from sklearn.model_selection import train_test_split
 from src.model_training.config import TEST_SIZE, RANDOM_STATE
 
 
-def load_and_split(df: pd.DataFrame):
+def load_and_split(df):
     """
     Validate the DataFrame and split into train/test sets.
 
@@ -16,6 +14,8 @@ def load_and_split(df: pd.DataFrame):
     Returns:
         Tuple of (X_train, X_test, y_train, y_test).
     """
+    from sklearn.model_selection import train_test_split
+
     required = {"clause_text", "is_risky"}
     if not required.issubset(df.columns):
         raise ValueError(f"DataFrame must contain columns: {required}")
@@ -1,7 +1,6 @@
 """
 Evaluate trained classifiers and report precision, recall, and F1-score.
 """
-from sklearn.metrics import classification_report, f1_score
 
 
 def evaluate_models(models: dict, X_test_vec, y_test) -> str:
@@ -17,6 +16,8 @@ def evaluate_models(models: dict, X_test_vec, y_test) -> str:
     Returns:
         Name of the best model (highest macro F1).
     """
+    from sklearn.metrics import classification_report, f1_score
+
     best_name, best_f1 = None, -1.0
     labels = ["Safe (0)", "Risky (1)"]
 
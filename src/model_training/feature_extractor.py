@@ -1,11 +1,12 @@
 """
 TF-IDF feature extraction for contract clause classification.
 """
-from sklearn.feature_extraction.text import TfidfVectorizer
 
 
-def build_vectorizer() -> TfidfVectorizer:
+def build_vectorizer():
     """Return a configured TfidfVectorizer."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
     return TfidfVectorizer(
         strip_accents="unicode",
         analyzer="word",
@@ -15,7 +16,7 @@ def build_vectorizer() -> TfidfVectorizer:
     )
 
 
-def fit_and_transform(vectorizer: TfidfVectorizer, X_train, X_test):
+def fit_and_transform(vectorizer, X_train, X_test):
     """
     Fit vectorizer on training text and transform both splits.
 
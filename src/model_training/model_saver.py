@@ -2,7 +2,6 @@
 Persist the best model and the fitted TF-IDF vectorizer to disk.
 """
 import os
-import joblib
 from src.model_training.config import (
     MODELS_DIR, BEST_MODEL_FILENAME, VECTORIZER_FILENAME
 )
@@ -17,6 +16,8 @@ def save_best(models: dict, best_name: str, vectorizer) -> None:
         best_name: Key in `models` identifying the best model.
         vectorizer: Fitted TfidfVectorizer instance.
     """
+    import joblib
+
     os.makedirs(MODELS_DIR, exist_ok=True)
 
     model_path = os.path.join(MODELS_DIR, BEST_MODEL_FILENAME)
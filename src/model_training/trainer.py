@@ -1,8 +1,6 @@
 """
 Train Logistic Regression and Decision Tree classifiers.
 """
-from sklearn.linear_model import LogisticRegression
-from sklearn.tree import DecisionTreeClassifier
 from src.model_training.config import RANDOM_STATE
 
 
@@ -17,6 +15,9 @@ def train_models(X_train_vec, y_train) -> dict:
     Returns:
         Dict mapping model name to fitted model instance.
     """
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.tree import DecisionTreeClassifier
+
     models = {
         "Logistic Regression": LogisticRegression(
             max_iter=1000, random_state=RANDOM_STATE, class_weight="balanced"
@@ -7,8 +7,6 @@ Usage:
 The script uses a synthetic DataFrame for demonstration.
 Replace `build_demo_dataframe()` with your real data loading logic.
 """
-import pandas as pd
-
 from src.model_training.data_loader import load_and_split
 from src.model_training.feature_extractor import build_vectorizer, fit_and_transform
 from src.model_training.trainer import train_models
@@ -16,8 +14,10 @@ from src.model_training.evaluator import evaluate_models
 from src.model_training.model_saver import save_best
 
 
-def build_demo_dataframe() -> pd.DataFrame:
+def build_demo_dataframe():
     """Return a small synthetic DataFrame for smoke-testing the pipeline."""
+    import pandas as pd
+
     data = {
         "clause_text": [
             "The party may terminate this agreement without notice at any time.",
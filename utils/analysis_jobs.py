@@ -0,0 +1,225 @@
+"""
+utils/analysis_jobs.py
+----------------------
+Background analysis jobs on a worker pool shared by all app sessions.
+
+`submit()` queues run_analysis() for a document and returns an
+AnalysisJob handle right away. The job records progress, the number of
+clauses scored so far and a preview of the first risky clauses while it
+runs, and the result (or the exception) once it finishes. The UI keeps the
+handle in its session state and polls it, so reruns never block on or
+restart the analysis.
+
+Jobs are identified by document hash, file type and predictor mode:
+submitting a document that is already queued or running returns the
+existing job, so a second session uploading the same file attaches to it
+instead of analysing the document again. Finished jobs are only kept by
+the sessions holding them; a later submission of the same document goes
+through run_analysis() again and is served from the result cache.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from app_config import (
+    ANALYSIS_WORKERS,
+    ANALYSIS_PREVIEW_CLAUSES,
+    DEFAULT_PREDICTOR_MODE,
+)
+from utils.result_cache import content_hash
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def job_key(raw_bytes: bytes, filename: str, mode: Optional[str]) -> str:
+    """Identity of an analysis: document hash, file type and predictor mode."""
+    ext = os.path.splitext(filename)[1].lower().lstrip(".")
+    return f"{content_hash(raw_bytes)}-{ext}-{mode or DEFAULT_PREDICTOR_MODE}"
+
+
+class AnalysisJob:
+    """Handle of one background analysis; all reads go through snapshot()."""
+
+    def __init__(self, key: str, filename: str, mode: Optional[str], preview_clauses: int):
+        self.key = key
+        self.filename = filename
+        self.mode = mode
+        self.submitted_at = time.time()
+        self._preview_limit = preview_clauses
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._state = QUEUED
+        self._fraction = 0.0
+        self._message = "Waiting for a worker…"
+        self._clauses = 0
+        self._risky = 0
+        self._preview: List = []
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self.result: Optional[Dict] = None
+        self.error: Optional[BaseException] = None
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+    def _on_progress(self, fraction: float, message: str) -> None:
+        with self._lock:
+            self._fraction, self._message = fraction, message
+
+    def _on_batch(self, batch) -> None:
+        risky = [c for c in batch if c["label"] == "Risky"]
+        with self._lock:
+            self._clauses += len(batch)
+            self._risky += len(risky)
+            room = self._preview_limit - len(self._preview)
+            if room > 0:
+                self._preview.extend(risky[:room])
+
+    def _run(self, raw_bytes: bytes) -> None:
+        from utils.analysis_pipeline import run_analysis
+
+        with self._lock:
+            self._state = RUNNING
+            self._started_at = time.time()
+        try:
+            result = run_analysis(
+                raw_bytes,
+                self.filename,
+                mode=self.mode,
+                progress=self._on_progress,
+                on_batch=self._on_batch,
+            )
+        except Exception as e:
+            with self._lock:
+                self.error = e
+                self._state = FAILED
+                self._finished_at = time.time()
+        else:
+            with self._lock:
+                self.result = result
+                self._state = DONE
+                self._fraction = 1.0
+                self._finished_at = time.time()
+        finally:
+            self._done.set()
+
+    # ------------------------------------------------------------------
+    # UI side
+    # ------------------------------------------------------------------
+    @property
+    def state(self) -> str:
+        """One of QUEUED, RUNNING, DONE, FAILED."""
+        with self._lock:
+            return self._state
+
+    def done(self) -> bool:
+        """True once the job has a result or an error."""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the job finishes (or `timeout` passes); returns done()."""
+        return self._done.wait(timeout)
+
+    def snapshot(self) -> Dict:
+        """
+        Consistent view of the job's progress.
+
+        Returns:
+            dict with state, fraction, message, clauses_scored,
+            risky_scored, preview (first risky clauses, up to the preview
+            limit) and elapsed (seconds since the job started, or 0 while
+            queued).
+        """
+        with self._lock:
+            end = self._finished_at or time.time()
+            return {
+                "state": self._state,
+                "fraction": self._fraction,
+                "message": self._message,
+                "clauses_scored": self._clauses,
+                "risky_scored": self._risky,
+                "preview": list(self._preview),
+                "elapsed": end - self._started_at if self._started_at else 0.0,
+            }
+
+    def __repr__(self) -> str:
+        return f"<AnalysisJob {self.filename!r} mode={self.mode} {self.state}>"
+
+
+class AnalysisJobManager:
+    """Bounded worker pool plus the table of queued and running jobs."""
+
+    def __init__(self, max_workers: int = ANALYSIS_WORKERS, preview_clauses: int = ANALYSIS_PREVIEW_CLAUSES):
+        self.max_workers = max_workers
+        self.preview_clauses = preview_clauses
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+        self._jobs: Dict[str, AnalysisJob] = {}
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "reattached": 0, "completed": 0, "failed": 0}
+
+    def submit(self, raw_bytes: bytes, filename: str, mode: Optional[str] = None) -> AnalysisJob:
+        """
+        Queues the analysis of one document, or returns the job already
+        queued or running for the same document and mode.
+        """
+        key = job_key(raw_bytes, filename, mode)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None:
+                self.stats["reattached"] += 1
+                return job
+
+            job = AnalysisJob(key, filename, mode, self.preview_clauses)
+            self._jobs[key] = job
+            self.stats["submitted"] += 1
+
+        future = self._pool.submit(job._run, raw_bytes)
+        future.add_done_callback(lambda _: self._on_finished(job))
+        return job
+
+    def _on_finished(self, job: AnalysisJob) -> None:
+        with self._lock:
+            self.stats["failed" if job.error is not None else "completed"] += 1
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+
+    def get(self, key: str) -> Optional[AnalysisJob]:
+        """The queued or running job with this key, if any."""
+        with self._lock:
+            return self._jobs.get(key)
+
+    def queue_depth(self) -> int:
+        """Jobs submitted but not yet picked up by a worker."""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.state == QUEUED)
+
+    def info(self) -> Dict:
+        """Pool size, queued/running job counts and lifetime counters."""
+        with self._lock:
+            states = [job.state for job in self._jobs.values()]
+        return {
+            "workers": self.max_workers,
+            "queued": states.count(QUEUED),
+            "running": states.count(RUNNING),
+            **self.stats,
+        }
+
+
+_MANAGER: Optional[AnalysisJobManager] = None
+_MANAGER_LOCK = threading.Lock()
+
+
+def get_job_manager() -> AnalysisJobManager:
+    """Returns the process-wide job manager configured from app_config."""
+    global _MANAGER
+    if _MANAGER is None:
+        with _MANAGER_LOCK:
+            if _MANAGER is None:
+                _MANAGER = AnalysisJobManager()
+    return _MANAGER
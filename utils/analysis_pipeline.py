@@ -0,0 +1,241 @@
+"""
+utils/analysis_pipeline.py
+--------------------------
+Headless document analysis pipeline:
+
+    bytes → text extraction → clause segmentation → risk prediction → stats
+
+The stages are chained generators: pages are yielded as they are
+extracted, segmented incrementally (clauses spanning a page break are kept
+whole) and scored in growing batches, so the first results are available
+long before a large PDF has been fully parsed, and pipeline memory depends
+on the batch window rather than the document size.
+
+Shared by the Streamlit app and any non-UI entry point. Reports real
+progress (PDF pages, scored clauses) through an optional callback and
+records per-stage wall-clock timings. Slow documents can be profiled
+automatically (utils/profiling.py).
+"""
+
+import os
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+from utils import metrics, profiling
+from utils.file_handler import iter_text_chunks
+from utils.clause_segmenter import iter_segment_document
+from utils.clause_table import ClauseTable
+from utils.risk_predictor import (
+    analyze_clauses,
+    compute_summary_stats,
+    merge_analyzed,
+)
+from utils.result_cache import get_result_cache, result_cache_key
+
+# Called as progress(fraction_done, message) with fraction_done in [0, 1]
+ProgressCallback = Callable[[float, str], None]
+
+# Streamed scoring batches start small (fast first results) and double up
+# to the maximum (few, large predict calls for the rest of the document)
+STREAM_FIRST_BATCH = 32
+STREAM_MAX_BATCH = 4096
+
+# Share of the progress bar covered while pages are still being read
+_STREAM_SPAN = 0.95
+
+
+class EmptyDocumentError(ValueError):
+    """No text could be extracted from the document."""
+
+
+class NoClausesError(ValueError):
+    """Text was extracted but no clauses were found in it."""
+
+
+def _timed(iterator: Iterator, timings: Dict[str, float], key: str) -> Iterator:
+    """Yields from `iterator`, adding the time spent inside it to timings[key]."""
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            timings[key] += time.perf_counter() - start
+            return
+        timings[key] += time.perf_counter() - start
+        yield item
+
+
+def iter_analysis(
+    raw_bytes: bytes,
+    filename: str,
+    mode: Optional[str] = None,
+    progress: Optional[ProgressCallback] = None,
+    timings: Optional[Dict[str, float]] = None,
+) -> Iterator[ClauseTable]:
+    """
+    Streams the analysis of one document.
+
+    Args:
+        raw_bytes: File content (.pdf or .txt).
+        filename:  Original file name (extension selects the reader).
+        mode:      Prediction backend, see risk_predictor.predict_batch.
+        progress:  Optional progress callback.
+        timings:   Optional dict that receives per-stage seconds
+                   ("extract", "segment", "predict").
+
+    Yields:
+        Analyzed ClauseTable batches in document order, with document-wide
+        ids. Batches hold whole segmented blocks (pages), at least the
+        current batch size of clauses each.
+
+    Raises:
+        ValueError:         Unsupported file or unreadable PDF.
+        EmptyDocumentError: No text could be extracted.
+        NoClausesError:     No clauses were found.
+    """
+    if timings is None:
+        timings = {}
+    for key in ("extract", "segment", "predict"):
+        timings.setdefault(key, 0.0)
+
+    state = {"fraction": 0.0, "pages": "", "clauses": 0, "has_text": False}
+
+    def _report() -> None:
+        if progress is not None:
+            progress(
+                state["fraction"],
+                f"🔍 Analyzing{state['pages']} · {state['clauses']} clauses scored",
+            )
+
+    def _on_pages(done: int, total: int) -> None:
+        state["fraction"] = _STREAM_SPAN * done / total if total else _STREAM_SPAN
+        state["pages"] = f" — page {done}/{total}"
+        _report()
+
+    def _chunks() -> Iterator[str]:
+        for chunk in iter_text_chunks(raw_bytes, filename, progress=_on_pages):
+            if not state["has_text"] and chunk.strip():
+                state["has_text"] = True
+            yield chunk
+
+    if progress is not None:
+        progress(0.0, "📖 Extracting text from document…")
+
+    chunks = _timed(_chunks(), timings, "extract")
+    blocks = _timed(iter_segment_document(chunks), timings, "segment")
+
+    pending: List[ClauseTable] = []
+    pending_clauses = 0
+    batch_size = STREAM_FIRST_BATCH
+    seen_clauses = False
+
+    def _score(tables: List[ClauseTable]) -> ClauseTable:
+        start = time.perf_counter()
+        scored = analyze_clauses(ClauseTable.concat(tables), mode=mode)
+        timings["predict"] += time.perf_counter() - start
+        state["clauses"] += len(scored)
+        _report()
+        return scored
+
+    extract_before = timings["extract"]
+    for block in blocks:
+        seen_clauses = True
+        pending.append(block)
+        pending_clauses += len(block)
+        if pending_clauses >= batch_size:
+            yield _score(pending)
+            pending, pending_clauses = [], 0
+            batch_size = min(batch_size * 2, STREAM_MAX_BATCH)
+    if pending:
+        yield _score(pending)
+
+    # The segment timer wraps the extract timer; keep them disjoint.
+    timings["segment"] -= timings["extract"] - extract_before
+
+    if not state["has_text"]:
+        raise EmptyDocumentError("Could not extract any text from the document.")
+    if not seen_clauses:
+        raise NoClausesError("No clauses could be extracted from this document.")
+
+
+def _record_document(raw_bytes: bytes, filename: str, stats: Dict, timings: Dict[str, float]) -> None:
+    """Adds one fully analysed document to the process metrics."""
+    metrics.record_stage_timings({k: v for k, v in timings.items() if k != "cache_lookup"})
+    metrics.observe("document_seconds", sum(timings.values()))
+    metrics.inc("documents_total", type=os.path.splitext(filename)[1].lower().lstrip(".") or "unknown")
+    metrics.inc("document_bytes_total", len(raw_bytes))
+    metrics.inc("clauses_total", stats["total"])
+    metrics.inc("risky_clauses_total", stats["risky_count"])
+
+
+def run_analysis(
+    raw_bytes: bytes,
+    filename: str,
+    mode: Optional[str] = None,
+    progress: Optional[ProgressCallback] = None,
+    use_cache: bool = True,
+    on_batch: Optional[Callable[[ClauseTable], None]] = None,
+) -> Dict:
+    """
+    Analyzes one document.
+
+    Args:
+        raw_bytes: File content (.pdf or .txt).
+        filename:  Original file name (extension selects the reader).
+        mode:      Prediction backend, see risk_predictor.predict_batch.
+        progress:  Optional progress callback.
+        use_cache: Look up / store the result in the shared result cache.
+        on_batch:  Optional callback receiving each scored batch as soon as
+                   it is ready (for incremental display).
+
+    Returns:
+        dict with:
+            - analyzed  : analyzed ClauseTable for the whole document
+            - stats     : dict from risk_predictor.compute_summary_stats
+            - timings   : {stage: seconds} for the stages that actually ran
+            - cache_hit : True when the result came from the cache
+            - key       : result cache key (document hash + predictor
+                          config), or None when use_cache is False
+            - profile   : path of the saved cProfile dump when slow-document
+                          profiling is on and this run reached its
+                          threshold (see utils/profiling.py), else None
+
+    Raises:
+        ValueError:         Unsupported file or unreadable PDF.
+        EmptyDocumentError: No text could be extracted.
+        NoClausesError:     No clauses were found.
+    """
+    timings: Dict[str, float] = {}
+
+    cache = cache_key = None
+    if use_cache:
+        start = time.perf_counter()
+        cache = get_result_cache()
+        cache_key = result_cache_key(raw_bytes, filename, mode)
+        cached = cache.get(cache_key)
+        timings["cache_lookup"] = time.perf_counter() - start
+        metrics.inc("result_cache_total", result="hit" if cached is not None else "miss")
+        if cached is not None:
+            return {**cached, "timings": timings, "cache_hit": True, "key": cache_key, "profile": None}
+
+    with profiling.capture(raw_bytes, filename, mode, timings) as capture:
+        parts = []
+        for batch in iter_analysis(raw_bytes, filename, mode, progress, timings):
+            parts.append(batch)
+            if on_batch is not None:
+                on_batch(batch)
+        analyzed = merge_analyzed(parts)
+
+        start = time.perf_counter()
+        stats = compute_summary_stats(analyzed)
+        timings["summary"] = time.perf_counter() - start
+    if progress is not None:
+        progress(1.0, "✅ Analysis complete!")
+
+    if metrics.enabled():
+        _record_document(raw_bytes, filename, stats, timings)
+
+    result = {"analyzed": analyzed, "stats": stats}
+    if cache is not None:
+        cache.put(cache_key, result)
+    return {**result, "timings": timings, "cache_hit": False, "key": cache_key, "profile": capture.path}
@@ -2,84 +2,89 @@
 utils/clause_segmenter.py
 --------------------------
 Wraps the existing segmenter logic and adds structured output with
-clause IDs and character counts suitable for Streamlit display.
+clause IDs and word counts suitable for Streamlit display (a ClauseTable
+of offsets into the document, see utils/clause_table.py).
 """
 
 import re
 import sys
 import os
-from typing import List, Dict
+from typing import Iterable, Iterator
 
 # Allow importing from src/ even when running from the project root
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-try:
-    from src.data_preprocessing.segmenter import segment_into_clauses as _core_segment
-    _USE_CORE = True
-except ImportError:
-    _USE_CORE = False
+from src.data_preprocessing.segmenter import segment_spans
+from utils.clause_table import ClauseTable
 
+# The segmenter treats paragraphs independently, so text can be segmented
+# block by block as long as blocks are cut inside a paragraph break.
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
 
-def _fallback_segment(text: str) -> List[str]:
-    """
-    Simple fallback clause segmenter in case the src module is unavailable.
-    Splits on double newlines and then on numbered list starters.
-    """
-    if not text:
-        return []
 
-    paragraphs = re.split(r"\n\s*\n", text)
-    clauses = []
-    delimiter_pattern = r"(?m)(^\s*\d+\.\d*\s*|^\s*[a-zA-Z]\)\s*|^\s*[ivxIVX]+\.\s*)"
+def _iter_complete_blocks(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Re-chunks streamed text into blocks that end at a paragraph break.
 
-    for para in paragraphs:
-        para = para.strip()
-        if not para:
+    Only the unfinished trailing paragraph is carried over to the next
+    chunk, so a clause that continues across a page break is kept whole and
+    memory is bounded by the chunk size plus one paragraph.
+    """
+    buffer = ""
+    for chunk in chunks:
+        # A break completed by this chunk starts in the trailing whitespace
+        # of the buffer, so only that part needs to be scanned again.
+        scan_from = len(buffer)
+        while scan_from > 0 and buffer[scan_from - 1].isspace():
+            scan_from -= 1
+        buffer += chunk
+        last_break = None
+        for last_break in _PARAGRAPH_BREAK.finditer(buffer, scan_from):
+            pass
+        if last_break is None or last_break.start() == 0:
             continue
+        yield buffer[:last_break.start()]
+        buffer = buffer[last_break.start():]
+    if buffer.strip():
+        yield buffer
 
-        parts = re.split(delimiter_pattern, para)
-        current = ""
-        for part in parts:
-            if re.match(delimiter_pattern, part):
-                if current.strip():
-                    clauses.append(current.strip())
-                current = part
-            else:
-                current += part
-        if current.strip():
-            clauses.append(current.strip())
 
-    return [c for c in clauses if len(c.split()) > 3]
+def iter_segment_document(chunks: Iterable[str]) -> Iterator[ClauseTable]:
+    """
+    Streaming version of `segment_document`.
+
+    Args:
+        chunks: Pieces of the document text in order (e.g. from
+                file_handler.iter_text_chunks). Concatenated, they form the
+                full text.
+
+    Yields:
+        One ClauseTable per block of complete paragraphs. Joined with
+        ClauseTable.concat, they equal segment_document() of the
+        concatenated text, ids included.
+    """
+    next_id = 1
+    for block in _iter_complete_blocks(chunks):
+        table = ClauseTable.from_spans(block, segment_spans(block), first_id=next_id)
+        if len(table):
+            next_id += len(table)
+            yield table
 
 
-def segment_document(text: str) -> List[Dict]:
+def segment_document(text: str) -> ClauseTable:
     """
-    Segments the raw contract text into a list of clause dicts.
+    Segments the raw contract text into clauses.
 
-    Each dict contains:
+    The result is a ClauseTable: clause offsets into `text` plus word
+    counts. Each item behaves like a read-only dict with:
         - id          (int)   : 1-based clause index
-        - text        (str)   : the clause text
+        - text        (str)   : the clause text (sliced on access)
         - word_count  (int)   : number of words in the clause
 
     Args:
         text (str): Raw contract text.
 
     Returns:
-        List of clause dicts.
+        ClauseTable of the document's clauses.
     """
-    if _USE_CORE:
-        raw_clauses = _core_segment(text)
-    else:
-        raw_clauses = _fallback_segment(text)
-
-    structured = []
-    for idx, clause_text in enumerate(raw_clauses, start=1):
-        structured.append(
-            {
-                "id": idx,
-                "text": clause_text,
-                "word_count": len(clause_text.split()),
-            }
-        )
-
-    return structured
+    return ClauseTable.from_spans(text, segment_spans(text))
@@ -0,0 +1,198 @@
+"""
+utils/clause_table.py
+---------------------
+Compact, offset-based representation of a segmented document.
+
+A ClauseTable keeps the document text once and describes every clause by
+array-backed (start, end, word_count) columns; clause ids are implicit
+(first_id + row). Prediction results are attached as the columnar batch
+returned by risk_predictor.predict_batch. Clause text is only sliced out of
+the shared document string when it is actually read, e.g. while rendering,
+and matched keywords/categories are decoded from their bitmasks the same way
+(see utils/risk_vocabulary.py).
+
+Iterating or indexing a table yields ClauseView objects, read-only Mappings
+with the same keys as the clause dicts used elsewhere ("id", "text",
+"word_count", and after prediction "label", "confidence",
+"matched_keywords", "categories"), so display code and filters work on them
+unchanged.
+"""
+
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+_BASE_KEYS = ("id", "text", "word_count")
+_PREDICTION_KEYS = ("label", "confidence", "matched_keywords", "categories")
+
+
+def concat_columns(parts: List[Dict]) -> Dict:
+    """Joins the column dicts of consecutive `predict_batch` calls."""
+    merged = {}
+    for key in parts[0]:
+        values = [p[key] for p in parts]
+        if _HAS_NUMPY and isinstance(values[0], np.ndarray):
+            merged[key] = np.concatenate(values)
+        else:
+            merged[key] = [v for part in values for v in part]
+    return merged
+
+
+def _slice_columns(columns: Dict, index: slice) -> Dict:
+    return {key: values[index] for key, values in columns.items()}
+
+
+class ClauseView(Mapping):
+    """Dict-compatible, read-only view of one row of a ClauseTable."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "ClauseTable", row: int):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, key: str):
+        table, row = self._table, self._row
+        if key == "id":
+            return table.first_id + row
+        if key == "text":
+            return table.text[table.starts[row]:table.ends[row]]
+        if key == "word_count":
+            return table.word_counts[row]
+        columns = table.columns
+        if columns is not None:
+            if key == "label":
+                return "Risky" if columns["is_risky"][row] else "Safe"
+            if key == "confidence":
+                return float(columns["confidence"][row])
+            if key == "matched_keywords":
+                return table.vocabulary.keywords_for(columns["keyword_mask"][row])
+            if key == "categories":
+                return table.vocabulary.categories_for(columns["keyword_mask"][row])
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from _BASE_KEYS
+        if self._table.columns is not None:
+            yield from _PREDICTION_KEYS
+
+    def __len__(self) -> int:
+        return len(_BASE_KEYS) + (len(_PREDICTION_KEYS) if self._table.columns is not None else 0)
+
+    def __repr__(self) -> str:
+        return f"ClauseView({dict(self)!r})"
+
+
+class ClauseTable(Sequence):
+    """
+    Clauses of one document as offsets into a single shared string.
+
+    Attributes:
+        text        : the document text all offsets refer to
+        starts/ends : array('q') of clause character offsets into `text`
+        word_counts : array('q') of words per clause
+        first_id    : id of the first row; ids are consecutive
+        columns     : prediction batch from predict_batch, or None before
+                      analysis
+        vocabulary  : RiskVocabulary decoding the keyword masks in `columns`
+    """
+
+    def __init__(
+        self,
+        text: str,
+        starts: Iterable[int] = (),
+        ends: Iterable[int] = (),
+        word_counts: Iterable[int] = (),
+        first_id: int = 1,
+        columns: Optional[Dict] = None,
+        vocabulary=None,
+    ):
+        self.text = text
+        self.starts = array("q", starts)
+        self.ends = array("q", ends)
+        self.word_counts = array("q", word_counts)
+        self.first_id = first_id
+        self.columns = columns
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def from_spans(cls, text: str, spans: Iterable, first_id: int = 1) -> "ClauseTable":
+        """Builds a table from segmenter (start, end, word_count) spans."""
+        table = cls(text, first_id=first_id)
+        for start, end, words in spans:
+            table.starts.append(start)
+            table.ends.append(end)
+            table.word_counts.append(words)
+        return table
+
+    @classmethod
+    def concat(cls, tables: List["ClauseTable"]) -> "ClauseTable":
+        """
+        Joins consecutive tables (e.g. streamed blocks of one document) into
+        one table over the concatenation of their texts. Predictions are
+        joined too when every part has them.
+        """
+        if not tables:
+            return cls("")
+        if len(tables) == 1:
+            return tables[0]
+
+        merged = cls("", first_id=tables[0].first_id)
+        pieces: List[str] = []
+        offset = length = 0
+        previous = None
+        for t in tables:
+            # Neighbouring slices of one table share its text; store it once
+            if t.text is not previous:
+                pieces.append(t.text)
+                offset, length = length, length + len(t.text)
+                previous = t.text
+            merged.starts.extend(s + offset for s in t.starts)
+            merged.ends.extend(e + offset for e in t.ends)
+            merged.word_counts.extend(t.word_counts)
+        merged.text = "".join(pieces)
+        if all(t.columns is not None for t in tables):
+            merged.columns = concat_columns([t.columns for t in tables])
+            merged.vocabulary = tables[0].vocabulary
+        return merged
+
+    def texts(self) -> List[str]:
+        """Clause texts (sliced from the document on every call)."""
+        text = self.text
+        return [text[s:e] for s, e in zip(self.starts, self.ends)]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            rows = range(len(self))[index]
+            if rows.step != 1:
+                return [ClauseView(self, row) for row in rows]
+            sub = ClauseTable(self.text, first_id=self.first_id + rows.start, vocabulary=self.vocabulary)
+            sub.starts = self.starts[index]
+            sub.ends = self.ends[index]
+            sub.word_counts = self.word_counts[index]
+            if self.columns is not None:
+                sub.columns = _slice_columns(self.columns, index)
+            return sub
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("clause index out of range")
+        return ClauseView(self, index)
+
+    def __iter__(self) -> Iterator[ClauseView]:
+        for row in range(len(self)):
+            yield ClauseView(self, row)
+
+    def __repr__(self) -> str:
+        state = "analyzed" if self.columns is not None else "segmented"
+        return f"<ClauseTable {len(self)} clauses, {len(self.text)} chars, {state}>"
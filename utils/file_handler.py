@@ -2,12 +2,20 @@
 utils/file_handler.py
 ---------------------
 Handles reading text from Streamlit UploadedFile objects (PDF and TXT).
-Wraps PyPDF2 for in-memory PDF extraction.
+PDF pages are extracted by src/data_preprocessing/pdf_extractor.py, which
+switches to a process pool for large documents. It (and through it the PDF
+libraries and the extracted-text cache) is only imported once a PDF is read.
 """
 
-import io
-from typing import Optional
-import PyPDF2
+from typing import Callable, Iterator, Optional
+
+from utils import metrics
+
+# Called as progress(pages_done, total_pages) while a PDF is being read
+PageProgress = Callable[[int, int], None]
+
+# Slice size used when streaming an already-decoded TXT document
+TEXT_STREAM_CHUNK_CHARS = 64 * 1024
 
 
 def extract_text_from_upload(uploaded_file) -> Optional[str]:
@@ -30,22 +38,84 @@ def extract_text_from_upload(uploaded_file) -> Optional[str]:
     if uploaded_file is None:
         return None
 
-    filename: str = uploaded_file.name.lower()
+    return extract_text_from_bytes(uploaded_file.getvalue(), uploaded_file.name)
+
+
+def extract_text_from_bytes(
+    raw_bytes: bytes, filename: str, progress: Optional[PageProgress] = None
+) -> str:
+    """
+    Extracts raw text from the bytes of a .txt or .pdf file.
+
+    Args:
+        raw_bytes: File content.
+        filename:  Original file name (only the extension is used).
+        progress:  Optional callback, called after every PDF page as
+                   progress(pages_done, total_pages).
+
+    Returns:
+        Extracted text as a string.
+
+    Raises:
+        ValueError: If the file format is not supported.
+    """
+    lowered = filename.lower()
+
+    if lowered.endswith(".txt"):
+        return _read_txt(raw_bytes)
+    elif lowered.endswith(".pdf"):
+        return _read_pdf(raw_bytes, progress)
+    else:
+        raise ValueError(
+            f"Unsupported file type: '{filename}'. "
+            "Please upload a .pdf or .txt file."
+        )
+
 
-    if filename.endswith(".txt"):
-        return _read_txt(uploaded_file)
-    elif filename.endswith(".pdf"):
-        return _read_pdf(uploaded_file)
+def iter_text_chunks(
+    raw_bytes: bytes, filename: str, progress: Optional[PageProgress] = None
+) -> Iterator[str]:
+    """
+    Streaming counterpart of `extract_text_from_bytes`.
+
+    Yields pieces of the document text as they become available (one per
+    PDF page, or fixed-size slices of a TXT file). Concatenating the pieces
+    gives exactly what `extract_text_from_bytes` returns.
+
+    Raises:
+        ValueError: If the file format is not supported or the PDF is unreadable.
+    """
+    lowered = filename.lower()
+
+    if lowered.endswith(".txt"):
+        text = _read_txt(raw_bytes)
+        total = max(1, -(-len(text) // TEXT_STREAM_CHUNK_CHARS))
+        for i, start in enumerate(range(0, len(text), TEXT_STREAM_CHUNK_CHARS)):
+            yield text[start:start + TEXT_STREAM_CHUNK_CHARS]
+            if progress is not None:
+                progress(i + 1, total)
+    elif lowered.endswith(".pdf"):
+        from src.data_preprocessing.pdf_extractor import iter_pdf_pages
+
+        first = True
+        pages = 0
+        for page_text in iter_pdf_pages(raw_bytes, progress=progress):
+            pages += 1
+            if not page_text:
+                continue
+            # Same page separator as _read_pdf's "\n\n".join(...)
+            yield page_text if first else "\n\n" + page_text
+            first = False
+        metrics.inc("pdf_pages_total", pages)
     else:
         raise ValueError(
-            f"Unsupported file type: '{uploaded_file.name}'. "
+            f"Unsupported file type: '{filename}'. "
             "Please upload a .pdf or .txt file."
         )
 
 
-def _read_txt(uploaded_file) -> str:
-    """Reads text from a TXT UploadedFile."""
-    raw_bytes: bytes = uploaded_file.read()
+def _read_txt(raw_bytes: bytes) -> str:
+    """Decodes the bytes of a TXT file."""
     # Try UTF-8 first, fall back to latin-1 for older legal docs
     for encoding in ("utf-8", "latin-1", "cp1252"):
         try:
@@ -56,24 +126,13 @@ def _read_txt(uploaded_file) -> str:
     return raw_bytes.decode("utf-8", errors="replace")
 
 
-def _read_pdf(uploaded_file) -> str:
-    """Reads text from a PDF UploadedFile using PyPDF2."""
-    raw_bytes: bytes = uploaded_file.read()
-    pdf_buffer = io.BytesIO(raw_bytes)
-
-    text_parts = []
-    try:
-        reader = PyPDF2.PdfReader(pdf_buffer)
-        for page_num, page in enumerate(reader.pages):
-            extracted = page.extract_text()
-            if extracted:
-                text_parts.append(extracted)
-    except Exception as e:
-        # Return whatever we managed to extract
-        if not text_parts:
-            raise ValueError(f"Could not parse PDF: {e}") from e
-
-    return "\n\n".join(text_parts)
+def _read_pdf(raw_bytes: bytes, progress: Optional[PageProgress] = None) -> str:
+    """Reads text from the bytes of a PDF file, page by page."""
+    from src.data_preprocessing.pdf_extractor import extract_pdf_pages
+
+    pages = extract_pdf_pages(raw_bytes, progress=progress)
+    metrics.inc("pdf_pages_total", len(pages))
+    return "\n\n".join(text for text in pages if text)
 
 
 def get_file_metadata(uploaded_file) -> dict:
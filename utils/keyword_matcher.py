@@ -0,0 +1,156 @@
+"""
+utils/keyword_matcher.py
+------------------------
+Precompiled multi-keyword matcher used by the risk predictor.
+
+All keywords are folded into a single trie-shaped regular expression so a
+clause is scanned once, instead of once per keyword. Matching semantics are
+identical to testing every keyword with r"\\b" + re.escape(kw) + r"\\b".
+"""
+
+import re
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Builds a regex alternation shaped like a prefix trie.
+
+    Each keyword ends with a word-boundary check, so at any given start
+    position the regex returns the longest keyword that is word-bounded
+    there (greedy branches are tried before shorter terminals).
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def _render(node: Dict) -> str:
+        branches = []
+        terminal = False
+        for char in sorted(node):
+            if char == "":
+                terminal = True
+                continue
+            branches.append(re.escape(char) + _render(node[char]))
+        if terminal:
+            branches.append(r"\b")
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return _render(trie)
+
+
+def _implied_prefixes(keywords: Sequence[str]) -> Dict[str, Tuple[int, ...]]:
+    """
+    For every keyword, lists the indices of the *other* keywords that must
+    also match at the same start position whenever it matches.
+
+    A keyword B is implied by A when B is a prefix of A and the word-boundary
+    after B is already guaranteed by the characters of A itself.
+    """
+    implied: Dict[str, Tuple[int, ...]] = {}
+    for kw in keywords:
+        hits = []
+        for idx, other in enumerate(keywords):
+            if other == kw or not kw.startswith(other) or not other:
+                continue
+            before, after = other[-1], kw[len(other)]
+            if _is_word(before) != _is_word(after):
+                hits.append(idx)
+        implied[kw] = tuple(hits)
+    return implied
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class KeywordMatcher:
+    """
+    Single-pass matcher for a fixed list of keywords.
+
+    Build it once per keyword list (see `get_matcher`) and call
+    `find_indices` / `find` on lower-cased clause text.
+    """
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords: Tuple[str, ...] = tuple(keywords)
+        self._index: Dict[str, int] = {}
+        for idx, kw in enumerate(self.keywords):
+            self._index.setdefault(kw, idx)
+
+        unique = [kw for kw in self._index if kw]
+        implied = _implied_prefixes(unique)
+        self._implied: Dict[str, Tuple[int, ...]] = {
+            kw: tuple(self._index[unique[i]] for i in implied[kw]) for kw in unique
+        }
+        # Bit of each keyword OR-ed with the bits of the keywords it implies
+        self._bits: Dict[str, int] = {}
+        for kw in unique:
+            bits = 1 << self._index[kw]
+            for i in self._implied[kw]:
+                bits |= 1 << i
+            self._bits[kw] = bits
+
+        if unique:
+            body = _trie_pattern(unique)
+            # Zero-width lookahead so overlapping hits ("liability" inside
+            # "unlimited liability") are all reported in one finditer pass.
+            self._pattern = re.compile(r"(?=\b(" + body + r"))")
+        else:
+            self._pattern = None
+
+    def find_indices(self, text_lower: str) -> List[int]:
+        """
+        Returns the sorted indices (into `keywords`) of every keyword that
+        occurs word-bounded in `text_lower`.
+        """
+        if self._pattern is None:
+            return []
+        index, implied = self._index, self._implied
+        found = set()
+        for m in self._pattern.finditer(text_lower):
+            kw = m.group(1)
+            found.add(index[kw])
+            found.update(implied[kw])
+        return sorted(found)
+
+    def find_mask(self, text_lower: str) -> int:
+        """
+        Returns the matched keywords as a bitmask: bit i is set when
+        keywords[i] occurs word-bounded in `text_lower`.
+        """
+        if self._pattern is None:
+            return 0
+        bits = self._bits
+        mask = 0
+        for m in self._pattern.finditer(text_lower):
+            mask |= bits[m.group(1)]
+        return mask
+
+    def find(self, text_lower: str) -> List[str]:
+        """Returns matched keywords in keyword-list order."""
+        keywords = self.keywords
+        return [keywords[i] for i in self.find_indices(text_lower)]
+
+
+_MATCHER_CACHE: Dict[Tuple[str, ...], KeywordMatcher] = {}
+
+
+def get_matcher(keywords: Sequence[str]) -> KeywordMatcher:
+    """
+    Returns the compiled matcher for `keywords`, building it on first use.
+
+    The cache is keyed on the keyword tuple itself, so editing the keyword
+    list (e.g. in app_config) transparently yields a freshly built matcher.
+    """
+    key = tuple(keywords)
+    matcher = _MATCHER_CACHE.get(key)
+    if matcher is None:
+        matcher = KeywordMatcher(key)
+        _MATCHER_CACHE[key] = matcher
+    return matcher
@@ -0,0 +1,308 @@
+"""
+utils/metrics.py
+----------------
+Process-wide counters, gauges and timers for the analysis hot path.
+
+Instrumented code calls the module-level helpers:
+
+    inc("clauses_total", len(table))
+    with timer("stage_seconds", stage="render"):
+        ...
+    @timed("stage_seconds", stage="render_cards")
+    def build(...): ...
+
+Timers are histograms (count, sum and cumulative buckets), so latency
+percentiles can be derived by the scraper. Metrics are keyed by name plus
+keyword labels and exported in the Prometheus text format
+(`prometheus_text`), or as a plain dict for the app's diagnostics panel
+(`summary`).
+
+With METRICS_ENABLED=0 every helper returns after one flag check and
+`timer` hands out a shared no-op context manager, so the instrumentation
+can stay in the hot path. Snapshots are plain data: worker processes
+`drain()` theirs and the parent `merge()`s them (see api_server.py).
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Dict, List, Tuple
+
+from app_config import METRICS_ENABLED
+
+# Upper bounds (seconds) of the timer histogram buckets
+TIMER_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Prefix of every exported metric name
+METRIC_PREFIX = "contract_risk_"
+
+METRIC_HELP = {
+    "stage_seconds": "Wall-clock time per pipeline stage.",
+    "document_seconds": "Wall-clock time of a full document analysis (cache misses only).",
+    "documents_total": "Documents analysed, by file type.",
+    "document_bytes_total": "Bytes of analysed documents.",
+    "pdf_pages_total": "PDF pages read (from the text cache or extracted).",
+    "clauses_total": "Clauses segmented and scored.",
+    "risky_clauses_total": "Clauses labelled Risky.",
+    "keyword_hits_total": "Risk keyword matches across all scored clauses.",
+    "result_cache_total": "Analysis result cache lookups, by result.",
+    "http_requests_total": "HTTP requests, by endpoint and status.",
+    "http_request_seconds": "HTTP request handling time, by endpoint.",
+    "api_in_flight_documents": "Documents admitted and not yet finished.",
+}
+
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+_ENABLED = METRICS_ENABLED
+
+
+def _key(name: str, labels: Dict) -> _Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters, gauges and timer histograms."""
+
+    def __init__(self, buckets: Tuple[float, ...] = TIMER_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[_Key, float] = {}
+        self._gauges: Dict[_Key, float] = {}
+        # Per timer: [count per bucket (last one is +Inf), total count, sum]
+        self._timers: Dict[_Key, List] = {}
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        self._observe(_key(name, labels), seconds)
+
+    def _observe(self, key: _Key, seconds: float) -> None:
+        slot = bisect_left(self.buckets, seconds)
+        with self._lock:
+            hist = self._timers.get(key)
+            if hist is None:
+                hist = self._timers[key] = [[0] * (len(self.buckets) + 1), 0, 0.0]
+            hist[0][slot] += 1
+            hist[1] += 1
+            hist[2] += seconds
+
+    def _snapshot_locked(self) -> Dict:
+        return {
+            "counters": [(name, labels, v) for (name, labels), v in self._counters.items()],
+            "gauges": [(name, labels, v) for (name, labels), v in self._gauges.items()],
+            "timers": [
+                (name, labels, list(h[0]), h[1], h[2]) for (name, labels), h in self._timers.items()
+            ],
+        }
+
+    def snapshot(self) -> Dict:
+        """All current values as plain, picklable data."""
+        with self._lock:
+            return self._snapshot_locked()
+
+    def merge(self, snapshot: Dict) -> None:
+        """Adds another registry's snapshot (e.g. from a worker process)."""
+        with self._lock:
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(map(tuple, labels)))
+                self._counters[key] = self._counters.get(key, 0) + value
+            for name, labels, value in snapshot["gauges"]:
+                self._gauges[(name, tuple(map(tuple, labels)))] = value
+            for name, labels, counts, count, total in snapshot["timers"]:
+                key = (name, tuple(map(tuple, labels)))
+                hist = self._timers.get(key)
+                if hist is None:
+                    hist = self._timers[key] = [[0] * (len(self.buckets) + 1), 0, 0.0]
+                hist[0] = [a + b for a, b in zip(hist[0], counts)]
+                hist[1] += count
+                hist[2] += total
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timers.clear()
+
+    def drain(self) -> Dict:
+        """snapshot() followed by reset(), atomically."""
+        with self._lock:
+            snap = self._snapshot_locked()
+            self._counters, self._gauges, self._timers = {}, {}, {}
+        return snap
+
+    def summary(self) -> Dict:
+        """
+        Human-readable view for diagnostics: counters and gauges by
+        "name{labels}", timers as count, total and mean milliseconds.
+        """
+        snap = self.snapshot()
+        out = {}
+        for name, labels, value in sorted(snap["counters"] + snap["gauges"]):
+            out[_series(name, labels)] = value
+        for name, labels, _, count, total in sorted(snap["timers"]):
+            out[_series(name, labels)] = {
+                "count": count,
+                "total_ms": round(total * 1000, 2),
+                "mean_ms": round(total * 1000 / count, 2) if count else 0.0,
+            }
+        return out
+
+    def prometheus_text(self, prefix: str = METRIC_PREFIX) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        snap = self.snapshot()
+        lines: List[str] = []
+        seen = set()
+
+        def _header(name: str, kind: str) -> None:
+            if (name, kind) in seen:
+                return
+            seen.add((name, kind))
+            if name in METRIC_HELP:
+                lines.append(f"# HELP {prefix}{name} {METRIC_HELP[name]}")
+            lines.append(f"# TYPE {prefix}{name} {kind}")
+
+        for kind, rows in (("counter", snap["counters"]), ("gauge", snap["gauges"])):
+            for name, labels, value in sorted(rows):
+                _header(name, kind)
+                lines.append(f"{prefix}{_series(name, labels)} {_number(value)}")
+
+        for name, labels, counts, count, total in sorted(snap["timers"]):
+            _header(name, "histogram")
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{prefix}{_series(name + '_bucket', labels + (('le', le),))} {cumulative}")
+            lines.append(f"{prefix}{_series(name + '_sum', labels)} {_number(total)}")
+            lines.append(f"{prefix}{_series(name + '_count', labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _series(name: str, labels) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+# ---------------------------------------------------------------------------
+# Module-level helpers used by instrumented code
+# ---------------------------------------------------------------------------
+_REGISTRY = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Returns the process-wide metrics registry."""
+    return _REGISTRY
+
+
+def enabled() -> bool:
+    """True when metrics are being recorded."""
+    return _ENABLED
+
+
+def set_enabled(flag: bool) -> None:
+    """Turns recording on or off for this process (default: METRICS_ENABLED)."""
+    global _ENABLED
+    _ENABLED = bool(flag)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+class _Timer:
+    __slots__ = ("_key", "_start")
+
+    def __init__(self, key: _Key):
+        self._key = key
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        _REGISTRY._observe(self._key, time.perf_counter() - self._start)
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def inc(name: str, value: float = 1, **labels) -> None:
+    """Adds `value` to a counter."""
+    if _ENABLED:
+        _REGISTRY.inc(name, value, **labels)
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    """Sets a gauge to `value`."""
+    if _ENABLED:
+        _REGISTRY.set_gauge(name, value, **labels)
+
+
+def observe(name: str, seconds: float, **labels) -> None:
+    """Records one duration measured by the caller."""
+    if _ENABLED:
+        _REGISTRY.observe(name, seconds, **labels)
+
+
+def timer(name: str, **labels):
+    """Context manager recording the time spent in its block."""
+    if not _ENABLED:
+        return _NULL_TIMER
+    return _Timer(_key(name, labels))
+
+
+def timed(name: str, **labels):
+    """Decorator recording the time spent in each call of the function."""
+    key = _key(name, labels)
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _REGISTRY._observe(key, time.perf_counter() - start)
+        return wrapper
+
+    return decorator
+
+
+def prometheus_text() -> str:
+    """The process-wide metrics in the Prometheus text format."""
+    return _REGISTRY.prometheus_text()
+
+
+def record_stage_timings(timings: Dict[str, float]) -> None:
+    """Records a run_analysis() timings dict as stage_seconds observations."""
+    if _ENABLED:
+        for stage, seconds in timings.items():
+            _REGISTRY.observe("stage_seconds", seconds, stage=stage)
@@ -0,0 +1,87 @@
+"""
+utils/ml_backend.py
+-------------------
+Batched inference with the trained TF-IDF vectorizer + classifier.
+
+Loads the artifacts written by src/model_training/model_saver.save_best()
+(memory-mapped where joblib allows it) and scores a whole document's clauses
+with a single `transform` + `predict_proba` call. Process-wide caching and
+hot reload live in utils/model_registry.py.
+"""
+
+import os
+from typing import Sequence, Tuple
+
+from src.model_training.config import (
+    MODELS_DIR,
+    BEST_MODEL_FILENAME,
+    VECTORIZER_FILENAME,
+)
+
+
+def artifact_paths(models_dir: str = MODELS_DIR) -> Tuple[str, str]:
+    """Returns (model_path, vectorizer_path) inside `models_dir`."""
+    return (
+        os.path.join(models_dir, BEST_MODEL_FILENAME),
+        os.path.join(models_dir, VECTORIZER_FILENAME),
+    )
+
+
+def ml_artifacts_available(models_dir: str = MODELS_DIR) -> bool:
+    """True when both the model and vectorizer files exist on disk."""
+    return all(os.path.isfile(p) for p in artifact_paths(models_dir))
+
+
+def load_artifacts(models_dir: str = MODELS_DIR) -> Tuple:
+    """
+    Loads (model, vectorizer) from `models_dir`.
+
+    NumPy arrays inside the pickles (coefficients, idf weights, tree
+    nodes) are memory-mapped read-only, so several processes serving the
+    app share one copy through the OS page cache.
+
+    Raises:
+        FileNotFoundError: If the artifacts have not been trained yet.
+    """
+    model_path, vec_path = artifact_paths(models_dir)
+    if not ml_artifacts_available(models_dir):
+        raise FileNotFoundError(
+            f"No trained model found in '{os.path.normpath(models_dir)}'. "
+            "Run `python train_classifier.py` first."
+        )
+
+    import joblib
+
+    model = joblib.load(model_path, mmap_mode="r")
+    vectorizer = joblib.load(vec_path, mmap_mode="r")
+    return model, vectorizer
+
+
+def get_artifacts() -> Tuple:
+    """Returns the process-wide (model, vectorizer) pair from the registry."""
+    from utils.model_registry import get_registry
+
+    return get_registry().artifacts()
+
+
+def predict_risk_proba(texts: Sequence[str]):
+    """
+    Probability that each clause is risky.
+
+    Args:
+        texts: Clause texts for one document.
+
+    Returns:
+        1-D NumPy float array aligned with `texts`.
+    """
+    import numpy as np
+
+    model, vectorizer = get_artifacts()
+    if len(texts) == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    # One sparse matrix for the whole document, one predict_proba call
+    X = vectorizer.transform(texts)
+    proba = model.predict_proba(X)
+    risky_col = list(model.classes_).index(1)
+    return np.asarray(proba[:, risky_col], dtype=np.float64)
@@ -0,0 +1,187 @@
+"""
+utils/model_registry.py
+-----------------------
+Process-wide registry for the trained model + vectorizer.
+
+Artifacts in MODELS_DIR are loaded once and shared by every Streamlit
+session in the process. Each `get()` does a cheap stat() of the files; when
+they change on disk (e.g. after re-running train_classifier.py) the new
+version is loaded in full and then swapped in with a single assignment, so
+readers always see a consistent (model, vectorizer) pair.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from src.model_training.config import MODELS_DIR
+from utils.ml_backend import artifact_paths, load_artifacts
+
+# Clause used to exercise the full inference path right after loading
+_WARM_UP_TEXT = "The party may terminate this agreement without notice at any time."
+
+# Loads retried when the artifact files change while they are being read
+_LOAD_ATTEMPTS = 3
+
+
+class LoadedModel(NamedTuple):
+    """One immutable, fully loaded version of the artifacts."""
+    model: object
+    vectorizer: object
+    version: str              # short SHA-256 over both artifact files
+    signature: Tuple          # (mtime_ns, size) per file, for change detection
+    load_seconds: float
+    artifact_bytes: int       # size of the artifact files on disk (not resident memory)
+    loaded_at: float
+
+
+def _file_signature(paths) -> Tuple:
+    sig = []
+    for path in paths:
+        st = os.stat(path)
+        sig.append((st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+def _files_sha256(paths) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+class ModelRegistry:
+    """Loads, caches and hot-reloads the artifacts in one models directory."""
+
+    def __init__(self, models_dir: str = MODELS_DIR):
+        self.models_dir = models_dir
+        self._current: Optional[LoadedModel] = None
+        self._lock = threading.Lock()
+        self._warmed_version: Optional[str] = None
+        self.reload_count = 0
+        self.last_error: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def _load(self) -> LoadedModel:
+        """
+        Loads the artifacts as they are on disk now. The files are hashed
+        before and stat()ed again after loading, so a version whose files
+        were replaced mid-load is never labelled with the new files' hash.
+
+        Raises:
+            RuntimeError: If the files changed during every attempt.
+        """
+        paths = artifact_paths(self.models_dir)
+        for _ in range(_LOAD_ATTEMPTS):
+            signature = _file_signature(paths)
+            version = _files_sha256(paths)
+            start = time.perf_counter()
+            model, vectorizer = load_artifacts(self.models_dir)
+            load_seconds = time.perf_counter() - start
+            if _file_signature(paths) != signature:
+                continue
+            return LoadedModel(
+                model=model,
+                vectorizer=vectorizer,
+                version=version,
+                signature=signature,
+                load_seconds=load_seconds,
+                artifact_bytes=sum(size for _, size in signature),
+                loaded_at=time.time(),
+            )
+        raise RuntimeError("Model artifacts changed while being loaded; retrying on the next call.")
+
+    def get(self) -> LoadedModel:
+        """
+        Returns the current artifacts, (re)loading them if the files on disk
+        have changed since the last load.
+
+        Raises:
+            FileNotFoundError: If nothing is loaded and no artifacts exist.
+        """
+        current = self._current
+        try:
+            signature = _file_signature(artifact_paths(self.models_dir))
+        except FileNotFoundError:
+            if current is not None:
+                # Files are being replaced; keep serving the loaded version.
+                return current
+            load_artifacts(self.models_dir)  # raises the descriptive error
+            raise
+
+        if current is not None and current.signature == signature:
+            return current
+
+        with self._lock:
+            current = self._current
+            if current is not None and current.signature == signature:
+                return current
+            if current is not None and _files_sha256(
+                artifact_paths(self.models_dir)
+            ) == current.version:
+                # Touched but unchanged: just remember the new signature.
+                self._current = current._replace(signature=signature)
+                return self._current
+            try:
+                loaded = self._load()
+            except Exception as e:
+                # A half-written artifact (training still running) must not
+                # take down a working model; retry on the next call.
+                self.last_error = str(e)
+                if current is None:
+                    raise
+                return current
+            self._current = loaded
+            self.last_error = None
+            if current is not None:
+                self.reload_count += 1
+            return loaded
+
+    def artifacts(self) -> Tuple[object, object]:
+        """Returns the current (model, vectorizer) pair."""
+        loaded = self.get()
+        return loaded.model, loaded.vectorizer
+
+    # ------------------------------------------------------------------
+    # Warm-up & introspection
+    # ------------------------------------------------------------------
+    def warm_up(self) -> None:
+        """
+        Loads the artifacts and runs one prediction so the first real
+        request doesn't pay for page faults and lazy initialisation.
+        """
+        loaded = self.get()
+        if self._warmed_version == loaded.version:
+            return
+        X = loaded.vectorizer.transform([_WARM_UP_TEXT])
+        loaded.model.predict_proba(X)
+        self._warmed_version = loaded.version
+
+    def info(self) -> Dict:
+        """Load statistics of the current version (empty if not loaded)."""
+        current = self._current
+        if current is None:
+            return {}
+        return {
+            "version": current.version,
+            "load_seconds": round(current.load_seconds, 4),
+            "artifact_bytes": current.artifact_bytes,
+            "loaded_at": current.loaded_at,
+            "reload_count": self.reload_count,
+            "warmed": self._warmed_version == current.version,
+            "last_error": self.last_error,
+        }
+
+
+_REGISTRY = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    """Returns the process-wide model registry."""
+    return _REGISTRY
@@ -0,0 +1,173 @@
+"""
+utils/profiling.py
+------------------
+Opt-in cProfile capture for slow documents.
+
+When a latency threshold is configured (PROFILE_THRESHOLD_SECONDS, or
+`configure()`), run_analysis() profiles every uncached analysis and keeps
+the profile of each one that takes at least that long; faster documents
+are discarded. A kept profile is written to the profile directory as
+
+    <sha256[:16]>-<unix ms>.prof   pstats dump (snakeviz, pstats, ...)
+    <sha256[:16]>-<unix ms>.json   document hash, file name, size, mode,
+                                   stage timings, total seconds and the
+                                   top functions by own time
+
+so it can be matched to the document and to the stage that was slow.
+`aggregate()` merges any number of dumps, e.g. all slow documents of a
+batch run, into one ranking of hot functions.
+
+Only the analysing thread is profiled: PDF pages extracted by a nested
+process pool show up as time spent waiting on the pool. On Python 3.12+
+only one profiler can be active per process, so a document that starts
+while another is being profiled is not captured.
+"""
+
+import cProfile
+import json
+import logging
+import os
+import pstats
+import time
+from typing import Dict, Iterable, List, Optional
+
+from app_config import PROFILE_DIR, PROFILE_THRESHOLD_SECONDS, PROFILE_TOP_FUNCTIONS
+from utils.result_cache import content_hash
+
+logger = logging.getLogger(__name__)
+
+_SETTINGS = {"threshold": PROFILE_THRESHOLD_SECONDS, "out_dir": PROFILE_DIR}
+
+
+def configure(threshold: Optional[float], out_dir: Optional[str] = None) -> None:
+    """
+    Sets the latency threshold (None turns profiling off; 0 keeps every
+    profile) and, optionally, the directory profiles are written to.
+    """
+    _SETTINGS["threshold"] = threshold
+    if out_dir is not None:
+        _SETTINGS["out_dir"] = out_dir
+
+
+def enabled() -> bool:
+    """True when analyses are being profiled."""
+    return _SETTINGS["threshold"] is not None
+
+
+def top_functions(stats: pstats.Stats, n: int = PROFILE_TOP_FUNCTIONS, sort: str = "tottime") -> List[Dict]:
+    """
+    The `n` functions with the most own time ("tottime") or cumulative
+    time ("cumtime"), as plain dicts.
+    """
+    index = 2 if sort == "tottime" else 3
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][index], reverse=True)[:n]
+    return [
+        {
+            "function": pstats.func_std_string(func),
+            "calls": nc,
+            "tottime": round(tt, 6),
+            "cumtime": round(ct, 6),
+        }
+        for func, (cc, nc, tt, ct, callers) in rows
+    ]
+
+
+def aggregate(paths: Iterable[str]) -> Optional[pstats.Stats]:
+    """Merges profile dumps into one pstats.Stats (None if there are none)."""
+    stats = None
+    for path in paths:
+        try:
+            if stats is None:
+                stats = pstats.Stats(path)
+            else:
+                stats.add(path)
+        except (OSError, TypeError, EOFError) as e:
+            logger.warning("Skipping unreadable profile %s: %s", path, e)
+    return stats
+
+
+class _NullCapture:
+    path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_CAPTURE = _NullCapture()
+
+
+class _Capture:
+    """Profiles one analysis and saves it if it reaches the threshold."""
+
+    def __init__(self, raw_bytes: bytes, filename: str, mode: Optional[str], timings: Dict[str, float]):
+        self.raw_bytes = raw_bytes
+        self.filename = filename
+        self.mode = mode
+        self.timings = timings
+        self.threshold = _SETTINGS["threshold"]
+        self.out_dir = _SETTINGS["out_dir"]
+        self.path: Optional[str] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._start = 0.0
+
+    def __enter__(self):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+: another profiler is active in this process
+            logger.debug("Profiler busy, not profiling %s", self.filename)
+        else:
+            self._profiler = profiler
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        elapsed = time.perf_counter() - self._start
+        if self._profiler is None:
+            return False
+        self._profiler.disable()
+        if exc_type is None and elapsed >= self.threshold:
+            try:
+                self.path = self._save(elapsed)
+            except OSError as e:
+                logger.warning("Could not save profile of %s: %s", self.filename, e)
+        return False
+
+    def _save(self, elapsed: float) -> str:
+        os.makedirs(self.out_dir, exist_ok=True)
+        doc_hash = content_hash(self.raw_bytes)
+        base = os.path.join(self.out_dir, f"{doc_hash[:16]}-{int(time.time() * 1000)}")
+        self._profiler.dump_stats(base + ".prof")
+
+        stats = pstats.Stats(self._profiler)
+        meta = {
+            "doc_sha256": doc_hash,
+            "filename": self.filename,
+            "bytes": len(self.raw_bytes),
+            "mode": self.mode,
+            "seconds": round(elapsed, 6),
+            "threshold_seconds": self.threshold,
+            "timings": {stage: round(secs, 6) for stage, secs in self.timings.items()},
+            "profile": os.path.basename(base + ".prof"),
+            "top_functions": top_functions(stats),
+        }
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        logger.info("Slow document %s (%.2fs) profiled to %s.prof", self.filename, elapsed, base)
+        return base + ".prof"
+
+
+def capture(raw_bytes: bytes, filename: str, mode: Optional[str], timings: Dict[str, float]):
+    """
+    Context manager around one analysis. When profiling is enabled and the
+    block takes at least the threshold, the profile is saved and its path
+    is available as `.path` afterwards (None otherwise). `timings` is read
+    when the block exits, so the stage timings recorded inside it are saved.
+    """
+    if _SETTINGS["threshold"] is None:
+        return _NULL_CAPTURE
+    return _Capture(raw_bytes, filename, mode, timings)
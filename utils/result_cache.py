@@ -0,0 +1,230 @@
+"""
+utils/result_cache.py
+---------------------
+Cache of full analysis results keyed by document content.
+
+The key combines a SHA-256 of the uploaded bytes with a hash of everything
+that influences predictions (keyword list, thresholds, backend mode and, for
+ML modes, the loaded model version). Results live in a bounded in-memory LRU
+tier and, optionally, an on-disk pickle tier with size-based eviction.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app_config import (
+    RISK_KEYWORDS,
+    RISK_KEYWORD_THRESHOLD,
+    BASE_RISKY_CONFIDENCE,
+    SAFE_CONFIDENCE,
+    ML_RISK_THRESHOLD,
+    DEFAULT_PREDICTOR_MODE,
+    RESULT_CACHE_MAX_ENTRIES,
+    RESULT_CACHE_DIR,
+    RESULT_CACHE_MAX_BYTES,
+)
+
+_DISK_SUFFIX = ".pkl"
+
+# Bump when the layout of cached results changes (e.g. ClauseTable columns)
+_RESULT_FORMAT = 2
+
+
+def predictor_config_version(mode: Optional[str]) -> str:
+    """
+    Short hash of the predictor configuration for `mode`.
+
+    Changes whenever the keyword list, thresholds, category mapping or (for
+    ML-backed modes) the trained model changes, so stale results are never
+    served after a config or model update.
+    """
+    from utils.risk_predictor import _CATEGORY_MAP
+
+    mode = mode or DEFAULT_PREDICTOR_MODE
+    config = {
+        "format": _RESULT_FORMAT,
+        "mode": mode,
+        "keywords": list(RISK_KEYWORDS),
+        "categories": _CATEGORY_MAP,
+        "keyword_threshold": RISK_KEYWORD_THRESHOLD,
+        "base_risky_confidence": BASE_RISKY_CONFIDENCE,
+        "safe_confidence": SAFE_CONFIDENCE,
+    }
+    if mode != "keyword":
+        from utils.model_registry import get_registry
+
+        config["ml_threshold"] = ML_RISK_THRESHOLD
+        config["model_version"] = get_registry().get().version
+
+    blob = json.dumps(config, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 hex digest of a document's raw bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def result_cache_key(data: bytes, filename: str, mode: Optional[str]) -> str:
+    """
+    Cache key for analysing `data` in `mode`.
+
+    The file extension is part of the key because the same bytes are read
+    differently as .txt and .pdf.
+    """
+    ext = os.path.splitext(filename)[1].lower().lstrip(".")
+    return f"{content_hash(data)}-{ext}-{predictor_config_version(mode)}"
+
+
+class ResultCache:
+    """Two-tier (memory LRU + optional disk) cache of analysis results."""
+
+    def __init__(
+        self,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+        cache_dir: Optional[str] = RESULT_CACHE_DIR,
+        max_disk_bytes: int = RESULT_CACHE_MAX_BYTES,
+    ):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+    def _remember(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + _DISK_SUFFIX)
+
+    def _disk_get(self, key: str) -> Optional[Any]:
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt or incompatible entry: drop it and recompute.
+            self._unlink(path)
+            return None
+        os.utime(path)  # mark as recently used for eviction
+        return value
+
+    def _disk_put(self, key: str, value: Any) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._disk_path(key))
+        except Exception:
+            self._unlink(tmp_path)
+            raise
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Deletes least-recently-used entries until under max_disk_bytes."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(_DISK_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            self._unlink(path)
+            total -= size
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached result for `key`, or None."""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return value
+
+        if self.cache_dir:
+            value = self._disk_get(key)
+            if value is not None:
+                self.stats["disk_hits"] += 1
+                self._remember(key, value)
+                return value
+
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        """Stores `value` in the memory tier and, if enabled, on disk."""
+        self._remember(key, value)
+        if self.cache_dir:
+            try:
+                self._disk_put(key, value)
+            except OSError:
+                # A full or read-only disk must not break the analysis.
+                pass
+
+    def clear(self) -> None:
+        """Empties both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(_DISK_SUFFIX):
+                    self._unlink(os.path.join(self.cache_dir, name))
+
+    def info(self) -> Dict:
+        """Entry counts and hit/miss counters."""
+        return {"memory_entries": len(self._memory), **self.stats}
+
+
+_CACHE: Optional[ResultCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Returns the process-wide result cache configured from app_config."""
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = ResultCache()
+    return _CACHE
@@ -0,0 +1,419 @@
+"""
+utils/result_export.py
+----------------------
+Writes analysis results of many documents to an output directory:
+
+    <out>/documents.jsonl   one record per processed document (also the
+                            resume manifest: its hashes are skipped on rerun)
+    <out>/vocabulary.json   keyword and category names by id
+    <out>/clauses.jsonl     per-clause rows                 (format "jsonl")
+    <out>/clauses/label=<Risky|Safe>/part-*.parquet
+                            per-clause rows, Hive-partitioned (format "parquet")
+
+Parquet files are written per flushed batch and partition, sorted by
+document hash and clause id, with row groups of PARQUET_ROW_GROUP_ROWS rows:
+filters on the partition column skip whole directories, and the tight
+per-row-group min/max statistics on doc_sha256 let readers skip row groups
+when looking up documents. `read_clauses` / `document_summaries` load only
+the columns an aggregate needs.
+
+Clause rows are buffered and flushed in batches; a document's record is only
+appended to documents.jsonl after its clause rows have been written, so an
+interrupted run never marks a document as done without its rows. (It may
+leave rows of unrecorded documents behind; they are written again on
+resume, so deduplicate clause rows on doc_sha256 + clause_id.)
+"""
+
+import abc
+import json
+import os
+import tempfile
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Set
+
+DOCUMENTS_FILENAME = "documents.jsonl"
+CLAUSES_JSONL_FILENAME = "clauses.jsonl"
+CLAUSES_PARQUET_DIRNAME = "clauses"
+
+EXPORT_FORMATS = ("jsonl", "parquet")
+
+VOCABULARY_FILENAME = "vocabulary.json"
+
+# Clause rows buffered before a flush (one Parquet file per partition each)
+DEFAULT_FLUSH_ROWS = 250_000
+
+# Parquet layout
+PARQUET_PARTITION_COLS = ("label",)
+PARQUET_ROW_GROUP_ROWS = 64_000
+
+# Per-clause columns, in output order
+CLAUSE_COLUMNS = (
+    "doc_sha256",
+    "file",
+    "clause_id",
+    "start",
+    "end",
+    "word_count",
+    "label",
+    "confidence",
+    "keyword_mask",
+    "category_mask",
+    "keyword_ids",
+    "keywords",
+    "categories",
+)
+
+
+def clause_columns(analyzed, doc_sha256: str, filename: str, with_text: bool = False) -> Dict[str, List]:
+    """
+    Flattens an analyzed ClauseTable into export columns.
+
+    Args:
+        analyzed:   Analyzed ClauseTable (run_analysis()["analyzed"]).
+        doc_sha256: SHA-256 of the document bytes.
+        filename:   Source file name.
+        with_text:  Also export the clause text.
+
+    Returns:
+        dict of equally long lists, keyed by CLAUSE_COLUMNS (+ "text").
+    """
+    n = len(analyzed)
+    columns = analyzed.columns
+    vocab = analyzed.vocabulary
+    keyword_masks = [int(m) for m in columns["keyword_mask"]]
+    keyword_index = {kw: i for i, kw in reversed(list(enumerate(vocab.keywords)))}
+    keywords = [vocab.keywords_for(m) for m in keyword_masks]
+    out = {
+        "doc_sha256": [doc_sha256] * n,
+        "file": [filename] * n,
+        "clause_id": list(range(analyzed.first_id, analyzed.first_id + n)),
+        "start": list(analyzed.starts),
+        "end": list(analyzed.ends),
+        "word_count": list(analyzed.word_counts),
+        "label": ["Risky" if r else "Safe" for r in columns["is_risky"]],
+        "confidence": [float(c) for c in columns["confidence"]],
+        "keyword_mask": keyword_masks,
+        "category_mask": [int(m) for m in columns["category_mask"]],
+        "keyword_ids": [[keyword_index[kw] for kw in kws] for kws in keywords],
+        "keywords": keywords,
+        "categories": [vocab.categories_for(m) for m in keyword_masks],
+    }
+    if with_text:
+        out["text"] = analyzed.texts()
+    return out
+
+
+def processed_hashes(out_dir: str, mode: str) -> Set[str]:
+    """
+    Hashes of documents recorded as done in `out_dir` (for resume).
+
+    Raises:
+        ValueError: If `out_dir` holds results of another prediction mode;
+            resuming would mix both modes in one output.
+    """
+    path = os.path.join(out_dir, DOCUMENTS_FILENAME)
+    done: Set[str] = set()
+    if not os.path.isfile(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn last line of an interrupted run
+            if record.get("mode") != mode:
+                raise ValueError(
+                    f"{out_dir} holds results analysed in '{record.get('mode')}' mode, "
+                    f"not '{mode}'; use a new output directory."
+                )
+            if record.get("status") != "error":
+                done.add(record["doc_sha256"])
+    return done
+
+
+class _ResultSink(abc.ABC):
+    """Buffers clause columns and document records; see module docstring."""
+
+    def __init__(self, out_dir: str, flush_rows: int = DEFAULT_FLUSH_ROWS, vocabulary=None):
+        self.out_dir = out_dir
+        self.flush_rows = flush_rows
+        self._columns: Dict[str, List] = {}
+        self._rows = 0
+        self._documents: List[Dict] = []
+        os.makedirs(out_dir, exist_ok=True)
+        if vocabulary is not None:
+            self._write_vocabulary(vocabulary)
+        self._doc_file = open(os.path.join(out_dir, DOCUMENTS_FILENAME), "a", encoding="utf-8")
+
+    def _write_vocabulary(self, vocabulary) -> None:
+        """Records keyword/category ids once; refuses to mix vocabularies."""
+        path = os.path.join(self.out_dir, VOCABULARY_FILENAME)
+        current = {"keywords": list(vocabulary.keywords), "categories": list(vocabulary.categories)}
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as f:
+                if json.load(f) != current:
+                    raise ValueError(
+                        f"{self.out_dir} holds results for a different keyword/category "
+                        "configuration; use a new output directory."
+                    )
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+
+    def write(self, document: Dict, columns: Optional[Dict[str, List]] = None) -> None:
+        """Adds one document's record and (optionally) its clause columns."""
+        if columns:
+            n = len(columns["doc_sha256"])
+            for key, values in columns.items():
+                self._columns.setdefault(key, []).extend(values)
+            self._rows += n
+        self._documents.append(document)
+        if self._rows >= self.flush_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._rows:
+            self._write_rows(self._columns, self._rows)
+        for record in self._documents:
+            self._doc_file.write(json.dumps(record) + "\n")
+        self._doc_file.flush()
+        os.fsync(self._doc_file.fileno())
+        self._columns, self._rows, self._documents = {}, 0, []
+
+    def close(self) -> None:
+        self.flush()
+        self._doc_file.close()
+
+    @abc.abstractmethod
+    def _write_rows(self, columns: Dict[str, List], n: int) -> None:
+        """Writes one flushed batch of `n` clause rows."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class JsonlSink(_ResultSink):
+    """Appends clause rows to <out>/clauses.jsonl."""
+
+    def __init__(self, out_dir: str, flush_rows: int = DEFAULT_FLUSH_ROWS, vocabulary=None):
+        super().__init__(out_dir, flush_rows, vocabulary)
+        self._clause_file = open(os.path.join(out_dir, CLAUSES_JSONL_FILENAME), "a", encoding="utf-8")
+
+    def _write_rows(self, columns: Dict[str, List], n: int) -> None:
+        keys = list(columns)
+        values = [columns[k] for k in keys]
+        write = self._clause_file.write
+        for i in range(n):
+            write(json.dumps({k: v[i] for k, v in zip(keys, values)}) + "\n")
+        self._clause_file.flush()
+        os.fsync(self._clause_file.fileno())
+
+    def close(self) -> None:
+        super().close()
+        self._clause_file.close()
+
+
+def _clause_schema(with_text: bool):
+    import pyarrow as pa
+
+    fields = [
+        ("doc_sha256", pa.string()),
+        ("file", pa.string()),
+        ("clause_id", pa.int32()),
+        ("start", pa.int64()),
+        ("end", pa.int64()),
+        ("word_count", pa.int32()),
+        ("label", pa.string()),
+        ("confidence", pa.float64()),
+        ("keyword_mask", pa.uint64()),
+        ("category_mask", pa.uint64()),
+        ("keyword_ids", pa.list_(pa.int16())),
+        ("keywords", pa.list_(pa.string())),
+        ("categories", pa.list_(pa.string())),
+    ]
+    if with_text:
+        fields.append(("text", pa.string()))
+    return pa.schema(fields)
+
+
+class ParquetSink(_ResultSink):
+    """
+    Writes every flushed batch as one Parquet file per partition under
+    <out>/clauses/<col>=<value>/.
+    """
+
+    def __init__(
+        self,
+        out_dir: str,
+        flush_rows: int = DEFAULT_FLUSH_ROWS,
+        vocabulary=None,
+        partition_cols=PARQUET_PARTITION_COLS,
+        row_group_rows: int = PARQUET_ROW_GROUP_ROWS,
+    ):
+        import pyarrow  # noqa: F401  (fail early when the dependency is missing)
+
+        super().__init__(out_dir, flush_rows, vocabulary)
+        self.partition_cols = tuple(partition_cols)
+        self.row_group_rows = row_group_rows
+        self._dir = os.path.join(out_dir, CLAUSES_PARQUET_DIRNAME)
+        os.makedirs(self._dir, exist_ok=True)
+
+    def _write_rows(self, columns: Dict[str, List], n: int) -> None:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        table = pa.table(columns, schema=_clause_schema("text" in columns))
+        table = table.sort_by([("doc_sha256", "ascending"), ("clause_id", "ascending")])
+
+        batch_name = f"part-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet"
+        for key, part in self._partitions(table, pc):
+            part_dir = os.path.join(self._dir, *(f"{c}={v}" for c, v in zip(self.partition_cols, key)))
+            os.makedirs(part_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=part_dir, suffix=".tmp")
+            os.close(fd)
+            try:
+                pq.write_table(
+                    part.drop(list(self.partition_cols)),
+                    tmp_path,
+                    row_group_size=self.row_group_rows,
+                    compression="zstd",
+                    write_statistics=True,
+                )
+                os.replace(tmp_path, os.path.join(part_dir, batch_name))
+            except Exception:
+                os.remove(tmp_path)
+                raise
+
+    def _partitions(self, table, pc):
+        """Yields (partition values, rows) for every partition in `table`."""
+        if not self.partition_cols:
+            yield (), table
+            return
+        keys = table.select(list(self.partition_cols)).group_by(list(self.partition_cols)).aggregate([])
+        for row in keys.to_pylist():
+            mask = None
+            for col in self.partition_cols:
+                cond = pc.equal(table[col], row[col])
+                mask = cond if mask is None else pc.and_(mask, cond)
+            yield tuple(row[c] for c in self.partition_cols), table.filter(mask)
+
+
+def open_sink(
+    out_dir: str,
+    fmt: str = "jsonl",
+    flush_rows: int = DEFAULT_FLUSH_ROWS,
+    vocabulary=None,
+) -> _ResultSink:
+    """
+    Opens a result sink writing to `out_dir`.
+
+    Args:
+        out_dir:    Output directory (created if needed).
+        fmt:        "jsonl" or "parquet".
+        flush_rows: Clause rows buffered before writing.
+        vocabulary: RiskVocabulary the keyword/category masks refer to;
+                    recorded in vocabulary.json.
+
+    Raises:
+        ValueError:  If `fmt` is not one of EXPORT_FORMATS, or `out_dir`
+                     holds results for a different vocabulary.
+        ImportError: For "parquet" when pyarrow is not installed.
+    """
+    if fmt == "jsonl":
+        return JsonlSink(out_dir, flush_rows, vocabulary)
+    if fmt == "parquet":
+        return ParquetSink(out_dir, flush_rows, vocabulary)
+    raise ValueError(f"Unknown export format '{fmt}'. Choose one of: {', '.join(EXPORT_FORMATS)}.")
+
+
+def iter_documents(out_dir: str) -> Iterable[Dict]:
+    """Yields the document records of `out_dir`."""
+    path = os.path.join(out_dir, DOCUMENTS_FILENAME)
+    if not os.path.isfile(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+def load_vocabulary(out_dir: str) -> Dict[str, List[str]]:
+    """Keyword and category names by id, as recorded in `out_dir`."""
+    with open(os.path.join(out_dir, VOCABULARY_FILENAME), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_clauses(out_dir: str, columns: Optional[List[str]] = None, filters=None):
+    """
+    Loads clause rows as a pandas DataFrame, reading only `columns`.
+
+    For Parquet output the column selection and `filters` (pyarrow filter
+    expressions / DNF tuples, e.g. [("label", "=", "Risky")]) are pushed
+    down to the files; JSONL output is read in full and then projected.
+
+    Args:
+        out_dir: Output directory of a batch run.
+        columns: Columns to load (default: all).
+        filters: Optional row filters (Parquet only).
+    """
+    import pandas as pd
+
+    parquet_dir = os.path.join(out_dir, CLAUSES_PARQUET_DIRNAME)
+    if os.path.isdir(parquet_dir):
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(parquet_dir, columns=columns, filters=filters, partitioning="hive")
+        return table.to_pandas()
+
+    if filters is not None:
+        raise ValueError("Row filters are only supported for Parquet output.")
+    jsonl_path = os.path.join(out_dir, CLAUSES_JSONL_FILENAME)
+    if not os.path.isfile(jsonl_path):
+        return pd.DataFrame(columns=columns or list(CLAUSE_COLUMNS))
+    frame = pd.read_json(jsonl_path, lines=True, dtype=False)
+    return frame[columns] if columns else frame
+
+
+def document_summaries(out_dir: str):
+    """
+    Per-document totals with the same fields as
+    risk_predictor.compute_summary_stats, computed from the doc_sha256 and
+    label columns only.
+
+    Returns:
+        DataFrame indexed by doc_sha256 with total, risky_count, safe_count
+        and risk_percentage.
+    """
+    frame = read_clauses(out_dir, columns=["doc_sha256", "clause_id", "label"])
+    frame = frame.drop_duplicates(["doc_sha256", "clause_id"])
+    risky = (frame["label"].astype(str) == "Risky").groupby(frame["doc_sha256"]).sum()
+    total = frame.groupby("doc_sha256").size()
+    summary = total.to_frame("total")
+    summary["risky_count"] = risky.astype(int)
+    summary["safe_count"] = summary["total"] - summary["risky_count"]
+    summary["risk_percentage"] = (summary["risky_count"] / summary["total"] * 100).round(1)
+    return summary
+
+
+def category_totals(out_dir: str) -> Dict[str, int]:
+    """Clause counts per risk category across all documents in `out_dir`."""
+    import numpy as np
+
+    categories = load_vocabulary(out_dir)["categories"]
+    frame = read_clauses(out_dir, columns=["doc_sha256", "clause_id", "category_mask"])
+    frame = frame.drop_duplicates(["doc_sha256", "clause_id"])
+    masks = frame["category_mask"].to_numpy(dtype=np.uint64)
+    return {
+        name: int(np.count_nonzero(masks & np.uint64(1 << bit)))
+        for bit, name in enumerate(categories)
+    }
@@ -1,19 +1,32 @@
 """
 utils/risk_predictor.py
 ------------------------
-Dummy rule-based risk prediction engine.
-Uses keyword matching against a curated list of risky legal terms.
-In a production system, this would be replaced by a trained ML model.
+Risk prediction engine.
+Keyword matching against a curated list of risky legal terms is always run
+(it supplies matched keywords and categories); the label and confidence come
+from the selected backend: "keyword", "ml" (trained TF-IDF classifier, see
+utils/ml_backend.py) or "hybrid".
 """
 
-import re
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Sequence
 from app_config import (
     RISK_KEYWORDS,
     RISK_KEYWORD_THRESHOLD,
     BASE_RISKY_CONFIDENCE,
     SAFE_CONFIDENCE,
+    DEFAULT_PREDICTOR_MODE,
+    ML_RISK_THRESHOLD,
 )
+from utils import metrics
+from utils.clause_table import ClauseTable, concat_columns
+from utils.keyword_matcher import get_matcher
+from utils.risk_vocabulary import RiskVocabulary, get_vocabulary
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
 
 # ---------------------------------------------------------------------------
 # Risk category mapping for richer UI context
@@ -65,9 +78,23 @@ _CATEGORY_MAP: Dict[str, str] = {
 }
 
 
+def _confidence_for_hits(hits: int) -> float:
+    """Confidence score for a clause with `hits` matched keywords."""
+    if hits >= RISK_KEYWORD_THRESHOLD:
+        # Confidence scales up slightly with more keyword hits
+        bonus = min(0.10, hits * 0.02)
+        return round(BASE_RISKY_CONFIDENCE + bonus, 3)
+    return SAFE_CONFIDENCE
+
+
+def risk_vocabulary() -> RiskVocabulary:
+    """Keyword/category ids for the configured keywords and categories."""
+    return get_vocabulary(RISK_KEYWORDS, _CATEGORY_MAP)
+
+
 def predict_clause_risk(clause: Dict) -> Dict:
     """
-    Predicts whether a single clause is Risky or Safe.
+    Predicts whether a single clause is Risky or Safe (keyword backend).
 
     Args:
         clause (Dict): A clause dict with at least a 'text' key.
@@ -79,62 +106,245 @@ def predict_clause_risk(clause: Dict) -> Dict:
             - matched_keywords (list): keywords found in the clause
             - categories      (list): risk categories from matched keywords
     """
-    text_lower = clause["text"].lower()
-    matched = []
+    # One scan over the clause with the precompiled keyword automaton
+    mask = get_matcher(RISK_KEYWORDS).find_mask(clause["text"].lower())
+    vocab = risk_vocabulary()
+    matched = vocab.keywords_for(mask)
+    is_risky = len(matched) >= RISK_KEYWORD_THRESHOLD
+
+    return {
+        **clause,
+        "label": "Risky" if is_risky else "Safe",
+        "confidence": _confidence_for_hits(len(matched)),
+        "matched_keywords": matched,
+        "categories": vocab.categories_for(mask),
+    }
 
-    for keyword in RISK_KEYWORDS:
-        pattern = r"\b" + re.escape(keyword) + r"\b"
-        if re.search(pattern, text_lower):
-            matched.append(keyword)
 
-    is_risky = len(matched) >= RISK_KEYWORD_THRESHOLD
+def _keyword_columns(texts: Sequence[str]) -> Dict:
+    """Keyword backend: label and confidence from keyword hits alone."""
+    matcher = get_matcher(RISK_KEYWORDS)
+    vocab = risk_vocabulary()
+    keyword_mask = vocab.mask_column([matcher.find_mask(t.lower()) for t in texts])
+    hits = vocab.popcount(keyword_mask)
+    if metrics.enabled():
+        metrics.inc("keyword_hits_total", int(sum(hits)))
 
-    # Confidence scales up slightly with more keyword hits
-    if is_risky:
-        bonus = min(0.10, len(matched) * 0.02)
-        confidence = round(BASE_RISKY_CONFIDENCE + bonus, 3)
-        label = "Risky"
-    else:
-        confidence = SAFE_CONFIDENCE
-        label = "Safe"
+    # Confidence only depends on the hit count, so look it up per count
+    # instead of recomputing the formula for every clause.
+    conf_table = [_confidence_for_hits(h) for h in range(len(matcher.keywords) + 1)]
 
-    categories = list(
-        dict.fromkeys(
-            _CATEGORY_MAP.get(kw, "General Risk") for kw in matched
-        )
-    )
+    if _HAS_NUMPY:
+        hits = np.asarray(hits, dtype=np.int64)
+        is_risky = hits >= RISK_KEYWORD_THRESHOLD
+        confidence = np.asarray(conf_table, dtype=np.float64)[hits]
+    else:
+        is_risky = [h >= RISK_KEYWORD_THRESHOLD for h in hits]
+        confidence = [conf_table[h] for h in hits]
 
     return {
-        **clause,
-        "label": label,
+        "is_risky": is_risky,
         "confidence": confidence,
-        "matched_keywords": matched,
-        "categories": categories,
+        "keyword_mask": keyword_mask,
+        "category_mask": vocab.category_masks(keyword_mask),
     }
 
 
-def analyze_clauses(clauses: List[Dict]) -> List[Dict]:
+def _ml_columns(texts: Sequence[str]) -> Dict:
+    """ML backend: label and confidence from the trained classifier."""
+    from utils.ml_backend import predict_risk_proba
+
+    columns = _keyword_columns(texts)
+    proba = predict_risk_proba(texts)
+    is_risky = proba >= ML_RISK_THRESHOLD
+
+    columns["is_risky"] = is_risky
+    columns["confidence"] = np.round(np.where(is_risky, proba, 1.0 - proba), 3)
+    columns["risk_probability"] = proba
+    return columns
+
+
+def _hybrid_columns(texts: Sequence[str]) -> Dict:
+    """
+    Hybrid backend: a clause is Risky when either the keywords or the
+    classifier flag it. Keyword-flagged clauses keep the stronger of the two
+    scores; everything else uses the classifier probability.
+    """
+    from utils.ml_backend import predict_risk_proba
+
+    columns = _keyword_columns(texts)
+    proba = predict_risk_proba(texts)
+    kw_risky = np.asarray(columns["is_risky"], dtype=bool)
+    kw_conf = np.asarray(columns["confidence"], dtype=np.float64)
+
+    risk_score = np.where(kw_risky, np.maximum(proba, kw_conf), proba)
+    is_risky = risk_score >= ML_RISK_THRESHOLD
+
+    columns["is_risky"] = is_risky
+    columns["confidence"] = np.round(np.where(is_risky, risk_score, 1.0 - proba), 3)
+    columns["risk_probability"] = proba
+    return columns
+
+
+# Batch size used when analyze_clauses reports scoring progress
+SCORING_CHUNK_SIZE = 500
+
+_BACKENDS: Dict[str, Callable[[Sequence[str]], Dict]] = {
+    "keyword": _keyword_columns,
+    "ml": _ml_columns,
+    "hybrid": _hybrid_columns,
+}
+
+
+def register_backend(mode: str, backend: Callable[[Sequence[str]], Dict]) -> None:
+    """
+    Registers a prediction backend under `mode`.
+
+    A backend takes the clause texts of one document and returns the same
+    columnar dict as `predict_batch`.
+    """
+    _BACKENDS[mode] = backend
+
+
+def available_modes() -> List[str]:
+    """Names of all registered prediction backends."""
+    return list(_BACKENDS)
+
+
+def predict_batch(texts: Sequence[str], mode: Optional[str] = None) -> Dict:
+    """
+    Scores a whole document's clause texts in one call.
+
+    Args:
+        texts: Clause texts, in document order.
+        mode:  Backend name ("keyword", "ml", "hybrid"); defaults to
+               app_config.DEFAULT_PREDICTOR_MODE.
+
+    Returns:
+        Columnar dict, one entry per clause in every column:
+            - is_risky      : bool array (NumPy when available, else list)
+            - confidence    : float array (NumPy when available, else list)
+            - keyword_mask  : matched keywords as bitmasks over RISK_KEYWORDS
+            - category_mask : matched categories as bitmasks
+        Masks are uint64 arrays with NumPy, else lists of ints; decode them
+        with the RiskVocabulary from `risk_vocabulary()`.
+        ML-backed modes also add `risk_probability` (float array).
+
+    Raises:
+        ValueError: If `mode` is not a registered backend.
+    """
+    mode = mode or DEFAULT_PREDICTOR_MODE
+    backend = _BACKENDS.get(mode)
+    if backend is None:
+        raise ValueError(
+            f"Unknown prediction mode '{mode}'. Choose one of: {', '.join(_BACKENDS)}."
+        )
+    return backend(texts)
+
+
+class AnalyzedClauses(list):
+    """
+    List of analyzed clause dicts that also carries the columnar prediction
+    batch it was built from (see `predict_batch`), so aggregate helpers can
+    work on the columns instead of re-iterating the dicts.
+    """
+
+    def __init__(self, clauses, columns: Dict):
+        super().__init__(clauses)
+        self.columns = columns
+
+
+def analyze_clauses(
+    clauses: Sequence[Dict],
+    mode: Optional[str] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Sequence[Dict]:
     """
-    Runs risk prediction on a list of clause dicts.
+    Runs risk prediction on a document's clauses.
+
+    The whole document is scored with `predict_batch`. For a ClauseTable
+    the prediction columns are attached to the table; for a plain list of
+    clause dicts the prediction fields are written into the dicts in place
+    (no per-clause copies). When `progress` is given, scoring runs in
+    SCORING_CHUNK_SIZE batches and progress(clauses_done, total) is called
+    after each one.
 
     Args:
-        clauses (List[Dict]): Output from clause_segmenter.segment_document()
+        clauses: Output from clause_segmenter.segment_document() (or a list
+                 of dicts with a 'text' key).
+        mode (str, optional): Prediction backend, see `predict_batch`.
+        progress (callable, optional): Scoring progress callback.
 
     Returns:
-        List of clause dicts with risk prediction fields added.
+        The analyzed ClauseTable, or an AnalyzedClauses list of the clause
+        dicts with risk prediction fields added.
+    """
+    is_table = isinstance(clauses, ClauseTable)
+    texts = clauses.texts() if is_table else [c["text"] for c in clauses]
+    total = len(texts)
+
+    if progress is None or total <= SCORING_CHUNK_SIZE:
+        columns = predict_batch(texts, mode=mode)
+        if progress is not None:
+            progress(total, total)
+    else:
+        parts = []
+        for start in range(0, total, SCORING_CHUNK_SIZE):
+            parts.append(predict_batch(texts[start:start + SCORING_CHUNK_SIZE], mode=mode))
+            progress(min(start + SCORING_CHUNK_SIZE, total), total)
+        columns = concat_columns(parts)
+
+    vocab = risk_vocabulary()
+    if is_table:
+        clauses.columns = columns
+        clauses.vocabulary = vocab
+        return clauses
+
+    for clause, risky, conf, mask in zip(
+        clauses,
+        columns["is_risky"],
+        columns["confidence"],
+        columns["keyword_mask"],
+    ):
+        clause["label"] = "Risky" if risky else "Safe"
+        clause["confidence"] = float(conf)
+        clause["matched_keywords"] = vocab.keywords_for(mask)
+        clause["categories"] = vocab.categories_for(mask)
+
+    return AnalyzedClauses(clauses, columns)
+
+
+def merge_analyzed(parts: List[Sequence[Dict]]) -> Sequence[Dict]:
     """
-    return [predict_clause_risk(c) for c in clauses]
+    Joins consecutive `analyze_clauses` results (e.g. streamed batches of
+    one document) into a single result, columns included.
+    """
+    if not parts:
+        return AnalyzedClauses([], predict_batch([], mode="keyword"))
+    if all(isinstance(p, ClauseTable) for p in parts):
+        return ClauseTable.concat(parts)
+    clauses = [c for part in parts for c in part]
+    return AnalyzedClauses(clauses, concat_columns([p.columns for p in parts]))
 
 
 def compute_summary_stats(analyzed_clauses: List[Dict]) -> Dict:
     """
     Computes summary statistics for display in KPI tiles.
 
+    Reads the `is_risky` column directly when given an analyzed
+    ClauseTable or AnalyzedClauses, falling back to the per-clause labels
+    for plain lists.
+
     Returns:
         dict with total, risky_count, safe_count, risk_percentage
     """
     total = len(analyzed_clauses)
-    risky = sum(1 for c in analyzed_clauses if c["label"] == "Risky")
+    columns = getattr(analyzed_clauses, "columns", None)
+    if columns is not None:
+        risky_col = columns["is_risky"]
+        risky = int(np.count_nonzero(risky_col)) if _HAS_NUMPY else sum(risky_col)
+    else:
+        risky = sum(1 for c in analyzed_clauses if c["label"] == "Risky")
     safe = total - risky
     risk_pct = round((risky / total * 100) if total > 0 else 0.0, 1)
 
@@ -144,3 +354,22 @@ def compute_summary_stats(analyzed_clauses: List[Dict]) -> Dict:
         "safe_count": safe,
         "risk_percentage": risk_pct,
     }
+
+
+def compute_category_counts(analyzed_clauses: Sequence[Dict]) -> Dict[str, int]:
+    """
+    Number of clauses per risk category, computed from the category mask
+    column of an analyzed ClauseTable / AnalyzedClauses.
+
+    Returns:
+        dict mapping every configured category to its clause count
+    """
+    vocab = risk_vocabulary()
+    columns = getattr(analyzed_clauses, "columns", None)
+    if columns is not None:
+        return vocab.category_counts(columns["category_mask"])
+    counts = dict.fromkeys(vocab.categories, 0)
+    for clause in analyzed_clauses:
+        for cat in clause["categories"]:
+            counts[cat] = counts.get(cat, 0) + 1
+    return counts
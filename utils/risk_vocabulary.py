@@ -0,0 +1,172 @@
+"""
+utils/risk_vocabulary.py
+------------------------
+Integer interning of risk keywords and categories.
+
+Keyword i of the configured keyword list is bit i of a clause's keyword
+mask; category j (in first-seen keyword order) is bit j of its category
+mask. Masks are fixed-width: with NumPy and at most 64 keywords/categories
+they are stored as uint64 arrays, otherwise as lists of Python ints.
+
+Keyword mask → category mask / category list lookups are cached, so the
+per-clause work after matching is a dictionary hit, and document-level
+counts are bit tests and popcounts over the mask arrays.
+"""
+
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+DEFAULT_CATEGORY = "General Risk"
+
+# Widest mask stored in a NumPy uint64 array
+_MAX_ARRAY_BITS = 64
+
+
+def _popcount_int(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+class RiskVocabulary:
+    """Keyword and category ids plus cached mask decoders."""
+
+    def __init__(self, keywords: Sequence[str], category_map: Mapping[str, str]):
+        self.keywords: Tuple[str, ...] = tuple(keywords)
+        category_ids: Dict[str, int] = {}
+        keyword_category = []
+        for kw in self.keywords:
+            name = category_map.get(kw, DEFAULT_CATEGORY)
+            keyword_category.append(category_ids.setdefault(name, len(category_ids)))
+        self.categories: Tuple[str, ...] = tuple(category_ids)
+        self.keyword_category: Tuple[int, ...] = tuple(keyword_category)
+
+        self.use_arrays = _HAS_NUMPY and max(len(self.keywords), len(self.categories)) <= _MAX_ARRAY_BITS
+        self._category_masks: Dict[int, int] = {0: 0}
+        self._keyword_lists: Dict[int, Tuple[str, ...]] = {0: ()}
+        self._category_lists: Dict[int, Tuple[str, ...]] = {0: ()}
+
+    # ------------------------------------------------------------------
+    # Single masks
+    # ------------------------------------------------------------------
+    def _bits(self, mask: int) -> Iterable[int]:
+        bit = 0
+        while mask:
+            if mask & 1:
+                yield bit
+            mask >>= 1
+            bit += 1
+
+    def category_mask(self, keyword_mask: int) -> int:
+        """Category mask implied by a keyword mask (cached)."""
+        cat_mask = self._category_masks.get(keyword_mask)
+        if cat_mask is None:
+            cat_mask = 0
+            for i in self._bits(keyword_mask):
+                cat_mask |= 1 << self.keyword_category[i]
+            self._category_masks[keyword_mask] = cat_mask
+        return cat_mask
+
+    def keywords_for(self, keyword_mask: int) -> List[str]:
+        """Matched keywords of a mask, in keyword-list order."""
+        keyword_mask = int(keyword_mask)
+        names = self._keyword_lists.get(keyword_mask)
+        if names is None:
+            names = tuple(self.keywords[i] for i in self._bits(keyword_mask))
+            self._keyword_lists[keyword_mask] = names
+        return list(names)
+
+    def categories_for(self, keyword_mask: int) -> List[str]:
+        """
+        Distinct categories of a keyword mask, in the order their first
+        keyword appears in the keyword list.
+        """
+        keyword_mask = int(keyword_mask)
+        names = self._category_lists.get(keyword_mask)
+        if names is None:
+            names = tuple(dict.fromkeys(
+                self.categories[self.keyword_category[i]] for i in self._bits(keyword_mask)
+            ))
+            self._category_lists[keyword_mask] = names
+        return list(names)
+
+    # ------------------------------------------------------------------
+    # Mask columns
+    # ------------------------------------------------------------------
+    def mask_column(self, masks: List[int]):
+        """Stores per-clause masks as a uint64 array when possible."""
+        if self.use_arrays:
+            return np.fromiter(masks, dtype=np.uint64, count=len(masks))
+        return masks
+
+    def category_masks(self, keyword_masks):
+        """Category mask column for a keyword mask column."""
+        if self.use_arrays:
+            unique, inverse = np.unique(keyword_masks, return_inverse=True)
+            mapped = np.fromiter(
+                (self.category_mask(int(m)) for m in unique), dtype=np.uint64, count=len(unique)
+            )
+            return mapped[inverse]
+        return [self.category_mask(m) for m in keyword_masks]
+
+    def popcount(self, masks):
+        """Number of set bits per mask (e.g. keyword hits per clause)."""
+        if self.use_arrays:
+            if hasattr(np, "bitwise_count"):
+                return np.bitwise_count(masks).astype(np.int64)
+            bits = np.unpackbits(np.ascontiguousarray(masks).view(np.uint8))
+            return bits.reshape(-1, 64).sum(axis=1, dtype=np.int64)
+        return [_popcount_int(m) for m in masks]
+
+    def _bit_counts(self, masks, width: int) -> List[int]:
+        if self.use_arrays:
+            masks = np.asarray(masks, dtype=np.uint64)
+            return [
+                int(np.count_nonzero(masks & np.uint64(1 << bit))) for bit in range(width)
+            ]
+        counts = [0] * width
+        for mask in masks:
+            for bit in self._bits(mask):
+                counts[bit] += 1
+        return counts
+
+    def keyword_counts(self, keyword_masks) -> Dict[str, int]:
+        """Number of clauses matching each keyword."""
+        counts = self._bit_counts(keyword_masks, len(self.keywords))
+        return dict(zip(self.keywords, counts))
+
+    def category_counts(self, category_masks) -> Dict[str, int]:
+        """Number of clauses in each category."""
+        counts = self._bit_counts(category_masks, len(self.categories))
+        return dict(zip(self.categories, counts))
+
+    def category_heatmap(self, documents: Iterable) -> List[List[int]]:
+        """
+        Clause counts per category for many documents.
+
+        Args:
+            documents: One category mask column per document.
+
+        Returns:
+            One row per document, one column per entry of `categories`.
+        """
+        return [self._bit_counts(masks, len(self.categories)) for masks in documents]
+
+
+_VOCAB_CACHE: Dict[Tuple, RiskVocabulary] = {}
+
+
+def get_vocabulary(keywords: Sequence[str], category_map: Mapping[str, str]) -> RiskVocabulary:
+    """
+    Returns the vocabulary for this keyword list and category mapping,
+    building it on first use (like keyword_matcher.get_matcher).
+    """
+    key = (tuple(keywords), tuple(sorted(category_map.items())))
+    vocab = _VOCAB_CACHE.get(key)
+    if vocab is None:
+        vocab = RiskVocabulary(keywords, category_map)
+        _VOCAB_CACHE[key] = vocab
+    return vocab
@@ -0,0 +1,35 @@
+"""
+utils/worker_pool.py
+--------------------
+Set-up shared by the process pools that analyse whole documents, one per
+task (analyze_contracts.py, api_server.py).
+"""
+
+from typing import Optional
+
+from utils import metrics
+
+
+def init_document_worker(profile_threshold: Optional[float] = None, profile_dir: Optional[str] = None) -> None:
+    """
+    Pool initializer for document-level workers.
+
+    Documents are already spread over the pool, so PDF pages are read
+    serially inside each worker: nested page pools would only oversubscribe
+    the CPUs. Forked workers start with a copy of the parent's metrics,
+    which are cleared so only the worker's own work is reported.
+
+    Args:
+        profile_threshold: Profile documents taking at least this many
+            seconds (see utils/profiling.py); None keeps the configured
+            default.
+        profile_dir: Directory the profiles are written to.
+    """
+    from src.data_preprocessing.pdf_extractor import set_default_workers
+
+    set_default_workers(1)
+    metrics.get_metrics().reset()
+    if profile_threshold is not None:
+        from utils import profiling
+
+        profiling.configure(profile_threshold, profile_dir)